@@ -19,6 +19,33 @@ class CampaignsConfig(AppConfig):
         
         # Verify encryption key is configured for provider credentials
         self._verify_encryption_key(settings)
+        
+        # Verify the email template engine can actually be loaded
+        self._verify_template_engine(settings)
+    
+    def _verify_template_engine(self, settings):
+        """
+        Verify that EMAIL_TEMPLATE_ENGINE names a usable engine.
+        
+        Raises ImproperlyConfigured for an unknown engine, or for 'jinja2'
+        when the jinja2 package is not installed, instead of silently
+        rendering templates with a different syntax.
+        """
+        engine = getattr(settings, 'EMAIL_TEMPLATE_ENGINE', 'django')
+        
+        if engine not in ('django', 'jinja2'):
+            raise ImproperlyConfigured(
+                f"EMAIL_TEMPLATE_ENGINE must be 'django' or 'jinja2', not {engine!r}."
+            )
+        
+        if engine == 'jinja2':
+            try:
+                import jinja2  # noqa: F401
+            except ImportError:
+                raise ImproperlyConfigured(
+                    "EMAIL_TEMPLATE_ENGINE is 'jinja2' but the jinja2 package is not installed. "
+                    "Install it with: pip install Jinja2"
+                )
     
     def _verify_encryption_key(self, settings):
         """
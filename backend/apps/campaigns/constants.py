@@ -124,3 +124,7 @@ COMMON_TIMEZONE_CHOICES = [
     ('Australia/Sydney', 'Sydney'),
     ('Pacific/Auckland', 'Auckland'),
 ]
+
+# Unsubscribe link handed to recipients; formatted per contact with
+# str.format(token=...) instead of rebuilding the URL for every row
+UNSUBSCRIBE_URL_TEMPLATE = '/campaigns/unsubscribe/?token={token}'
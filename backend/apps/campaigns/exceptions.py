@@ -8,6 +8,9 @@ for email/SMS automation failures.
 
 class EmailSendingError(Exception):
     """Base exception for email sending failures."""
+    # Whether retrying the send may succeed
+    is_retryable = True
+    
     def __init__(self, message: str, original_error=None, provider_type: str = None):
         self.message = message
         self.original_error = original_error
@@ -21,6 +24,8 @@ class EmailVerificationError(EmailSendingError):
     
     This is typically recoverable by verifying the email/domain with the provider.
     """
+    is_retryable = False
+    
     def __init__(self, message: str, unverified_email: str = None, **kwargs):
         self.unverified_email = unverified_email
         super().__init__(message, **kwargs)
@@ -32,13 +37,15 @@ class EmailQuotaExceededError(EmailSendingError):
     
     This may be temporary and could be resolved by waiting or upgrading quota.
     """
-    pass
+    is_retryable = True
 
 
 class EmailBlacklistedError(EmailSendingError):
     """
     Raised when attempting to send to a blacklisted or suppressed email address.
     """
+    is_retryable = False
+    
     def __init__(self, message: str, blacklisted_email: str = None, **kwargs):
         self.blacklisted_email = blacklisted_email
         super().__init__(message, **kwargs)
@@ -48,6 +55,8 @@ class EmailInvalidRecipientError(EmailSendingError):
     """
     Raised when the recipient email address is invalid or malformed.
     """
+    is_retryable = False
+    
     def __init__(self, message: str, invalid_email: str = None, **kwargs):
         self.invalid_email = invalid_email
         super().__init__(message, **kwargs)
@@ -57,14 +66,14 @@ class EmailProviderConfigError(EmailSendingError):
     """
     Raised when there's an issue with provider configuration (credentials, settings, etc.).
     """
-    pass
+    is_retryable = False
 
 
 class EmailProviderConnectionError(EmailSendingError):
     """
     Raised when unable to connect to the email provider.
     """
-    pass
+    is_retryable = True
 
 
 class SMSSendingError(Exception):
@@ -0,0 +1,21 @@
+"""
+Middleware for the campaigns app.
+"""
+from .utils.hierarchy_resolver import end_resolver_cache, start_resolver_cache
+
+
+class ResolverCacheMiddleware:
+    """
+    Memoize HierarchicalResolver lookups for the duration of a request, so
+    a rule or template resolved several times costs one query.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        token = start_resolver_cache()
+        try:
+            return self.get_response(request)
+        finally:
+            end_resolver_cache(token)
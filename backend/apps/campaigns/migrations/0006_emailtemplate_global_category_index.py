@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 14:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("campaigns", "0005_pushsubscription"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="emailtemplate",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False), ("is_global", True)),
+                fields=["category"],
+                name="emailtemplate_global_cat_idx",
+            ),
+        ),
+    ]
@@ -468,12 +468,16 @@ class Campaign(BaseModel):
         results = []
         
         for email in test_emails:
-            result = send_test_campaign_email.delay(
-                campaign_id=str(self.id),
-                recipient_email=email,
-                subject=f"[TEST] {preview['subject']}",
-                html_content=preview['html_content'],
-                text_content=preview['text_content'],
+            # Rendered bodies travel through the broker; compress them
+            result = send_test_campaign_email.apply_async(
+                kwargs={
+                    'campaign_id': str(self.id),
+                    'recipient_email': email,
+                    'subject': f"[TEST] {preview['subject']}",
+                    'html_content': preview['html_content'],
+                    'text_content': preview['text_content'],
+                },
+                compression='zlib',
             )
             results.append({
                 'email': email,
@@ -180,6 +180,12 @@ class EmailTemplate(BaseModel):
             models.Index(fields=['organization', 'is_active']),
             models.Index(fields=['is_global', 'approval_status', 'is_draft']),
             models.Index(fields=['source_template', 'organization']),
+            # Global template lookups by category (resolver fallback)
+            models.Index(
+                fields=['category'],
+                condition=models.Q(is_global=True, is_deleted=False),
+                name='emailtemplate_global_cat_idx'
+            ),
         ]
         verbose_name = "Email Template"
         verbose_name_plural = "Email Templates"
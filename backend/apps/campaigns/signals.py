@@ -8,12 +8,14 @@ import threading
 from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from asgiref.sync import async_to_sync
+from celery.signals import task_prerun, task_postrun
 from channels.layers import get_channel_layer  # type: ignore[import-untyped]
 
-from .models.provider_models import EmailProvider, ProviderAuditLog
+from .models.provider_models import EmailProvider, OrganizationEmailProvider, ProviderAuditLog
 from .models.contact_models import Contact, ContactList
 from .models.campaign_models import Campaign
 from .models.notification_models import Notification
+from .utils.hierarchy_resolver import end_resolver_cache, start_resolver_cache
 
 # Try to import crum for request context (optional dependency)
 try:
@@ -28,6 +30,9 @@ logger = logging.getLogger(__name__)
 # Thread-local storage to capture pre-save state
 _provider_pre_save_state = threading.local()
 
+# task_id -> token of the resolver cache opened for a running Celery task
+_task_resolver_cache_tokens = {}
+
 
 def get_request_from_context():
     """
@@ -210,6 +215,21 @@ def log_provider_delete(sender, instance, **kwargs):
         logger.error(f"Failed to log provider delete audit: {e}", exc_info=True)
 
 
+@receiver(post_save, sender=EmailProvider)
+@receiver(post_delete, sender=EmailProvider)
+@receiver(post_save, sender=OrganizationEmailProvider)
+@receiver(post_delete, sender=OrganizationEmailProvider)
+def clear_cached_providers(sender, instance, **kwargs):
+    """
+    Drop cached provider instances when a provider changes.
+    
+    A change can alter which provider any tenant resolves to, so the whole
+    (small) cache is cleared rather than individual entries.
+    """
+    from .utils.email_providers import clear_provider_cache
+    clear_provider_cache()
+
+
 def log_provider_health_check(provider, user=None, request=None, is_healthy=None, message=''):
     """
     Manually log a health check action.
@@ -454,3 +474,16 @@ def broadcast_campaign_status_update(sender, instance, created, **kwargs):
         
     except Exception as e:
         logger.error(f"Failed to broadcast campaign status update: {e}", exc_info=True)
+
+
+@task_prerun.connect
+def start_task_resolver_cache(task_id=None, **kwargs):
+    """Memoize HierarchicalResolver lookups for the duration of a Celery task"""
+    _task_resolver_cache_tokens[task_id] = start_resolver_cache()
+
+
+@task_postrun.connect
+def end_task_resolver_cache(task_id=None, **kwargs):
+    token = _task_resolver_cache_tokens.pop(task_id, None)
+    if token is not None:
+        end_resolver_cache(token)
@@ -1,5 +1,7 @@
 import logging
+import time
 from datetime import timedelta
+from itertools import islice
 from celery import shared_task
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
@@ -1240,7 +1242,28 @@ def launch_campaign_task(self, campaign_id):
     from_name = campaign.from_name
     from_email = campaign.from_email
     
-    for i, contact in enumerate(contacts.iterator(chunk_size=batch_size)):
+    # Everything below is fixed for the whole campaign; resolve it once
+    # instead of per recipient
+    from .utils.variable_registry import get_variable_registry
+    
+    registry = get_variable_registry()
+    render = registry.render_template
+    
+    # Combine from_name and from_email for sender
+    if from_name:
+        sender_email = f"{from_name} <{from_email}>"
+    else:
+        sender_email = from_email
+    
+    # Build headers if needed
+    headers = {'Reply-To': campaign.reply_to} if campaign.reply_to else None
+    
+    contact_iter = contacts.iterator(chunk_size=batch_size)
+    while True:
+        batch = list(islice(contact_iter, batch_size))
+        if not batch:
+            break
+        
         # Check if campaign was paused
         campaign.refresh_from_db(fields=['status'])
         if campaign.status == 'PAUSED':
@@ -1261,45 +1284,27 @@ def launch_campaign_task(self, campaign_id):
                 'failed': failed_count
             }
         
-        # Personalize content for contact using Variable Registry
-        from .utils.variable_registry import get_variable_registry
-        
-        registry = get_variable_registry()
-        
-        # Build context from contact and campaign
-        variables = registry.build_context_from_contact(
-            contact=contact,
-            campaign=campaign,
-            organization=campaign.organization
-        )
-        
-        # Render templates
-        personalized_subject = registry.render_template(subject, variables)
-        personalized_html = registry.render_template(html_content, variables)
-        personalized_text = registry.render_template(text_content, variables)
-        
-        try:
-            # Send email using provider interface
-            # Combine from_name and from_email for sender
-            if from_name:
-                sender_email = f"{from_name} <{from_email}>"
-            else:
-                sender_email = from_email
-            
-            # Build headers if needed
-            headers = {}
-            if campaign.reply_to:
-                headers['Reply-To'] = campaign.reply_to
-            
-            success, message_id, response_data = email_provider_instance.send_email(
-                recipient_email=contact.email,
-                subject=personalized_subject,
-                html_content=personalized_html,
-                text_content=personalized_text,
-                sender_email=sender_email,
-                headers=headers if headers else None
+        # Personalize content for each contact using Variable Registry
+        messages = []
+        for contact in batch:
+            variables = registry.build_context_from_contact(
+                contact=contact,
+                campaign=campaign,
+                organization=campaign.organization
             )
-            
+            messages.append({
+                'recipient_email': contact.email,
+                'subject': render(subject, variables),
+                'html_content': render(html_content, variables),
+                'text_content': render(text_content, variables),
+                'sender_email': sender_email,
+                'headers': headers,
+            })
+        
+        # Send the batch concurrently; results come back in contact order
+        results = email_provider_instance.send_many(messages)
+        
+        for contact, message, (success, message_id, response_data) in zip(batch, messages, results):
             # Log delivery
             delivery_status = 'SENT' if success else 'FAILED'
             EmailDeliveryLog.objects.create(
@@ -1308,7 +1313,7 @@ def launch_campaign_task(self, campaign_id):
                 recipient_email=contact.email,
                 contact=contact,
                 sender_email=from_email,
-                subject=personalized_subject,
+                subject=message['subject'],
                 delivery_status=delivery_status,
                 sent_at=timezone.now(),
                 provider_message_id=message_id or '',
@@ -1322,25 +1327,9 @@ def launch_campaign_task(self, campaign_id):
                 contact.save(update_fields=['emails_sent', 'last_email_sent_at'])
             else:
                 failed_count += 1
-                
-        except Exception as e:
-            failed_count += 1
-            logger.error(f"[launch_campaign_task] Error sending to {contact.email}: {e}")
-            EmailDeliveryLog.objects.create(
-                campaign=campaign,
-                organization=campaign.organization,
-                recipient_email=contact.email,
-                contact=contact,
-                sender_email=from_email,
-                subject=personalized_subject,
-                delivery_status='FAILED',
-                sent_at=timezone.now(),
-                error_message=str(e),
-            )
         
         # Batch delay
-        if batch_delay > 0 and (i + 1) % batch_size == 0:
-            import time
+        if batch_delay > 0 and len(batch) == batch_size:
             time.sleep(batch_delay)
     
     # Update campaign status
@@ -0,0 +1,23 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.apps import apps
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+
+class VerifyTemplateEngineTests(SimpleTestCase):
+    def verify(self, engine):
+        apps.get_app_config('campaigns')._verify_template_engine(SimpleNamespace(EMAIL_TEMPLATE_ENGINE=engine))
+
+    def test_django_engine_is_accepted(self):
+        self.verify('django')
+
+    def test_jinja2_engine_without_jinja2_installed_is_rejected(self):
+        with mock.patch.dict('sys.modules', {'jinja2': None}):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'jinja2 package is not installed'):
+                self.verify('jinja2')
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaisesMessage(ImproperlyConfigured, "not 'mako'"):
+            self.verify('mako')
@@ -0,0 +1,307 @@
+import smtplib
+import threading
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.authentication.models import Organization
+
+from ..models import EmailProvider, OrganizationEmailProvider
+from ..utils import email_providers
+from ..utils.email_providers import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    AWSSESProvider,
+    EmailProviderManager,
+    SMTPProvider,
+    get_circuit_breaker,
+)
+
+
+SES_RECIPIENT_REJECTED = {
+    'success': False,
+    'error': {
+        'message': 'Email address is not verified. The following identities failed the check: x@example.com',
+        'code': 'MessageRejected',
+        'provider': 'AWS_SES',
+        'type': 'ClientError',
+    },
+}
+
+SES_UNREACHABLE = {
+    'success': False,
+    'error': {
+        'message': 'Could not connect to the endpoint URL: "https://email.us-east-1.amazonaws.com/"',
+        'code': 'BOTO_CORE_ERROR',
+        'provider': 'AWS_SES',
+        'type': 'BotoCoreError',
+    },
+}
+
+
+class _FailingProvider:
+    """Provider stub whose every send fails with the same response data"""
+
+    def __init__(self, response_data):
+        self.response_data = response_data
+
+    def send_email(self, **kwargs):
+        return False, "", dict(self.response_data)
+
+    def invalidate_health(self):
+        pass
+
+
+class ProviderCircuitBreakerTests(SimpleTestCase):
+    default_provider = SimpleNamespace(pk='shared-default', id='shared-default', name='Default SES', provider_type='AWS_SES')
+
+    def setUp(self):
+        email_providers._circuit_breakers.clear()
+        self.addCleanup(email_providers._circuit_breakers.clear)
+
+    def manager(self, response_data):
+        manager = EmailProviderManager('tenant-1')
+        patches = [
+            mock.patch.object(manager, '_get_tenant_providers', return_value=[]),
+            mock.patch.object(manager, '_get_default_provider', return_value=self.default_provider),
+            mock.patch.object(email_providers, '_cached_provider', return_value=_FailingProvider(response_data)),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        return manager
+
+    @property
+    def breaker(self):
+        return get_circuit_breaker(f'provider:{self.default_provider.pk}')
+
+    def test_rejected_recipients_do_not_open_the_shared_breaker(self):
+        manager = self.manager(SES_RECIPIENT_REJECTED)
+
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD * 2):
+            success, _, _ = manager.send_email_with_fallback('x@example.com', 'Subject', '<p>Hi</p>')
+            self.assertFalse(success)
+
+        self.assertEqual(self.breaker.state, self.breaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_unreachable_provider_opens_the_breaker(self):
+        manager = self.manager(SES_UNREACHABLE)
+
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            manager.send_email_with_fallback('x@example.com', 'Subject', '<p>Hi</p>')
+
+        self.assertEqual(self.breaker.state, self.breaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_trial_rejecting_the_recipient_closes_the_breaker(self):
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, self.breaker.OPEN)
+        manager = self.manager(SES_RECIPIENT_REJECTED)
+
+        with mock.patch.object(email_providers.time, 'monotonic',
+                               return_value=self.breaker._opened_at + self.breaker.open_seconds):
+            success, _, _ = manager.send_email_with_fallback('x@example.com', 'Subject', '<p>Hi</p>')
+
+        self.assertFalse(success)
+        self.assertEqual(self.breaker.state, self.breaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_half_open_trial_failing_reopens_the_breaker(self):
+        manager = self.manager(SES_UNREACHABLE)
+        for _ in range(CIRCUIT_FAILURE_THRESHOLD):
+            manager.send_email_with_fallback('x@example.com', 'Subject', '<p>Hi</p>')
+        reopen_at = self.breaker._opened_at + self.breaker.open_seconds
+
+        with mock.patch.object(email_providers.time, 'monotonic', return_value=reopen_at):
+            manager.send_email_with_fallback('x@example.com', 'Subject', '<p>Hi</p>')
+            self.assertEqual(self.breaker.state, self.breaker.OPEN)
+            self.assertFalse(self.breaker.allow())
+
+
+class AWSSESProviderTests(SimpleTestCase):
+    config = {
+        'aws_access_key_id': 'AKIAEXAMPLE',
+        'aws_secret_access_key': 'secret',
+        'region': 'us-east-1',
+        'from_email': 'sender@example.com',
+    }
+
+    def provider(self, **config):
+        client = mock.Mock()
+        client.get_send_quota.return_value = {}
+        client.send_email.return_value = {'MessageId': 'simple-id'}
+        client.send_raw_email.return_value = {'MessageId': 'raw-id'}
+        patch = mock.patch.object(email_providers, '_get_ses_client', return_value=client)
+        patch.start()
+        self.addCleanup(patch.stop)
+        email_providers._ses_send_limiters.clear()
+        self.addCleanup(email_providers._ses_send_limiters.clear)
+        return AWSSESProvider({**self.config, **config}), client
+
+    def test_send_rate_from_quota_paces_sends(self):
+        provider, client = self.provider()
+        client.get_send_quota.return_value = {'MaxSendRate': 14.0}
+
+        with mock.patch.object(email_providers.time, 'sleep') as sleep:
+            success, message_id, _ = provider.send_email('x@example.com', 'Subject', '<p>Hi</p>')
+            provider._throttle(20)
+
+        self.assertTrue(success)
+        self.assertEqual(message_id, 'simple-id')
+        client.get_send_quota.assert_called_once()
+        bucket, _ = email_providers._ses_send_limiters[provider._send_limiter_key]
+        self.assertEqual(bucket.rate, 14.0)
+        # 14 tokens to start with, 21 taken: wait out the 7 token debt
+        [(delay,), _] = sleep.call_args
+        self.assertAlmostEqual(delay, 7 / 14.0, places=2)
+
+    def test_headers_keep_send_email_unless_raw_email_is_enabled(self):
+        provider, client = self.provider()
+
+        success, message_id, _ = provider.send_email(
+            'x@example.com', 'Subject', '<p>Hi</p>', headers={'List-Unsubscribe': '<mailto:u@example.com>'}
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(message_id, 'simple-id')
+        client.send_raw_email.assert_not_called()
+
+    def test_raw_email_sends_custom_headers(self):
+        provider, client = self.provider(use_raw_email=True)
+
+        success, message_id, _ = provider.send_email(
+            'x@example.com', 'Subject', '<p>Hi</p>', headers={'List-Unsubscribe': '<mailto:u@example.com>'}
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(message_id, 'raw-id')
+        client.send_email.assert_not_called()
+        raw = client.send_raw_email.call_args.kwargs['RawMessage']['Data']
+        self.assertIn(b'List-Unsubscribe: <mailto:u@example.com>', raw)
+
+
+class SMTPProviderTests(SimpleTestCase):
+    config = {
+        'smtp_server': 'smtp.example.com',
+        'smtp_port': 587,
+        'username': 'user@example.com',
+        'password': 'secret',
+    }
+
+    def test_open_connection_logs_in_with_configured_credentials(self):
+        provider = SMTPProvider(self.config)
+        server = mock.Mock()
+
+        with mock.patch.object(provider, '_connect', return_value=server):
+            self.assertIs(provider._open_connection(), server)
+
+        server.login.assert_called_once_with('user@example.com', 'secret')
+
+    def test_open_connection_without_oauth2_token_returns_none(self):
+        provider = SMTPProvider({**self.config, 'auth_method': 'OAUTH2'})
+        server = mock.Mock()
+
+        with mock.patch.object(provider, '_connect', return_value=server), \
+                mock.patch.object(provider, '_get_oauth2_token', return_value=None):
+            self.assertIsNone(provider._open_connection())
+
+        server.close.assert_called_once_with()
+        server.login.assert_not_called()
+
+    def send_many(self, messages, send_pipelined):
+        provider = SMTPProvider({**self.config, 'from_email': 'news@example.com'})
+        pool = mock.Mock(max_messages=100)
+        pool.acquire.return_value = mock.Mock()
+
+        with mock.patch.object(email_providers, 'smtp_pool', pool), \
+                mock.patch.object(email_providers, 'send_pipelined', side_effect=send_pipelined):
+            return provider.send_many(messages), pool
+
+    def test_send_many_sends_each_message_over_one_session_in_order(self):
+        sent = {}
+
+        def send_pipelined(server, from_addr, to_addrs, msg_bytes):
+            if to_addrs == ['b@example.com']:
+                raise smtplib.SMTPRecipientsRefused({'b@example.com': (550, b'No such user')})
+            sent[to_addrs[0]] = msg_bytes
+            return {}
+
+        messages = [
+            {'recipient_email': f'{name}@example.com', 'subject': f'Hi {name}', 'html_content': f'<p>{name}</p>'}
+            for name in 'abc'
+        ]
+        results, pool = self.send_many(messages, send_pipelined)
+
+        self.assertEqual([success for success, _, _ in results], [True, False, True])
+        self.assertEqual(pool.acquire.call_count, 1)
+        pool.release.assert_called_once_with(mock.ANY, pool.acquire.return_value, reusable=True, messages=3)
+        self.assertIn(b'To: c@example.com\r\n', sent['c@example.com'])
+        self.assertIn(b'Subject: Hi c\r\n', sent['c@example.com'])
+        self.assertIn(b'From: news@example.com\r\n', sent['a@example.com'])
+
+    def test_concurrent_sessions_each_send_their_own_recipient(self):
+        sent = {}
+        lock = threading.Lock()
+
+        def send_pipelined(server, from_addr, to_addrs, msg_bytes):
+            with lock:
+                sent[to_addrs[0]] = msg_bytes
+            return {}
+
+        # Enough messages to spread over several concurrent sessions, with
+        # addresses that need header encoding mixed in
+        recipients = [f'user{i}@example.com' if i % 3 else f'jürgen{i}@exämple.com' for i in range(40)]
+        results, pool = self.send_many(
+            [{'recipient_email': to, 'subject': 'Hi', 'html_content': '<p>Hi</p>'} for to in recipients],
+            send_pipelined,
+        )
+
+        self.assertTrue(all(success for success, _, _ in results))
+        self.assertGreater(pool.acquire.call_count, 1)
+        for to in recipients:
+            with self.subTest(to=to):
+                msg = message_from_bytes(sent[to])
+                self.assertEqual(str(make_header(decode_header(msg['To']))), to)
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class EmailProviderManagerQueryTests(TestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.organization = Organization.objects.create(name='Acme', slug='acme', owner=owner)
+
+    def shared_provider(self, name, **fields):
+        return EmailProvider.objects.create(name=name, provider_type='AWS_SES', is_shared=True, **fields)
+
+    def test_tenant_providers_are_the_organizations_usable_links(self):
+        backup = OrganizationEmailProvider.objects.create(
+            organization=self.organization, provider=self.shared_provider('Backup', priority=2)
+        )
+        primary = OrganizationEmailProvider.objects.create(
+            organization=self.organization, provider=self.shared_provider('Primary', priority=3), is_primary=True
+        )
+        OrganizationEmailProvider.objects.create(
+            organization=self.organization, provider=self.shared_provider('Disabled'), is_enabled=False
+        )
+        OrganizationEmailProvider.objects.create(
+            organization=self.organization, provider=self.shared_provider('Inactive', is_active=False)
+        )
+        OrganizationEmailProvider.objects.create(
+            organization=self.organization, provider=self.shared_provider('Exhausted', emails_sent_today=10000)
+        )
+
+        manager = EmailProviderManager(str(self.organization.id))
+
+        self.assertEqual(list(manager._get_tenant_providers()), [primary, backup])
+        self.assertEqual(list(EmailProviderManager(None)._get_tenant_providers()), [])
+
+    def test_default_provider_is_the_active_shared_default(self):
+        self.shared_provider('Retired', is_default=True, is_active=False)
+        default = self.shared_provider('Default', is_default=True)
+
+        self.assertEqual(EmailProviderManager(None)._get_default_provider(), default)
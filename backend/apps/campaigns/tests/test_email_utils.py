@@ -0,0 +1,40 @@
+from django.test import SimpleTestCase
+
+from ..utils.email_utils import _to_format_string, process_template_variables
+
+
+class ProcessTemplateVariablesTests(SimpleTestCase):
+    def test_format_map_path_substitutes_and_keeps_literal_braces(self):
+        text = 'Hi {{ first_name }}, {{missing}}{literal} {{count}}}'
+
+        self.assertIsNotNone(_to_format_string(text))
+        self.assertEqual(
+            process_template_variables(text, {'first_name': 'Zoë', 'count': 7}),
+            'Hi Zoë, {literal} 7}',
+        )
+
+    def test_format_map_path_stringifies_values_like_the_regex_path(self):
+        text = '{{count}} items, {{price}} each, note: {{note}}'
+
+        self.assertEqual(
+            process_template_variables(text, {'count': 3, 'price': 9.5, 'note': None}),
+            '3 items, 9.5 each, note: None',
+        )
+
+    def test_names_str_format_would_misread_use_the_regex_path(self):
+        context = {'user.name': 'Ada', '0': 'zero', 'a[1]': 'item', 'x:y': 'colon', '': 'empty'}
+        for text, expected in [
+            ('Hello {{user.name}}', 'Hello Ada'),
+            ('{{ 0 }} and {{missing}}', 'zero and '),
+            ('{{a[1]}} {literal}', 'item {literal}'),
+            ('{{x:y}}', 'colon'),
+            ('[{{}}]', '[empty]'),
+        ]:
+            with self.subTest(text=text):
+                self.assertIsNone(_to_format_string(text))
+                self.assertEqual(process_template_variables(text, context), expected)
+
+    def test_text_without_placeholders_is_unchanged(self):
+        text = 'No variables {here} at all }'
+
+        self.assertEqual(process_template_variables(text, {}), text)
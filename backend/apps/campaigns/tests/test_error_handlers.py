@@ -2,12 +2,12 @@
 Test cases for email error handling.
 """
 
-import pytest
 from unittest.mock import Mock
 from botocore.exceptions import ClientError
+from django.test import SimpleTestCase
 
-from campaigns.utils.error_handlers import EmailErrorHandler
-from campaigns.exceptions import (
+from apps.campaigns.utils.error_handlers import EmailErrorHandler
+from apps.campaigns.exceptions import (
     EmailVerificationError,
     EmailQuotaExceededError,
     EmailBlacklistedError,
@@ -17,7 +17,7 @@ from campaigns.exceptions import (
 )
 
 
-class TestEmailErrorHandler:
+class TestEmailErrorHandler(SimpleTestCase):
     """Test suite for EmailErrorHandler."""
     
     def test_ses_verification_error_with_message_rejected(self):
@@ -118,6 +118,68 @@ class TestEmailErrorHandler:
         assert isinstance(classified_error, EmailInvalidRecipientError)
         assert 'invalid email' in user_message.lower()
     
+    def test_ses_mail_from_not_verified_codes(self):
+        """Test SES MAIL FROM verification codes are classified by code alone."""
+        for error_code in [
+            'MailFromDomainNotVerified',
+            'MailFromDomainNotVerifiedException',
+        ]:
+            with self.subTest(error_code=error_code):
+                exception = ClientError({'Error': {'Code': error_code, 'Message': 'Domain check failed'}}, 'SendEmail')
+        
+                is_retryable, user_message, classified_error = EmailErrorHandler.handle_exception(
+                    exception=exception,
+                    provider_type='AWS_SES',
+                    context={'rule_id': 'test-rule-123', 'from_email': 'noreply@example.com'}
+                )
+        
+                assert is_retryable is False
+                assert isinstance(classified_error, EmailVerificationError)
+                assert EmailErrorHandler.is_retryable(exception, 'AWS_SES') is False
+    
+    def test_ses_throttling_codes(self):
+        """Test SES throttling codes are classified by code alone."""
+        for error_code in [
+            'Throttling',
+            'ThrottlingException',
+            'TooManyRequestsException',
+        ]:
+            with self.subTest(error_code=error_code):
+                exception = ClientError({'Error': {'Code': error_code, 'Message': 'Rate exceeded'}}, 'SendEmail')
+        
+                is_retryable, user_message, classified_error = EmailErrorHandler.handle_exception(
+                    exception=exception,
+                    provider_type='AWS_SES',
+                    context={'rule_id': 'test-rule-123'}
+                )
+        
+                assert is_retryable is True
+                assert isinstance(classified_error, EmailQuotaExceededError)
+                assert EmailErrorHandler.is_retryable(exception, 'AWS_SES') is True
+    
+    def test_ses_sending_paused_codes(self):
+        """Test paused sending is reported as an account problem, not a suppressed recipient."""
+        for error_code in [
+            'AccountSendingPausedException',
+            'ConfigurationSetSendingPausedException',
+            'SendingPausedException',
+        ]:
+            with self.subTest(error_code=error_code):
+                exception = ClientError({'Error': {'Code': error_code, 'Message': 'Sending paused'}}, 'SendEmail')
+        
+                is_retryable, user_message, classified_error = EmailErrorHandler.handle_exception(
+                    exception=exception,
+                    provider_type='AWS_SES',
+                    context={'rule_id': 'test-rule-123', 'recipient_email': 'someone@example.com'}
+                )
+        
+                assert is_retryable is False
+                assert isinstance(classified_error, EmailProviderConfigError)
+                assert not isinstance(classified_error, EmailBlacklistedError)
+                assert 'paused' in user_message.lower()
+                assert 'someone@example.com' not in user_message
+                assert 'suppression list' not in user_message.lower()
+    
     def test_smtp_authentication_error(self):
         """Test handling of SMTP authentication failures."""
         exception = Exception('535 Authentication failed: Invalid credentials')
@@ -166,3 +228,20 @@ class TestEmailErrorHandler:
         
         assert is_retryable is True  # Default to retryable
         assert 'email sending failed' in user_message.lower()
+    
+    def test_is_provider_failure(self):
+        """Test only provider-level failures count against a provider."""
+        for response_data, provider_type, expected in [
+            ({'error': {'code': 'MessageRejected', 'message': 'Address is on suppression list', 'type': 'ClientError'}}, 'AWS_SES', False),
+            ({'error': {'code': 'InvalidParameterValue', 'message': 'Invalid email address', 'type': 'ClientError'}}, 'AWS_SES', False),
+            ({'error': {'code': 'Throttling', 'message': 'Maximum sending rate exceeded', 'type': 'ClientError'}}, 'AWS_SES', True),
+            ({'error': {'code': 'AccountSendingPausedException', 'message': 'Sending paused', 'type': 'ClientError'}}, 'AWS_SES', True),
+            ({'error': {'code': 'BOTO_CORE_ERROR', 'message': 'Read timeout on endpoint URL', 'type': 'BotoCoreError'}}, 'AWS_SES', True),
+            ({'error_message': "{'bad@example.com': (550, b'5.1.1 User unknown')}", 'error_type': 'SMTPError'}, 'SMTP', False),
+            ({'error_message': '[Errno 111] Connection refused', 'error_type': 'SMTPError'}, 'SMTP', True),
+            ({'error_message': 'timed out', 'error_type': 'SMTPError'}, 'SMTP', True),
+            ({'error_message': '535 Authentication failed', 'error_type': 'SMTPError'}, 'SMTP', True),
+            ({'error_message': 'Failed to obtain OAuth2 access token', 'error_type': 'AuthenticationError'}, 'SMTP', True),
+        ]:
+            with self.subTest(response_data=response_data):
+                assert EmailErrorHandler.is_provider_failure(response_data, provider_type) is expected
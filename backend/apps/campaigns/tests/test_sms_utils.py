@@ -0,0 +1,65 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..utils.sms_utils import _format_numbers, _normalize, _send_messages
+
+
+class NormalizeNumberTests(SimpleTestCase):
+    def test_numbers_are_normalized_to_international_form(self):
+        for number, expected in [
+            # Already international
+            ('+14155550100', '+14155550100'),
+            ('+8801712345678', '+8801712345678'),
+            # Bangladeshi country code without '+'
+            ('8801712345678', '+8801712345678'),
+            # Local 01... numbers lose the trunk 0
+            ('01712345678', '+8801712345678'),
+            # Other local numbers get the country code prepended
+            ('1712345678', '+8801712345678'),
+            ('0212345678', '+8800212345678'),
+            # WhatsApp prefix and surrounding whitespace are dropped
+            ('whatsapp:+8801712345678', '+8801712345678'),
+            ('whatsapp:01712345678', '+8801712345678'),
+            ('  01712345678\n', '+8801712345678'),
+        ]:
+            with self.subTest(number=number):
+                self.assertEqual(_normalize(number), expected)
+
+    def test_format_numbers_keeps_the_original_alongside(self):
+        self.assertEqual(
+            _format_numbers(['01712345678', '+14155550100']),
+            [('01712345678', '+8801712345678'), ('+14155550100', '+14155550100')],
+        )
+
+
+class SendMessagesTests(SimpleTestCase):
+    def test_sids_come_back_in_recipient_order(self):
+        recipients = [(f'0171000000{i}', f'+880171000000{i}') for i in range(5)]
+        first_sent = threading.Event()
+
+        def create(from_, body, to):
+            if to == recipients[0][1]:
+                # Finish the first recipient last
+                first_sent.wait(1)
+            elif to == recipients[-1][1]:
+                first_sent.set()
+            if to == recipients[2][1]:
+                raise RuntimeError('rejected')
+            return SimpleNamespace(sid=f'SM-{to}')
+
+        client = mock.Mock()
+        client.messages.create.side_effect = create
+
+        with self.assertLogs('apps.campaigns.utils.sms_utils', 'ERROR'):
+            sids = _send_messages(client, '+15550100', 'Hello', recipients, 'SMS')
+
+        self.assertEqual(sids, [f'SM-{to}' for i, (_, to) in enumerate(recipients) if i != 2])
+
+    def test_no_recipients_sends_nothing(self):
+        client = mock.Mock()
+
+        self.assertEqual(_send_messages(client, '+15550100', 'Hello', [], 'SMS'), [])
+        client.messages.create.assert_not_called()
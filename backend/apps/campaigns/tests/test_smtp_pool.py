@@ -0,0 +1,346 @@
+import re
+import smtplib
+import socket
+import socketserver
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from ..utils import smtp_pool
+from ..utils.smtp_pool import SMTP, SMTPConnectionPool, resolve_host, send_pipelined
+
+
+class _StubSMTP:
+    """Records the calls the pool makes on a session"""
+
+    def __init__(self, name, noop_code=250):
+        self.name = name
+        self.noop_code = noop_code
+        self.calls = []
+
+    def noop(self):
+        self.calls.append('noop')
+        return self.noop_code, b'OK'
+
+    def rset(self):
+        self.calls.append('rset')
+        return 250, b'OK'
+
+    def quit(self):
+        self.calls.append('quit')
+
+    def close(self):
+        self.calls.append('close')
+
+
+class SMTPConnectionPoolTests(SimpleTestCase):
+    key = ('smtp.example.com', 587, 'user')
+
+    def setUp(self):
+        self.pool = SMTPConnectionPool(max_idle_per_key=2, max_idle_total=3, idle_timeout=60, max_messages=3)
+        # Reaping is driven by the tests, not the background thread
+        patch = mock.patch.object(self.pool, '_ensure_reaper')
+        patch.start()
+        self.addCleanup(patch.stop)
+        self.opened = []
+
+    def connect(self):
+        server = _StubSMTP(f'session-{len(self.opened)}')
+        self.opened.append(server)
+        return server
+
+    def test_released_session_is_reused_most_recent_first(self):
+        first = self.pool.acquire(self.key, self.connect)
+        second = self.pool.acquire(self.key, self.connect)
+        self.pool.release(self.key, first)
+        self.pool.release(self.key, second)
+
+        self.assertIs(self.pool.acquire(self.key, self.connect), second)
+        self.assertIs(self.pool.acquire(self.key, self.connect), first)
+        self.assertEqual(len(self.opened), 2)
+        self.assertEqual(second.calls, ['rset', 'noop'])
+
+    def test_session_failing_noop_is_replaced(self):
+        stale = self.pool.acquire(self.key, self.connect)
+        self.pool.release(self.key, stale)
+        stale.noop_code = 421
+
+        fresh = self.pool.acquire(self.key, self.connect)
+
+        self.assertIsNot(fresh, stale)
+        self.assertEqual(stale.calls[-1], 'close')
+        self.assertEqual(len(self.opened), 2)
+
+    def test_session_is_retired_after_max_messages(self):
+        server = self.pool.acquire(self.key, self.connect)
+        self.pool.release(self.key, server, messages=2)
+        self.assertIs(self.pool.acquire(self.key, self.connect), server)
+
+        self.pool.release(self.key, server)
+
+        self.assertEqual(server.calls[-1], 'quit')
+        self.assertIsNot(self.pool.acquire(self.key, self.connect), server)
+
+    def test_unusable_session_is_closed_not_pooled(self):
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection(self.key, self.connect) as server:
+                raise RuntimeError('send failed')
+
+        self.assertEqual(server.calls, ['quit'])
+        self.assertIsNot(self.pool.acquire(self.key, self.connect), server)
+
+    def test_idle_sessions_per_key_are_capped(self):
+        servers = [self.pool.acquire(self.key, self.connect) for _ in range(3)]
+        for server in servers:
+            self.pool.release(self.key, server)
+
+        self.assertEqual(servers[2].calls, ['rset', 'quit'])
+        self.assertEqual(self.pool._idle_total, 2)
+
+    def test_reap_closes_sessions_idle_past_the_timeout(self):
+        with mock.patch.object(smtp_pool.time, 'monotonic', return_value=1000.0):
+            old = self.pool.acquire(self.key, self.connect)
+            self.pool.release(self.key, old)
+        with mock.patch.object(smtp_pool.time, 'monotonic', return_value=1050.0):
+            recent = self.pool.acquire(('other.example.com', 25, None), self.connect)
+            self.pool.release(('other.example.com', 25, None), recent)
+
+        with mock.patch.object(smtp_pool.time, 'monotonic', return_value=1070.0):
+            self.assertEqual(self.pool.reap(), 1)
+
+        self.assertEqual(old.calls[-1], 'quit')
+        self.assertNotIn(self.key, self.pool._idle)
+        self.assertEqual(self.pool._idle_total, 1)
+        self.assertEqual(recent.calls, ['rset'])
+
+    def test_after_fork_forgets_sessions_without_ending_them(self):
+        server = self.pool.acquire(self.key, self.connect)
+        self.pool.release(self.key, server)
+        lock = self.pool._lock
+
+        self.pool._after_fork()
+
+        self.assertIsNot(self.pool._lock, lock)
+        self.assertEqual(self.pool._idle_total, 0)
+        self.assertIsNot(self.pool.acquire(self.key, self.connect), server)
+        # The parent's session was neither QUIT nor reset from the child
+        self.assertEqual(server.calls, ['rset'])
+
+
+class _FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Answers one SMTP command per line, so pipelined commands queue up"""
+
+    def reply(self, text):
+        self.wfile.write(text.encode() + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        self.reply('220 fake.example.com ESMTP')
+        accepted = []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.rstrip(b'\r\n').decode()
+            server.commands.append(command)
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                extensions = ['8BITMIME'] + (['SMTPUTF8'] if server.smtputf8 else [])
+                extensions += ['PIPELINING'] if server.pipelining else []
+                for extension in ['fake.example.com'] + extensions[:-1]:
+                    self.reply(f'250-{extension}')
+                self.reply(f'250 {extensions[-1]}')
+            elif verb == 'MAIL':
+                accepted = []
+                if re.fullmatch(r'MAIL FROM:<[^<>\s]*>( BODY=8BITMIME| SMTPUTF8)*', command, re.IGNORECASE):
+                    self.reply('250 Sender OK')
+                else:
+                    self.reply('501 Malformed sender address')
+            elif verb == 'RCPT':
+                address = command[len('RCPT TO:<'):-1]
+                if address in server.refused:
+                    self.reply('550 No such user')
+                else:
+                    accepted.append(address)
+                    self.reply('250 Recipient OK')
+            elif verb == 'DATA':
+                if not accepted:
+                    self.reply('554 No valid recipients')
+                    continue
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b'.\r\n', b''):
+                        break
+                    lines.append(data_line)
+                server.messages.append((list(accepted), b''.join(lines)))
+                self.reply('250 Queued')
+            elif verb in ('RSET', 'NOOP'):
+                accepted = []
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, pipelining=True, smtputf8=False, refused=()):
+        super().__init__(('127.0.0.1', 0), _FakeSMTPHandler)
+        self.pipelining = pipelining
+        self.smtputf8 = smtputf8
+        self.refused = set(refused)
+        self.commands = []
+        self.messages = []
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    def connect(self):
+        return smtplib.SMTP(*self.server_address, timeout=5)
+
+
+def _unstuff(data):
+    # Undo the sender's dot-stuffing (RFC 5321 4.5.2)
+    return re.sub(br'(?m)^\.\.', b'.', data)
+
+
+class SendPipelinedTests(SimpleTestCase):
+    body = (
+        b'Subject: Pipelined\r\n'
+        b'\r\n'
+        b'.leading period\r\n'
+        b'..two periods\r\n'
+        b'.\r\n'
+        b'last line'
+    )
+
+    def test_display_name_sender_and_partially_refused_recipients(self):
+        with FakeSMTPServer(refused={'bad@example.com'}) as fake:
+            server = fake.connect()
+            refused = send_pipelined(
+                server,
+                'Campaign Team <sender@example.com>',
+                ['good@example.com', 'bad@example.com', 'Other <other@example.com>'],
+                self.body,
+            )
+            server.quit()
+
+        self.assertEqual(list(refused), ['bad@example.com'])
+        self.assertEqual(refused['bad@example.com'][0], 550)
+        self.assertEqual(fake.commands[1:5], [
+            'MAIL FROM:<sender@example.com>',
+            'RCPT TO:<good@example.com>',
+            'RCPT TO:<bad@example.com>',
+            'RCPT TO:<other@example.com>',
+        ])
+
+        [(recipients, data)] = fake.messages
+        self.assertEqual(recipients, ['good@example.com', 'other@example.com'])
+        # Every line starting with a period reached the server stuffed, and
+        # the message came through unchanged once unstuffed
+        for line in data.split(b'\r\n'):
+            self.assertFalse(line.startswith(b'.') and not line.startswith(b'..'), line)
+        self.assertEqual(_unstuff(data), self.body + b'\r\n')
+
+    def test_all_recipients_refused_raises_and_leaves_session_usable(self):
+        with FakeSMTPServer(refused={'bad@example.com'}) as fake:
+            server = fake.connect()
+            with self.assertRaises(smtplib.SMTPRecipientsRefused) as raised:
+                send_pipelined(server, 'Sender <sender@example.com>', ['bad@example.com'], self.body)
+            self.assertEqual(list(raised.exception.recipients), ['bad@example.com'])
+            self.assertEqual(server.noop()[0], 250)
+            server.quit()
+
+        self.assertEqual(fake.messages, [])
+
+    def test_without_pipelining_uses_sendmail(self):
+        with FakeSMTPServer(pipelining=False, refused={'bad@example.com'}) as fake:
+            server = fake.connect()
+            refused = send_pipelined(
+                server,
+                'Sender <sender@example.com>',
+                ['good@example.com', 'bad@example.com'],
+                self.body,
+            )
+            server.quit()
+
+        self.assertEqual(list(refused), ['bad@example.com'])
+        [(recipients, data)] = fake.messages
+        self.assertEqual(recipients, ['good@example.com'])
+        self.assertEqual(_unstuff(data), self.body + b'\r\n')
+
+    def test_non_ascii_addresses_use_sendmail_with_smtputf8(self):
+        with FakeSMTPServer(smtputf8=True) as fake:
+            server = fake.connect()
+            refused = send_pipelined(server, 'Zoë <zoë@example.com>', ['jürgen@example.com'], self.body)
+            server.quit()
+
+        self.assertEqual(refused, {})
+        self.assertIn('mail FROM:<zoë@example.com> SMTPUTF8', fake.commands)
+        [(recipients, _)] = fake.messages
+        self.assertEqual(recipients, ['jürgen@example.com'])
+
+
+def _addrinfo(*addresses):
+    return [
+        (socket.AF_INET6 if ':' in address else socket.AF_INET, socket.SOCK_STREAM, 6, '', (address, 25))
+        for address in addresses
+    ]
+
+
+class CachedResolutionTests(SimpleTestCase):
+    host = 'mail.example.com'
+
+    def setUp(self):
+        smtp_pool._resolved_hosts.clear()
+        self.addCleanup(smtp_pool._resolved_hosts.clear)
+        self.attempts = []
+
+    def fake_connect(self, unreachable):
+        def connect(smtp, address, port, timeout):
+            self.attempts.append(address)
+            if address in unreachable:
+                raise OSError(101, 'Network is unreachable')
+            return f'socket to {address}'
+        return mock.patch.object(smtplib.SMTP, '_get_socket', connect)
+
+    def test_every_address_is_cached_once(self):
+        records = _addrinfo('2001:db8::1', '192.0.2.1', '192.0.2.1')
+        with mock.patch.object(socket, 'getaddrinfo', return_value=records) as getaddrinfo:
+            self.assertEqual(resolve_host(self.host, 25), ('2001:db8::1', '192.0.2.1'))
+            self.assertEqual(resolve_host(self.host, 25), ('2001:db8::1', '192.0.2.1'))
+        getaddrinfo.assert_called_once()
+
+    def test_falls_back_to_next_address_and_prefers_it(self):
+        records = _addrinfo('2001:db8::1', '192.0.2.1')
+        with mock.patch.object(socket, 'getaddrinfo', return_value=records), \
+                self.fake_connect(unreachable={'2001:db8::1'}):
+            self.assertEqual(SMTP()._get_socket(self.host, 25, 5), 'socket to 192.0.2.1')
+            self.assertEqual(SMTP()._get_socket(self.host, 25, 5), 'socket to 192.0.2.1')
+
+        # The unreachable address was only tried before the first success
+        self.assertEqual(self.attempts, ['2001:db8::1', '192.0.2.1', '192.0.2.1'])
+        self.assertEqual(resolve_host(self.host, 25), ('192.0.2.1', '2001:db8::1'))
+
+    def test_all_addresses_failing_forgets_the_host(self):
+        records = _addrinfo('2001:db8::1', '192.0.2.1')
+        with mock.patch.object(socket, 'getaddrinfo', return_value=records), \
+                self.fake_connect(unreachable={'2001:db8::1', '192.0.2.1'}):
+            with self.assertRaises(OSError):
+                SMTP()._get_socket(self.host, 25, 5)
+
+        self.assertEqual(self.attempts, ['2001:db8::1', '192.0.2.1'])
+        self.assertNotIn((self.host, 25), smtp_pool._resolved_hosts)
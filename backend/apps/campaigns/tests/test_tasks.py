@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.authentication.models import Organization
+
+from ..models import Campaign, Contact, ContactList, EmailDeliveryLog, EmailProvider
+from ..tasks import launch_campaign_task
+
+
+class _RecordingProvider:
+    """Accepts every recipient except the rejected ones, recording each batch"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.batches = []
+
+    def send_email(self, **message):
+        raise AssertionError('campaign dispatch should send through send_many')
+
+    def send_many(self, messages):
+        self.batches.append(messages)
+        return [
+            (False, '', {'error_message': 'Mailbox unavailable'})
+            if message['recipient_email'] in self.rejected
+            else (True, f"id-{message['recipient_email']}", {})
+            for message in messages
+        ]
+
+
+@override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+class LaunchCampaignTaskTests(TestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.organization = Organization.objects.create(name='Acme', slug='acme', owner=owner)
+        contact_list = ContactList.objects.create(organization=self.organization, name='Customers')
+        self.emails = [f'customer{i}@example.com' for i in range(5)]
+        for i, email in enumerate(self.emails):
+            contact = Contact.objects.create(organization=self.organization, email=email, first_name=f'C{i}')
+            contact.lists.add(contact_list)
+        EmailProvider.objects.create(
+            name='Acme SMTP',
+            provider_type='SMTP',
+            organization=self.organization,
+            encrypted_config='',
+            is_default=True,
+        )
+        self.campaign = Campaign.objects.create(
+            organization=self.organization,
+            name='Launch',
+            subject='Hi {{first_name}}',
+            html_content='<p>Hello {{first_name}}</p>',
+            from_email='news@example.com',
+            status='SENDING',
+            batch_size=2,
+        )
+        self.campaign.contact_lists.add(contact_list)
+
+    def launch(self, provider):
+        with mock.patch(
+            'apps.campaigns.utils.email_providers.EmailProviderFactory.create_provider',
+            return_value=provider,
+        ):
+            return launch_campaign_task(self.campaign.id)
+
+    def test_contacts_are_sent_in_batches_through_send_many(self):
+        provider = _RecordingProvider(rejected={self.emails[3]})
+
+        result = self.launch(provider)
+
+        self.assertEqual(result['sent'], 4)
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual([len(batch) for batch in provider.batches], [2, 2, 1])
+        messages = [message for batch in provider.batches for message in batch]
+        self.assertCountEqual([message['recipient_email'] for message in messages], self.emails)
+        for message in messages:
+            contact = Contact.objects.get(email=message['recipient_email'])
+            self.assertEqual(message['subject'], f'Hi {contact.first_name}')
+
+        logs = {log.recipient_email: log for log in EmailDeliveryLog.objects.filter(campaign=self.campaign)}
+        self.assertEqual(logs[self.emails[3]].delivery_status, 'FAILED')
+        self.assertEqual(logs[self.emails[3]].error_message, 'Mailbox unavailable')
+        self.assertEqual(logs[self.emails[0]].delivery_status, 'SENT')
+        self.assertEqual(logs[self.emails[0]].provider_message_id, f'id-{self.emails[0]}')
+        self.assertEqual(Contact.objects.get(email=self.emails[0]).emails_sent, 1)
+        self.assertEqual(Contact.objects.get(email=self.emails[3]).emails_sent, 0)
+
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'SENT')
+
+    def test_paused_campaign_stops_before_the_next_batch(self):
+        provider = _RecordingProvider()
+        Campaign.objects.filter(id=self.campaign.id).update(status='PAUSED')
+
+        result = self.launch(provider)
+
+        self.assertTrue(result['paused'])
+        self.assertEqual(provider.batches, [])
@@ -0,0 +1,139 @@
+from sys import intern
+
+from django.test import SimpleTestCase
+from django.urls import Resolver404, URLResolver, include, path, resolve, reverse
+from django.urls.resolvers import RoutePattern
+from django.views.generic import View
+
+from core.utils import indexed_include
+
+from ..urls import intern_names
+
+
+RULE_ID = '11111111-2222-3333-4444-555555555555'
+
+
+class TriggerRouteTests(SimpleTestCase):
+    def test_trigger_routes_resolve_with_and_without_rule(self):
+        for channel in ('email', 'sms', 'whatsapp'):
+            with self.subTest(channel=channel):
+                match = resolve(f'/api/v1/campaigns/trigger/{channel}/')
+                self.assertEqual(match.url_name, f'trigger-{channel}')
+                self.assertEqual(match.kwargs, {})
+
+                match = resolve(f'/api/v1/campaigns/trigger/{channel}/{RULE_ID}/')
+                self.assertEqual(match.url_name, f'trigger-{channel}')
+                self.assertEqual(match.kwargs, {'rule_id': RULE_ID})
+
+    def test_by_rule_names_still_reverse(self):
+        for channel in ('email', 'sms', 'whatsapp'):
+            with self.subTest(channel=channel):
+                self.assertEqual(
+                    reverse(f'trigger-{channel}-by-rule', kwargs={'rule_id': RULE_ID}),
+                    f'/api/v1/campaigns/trigger/{channel}/{RULE_ID}/',
+                )
+
+
+class HealthRouteTests(SimpleTestCase):
+    def test_health_check_is_mounted_outside_debug(self):
+        self.assertEqual(resolve('/api/v1/healthz/').url_name, 'health_check_home')
+
+
+class InternNamesTests(SimpleTestCase):
+    def test_unnamed_patterns_are_skipped(self):
+        view = View.as_view()
+        patterns = [
+            path('named/', view, name=''.join(['named-', 'route'])),
+            path('unnamed/', view),
+            path('group/', include([path('inner/', view)])),
+        ]
+
+        intern_names(patterns)
+
+        self.assertIs(patterns[0].name, intern('named-route'))
+        self.assertIsNone(patterns[1].name)
+        self.assertIsNone(patterns[2].url_patterns[0].name)
+
+
+def _view(request, *args, **kwargs):
+    pass
+
+
+class IndexedURLResolverStaticMatchTests(SimpleTestCase):
+    def resolver(self):
+        return indexed_include('api/', [
+            path('stats/', _view, name='stats'),
+            path('items/<uuid_str:pk>/', _view, name='item-detail'),
+        ])
+
+    def test_parameterless_match_is_reused(self):
+        resolver = self.resolver()
+
+        first = resolver.resolve('api/stats/')
+
+        self.assertEqual(first.url_name, 'stats')
+        self.assertIs(resolver.resolve('api/stats/'), first)
+
+    def test_matches_with_captured_kwargs_are_not_stored(self):
+        resolver = self.resolver()
+
+        match = resolver.resolve(f'api/items/{RULE_ID}/')
+
+        self.assertEqual(match.kwargs, {'pk': RULE_ID})
+        self.assertEqual(resolver._static_matches, {})
+
+    def test_misses_are_not_stored(self):
+        resolver = self.resolver()
+
+        with self.assertRaises(Resolver404):
+            resolver.resolve('api/unknown/')
+        self.assertEqual(resolver._static_matches, {})
+
+
+class IndexedURLResolverSegmentIndexTests(SimpleTestCase):
+    def test_earlier_wildcard_pattern_still_wins(self):
+        resolver = indexed_include('api/', [
+            path('<uuid_str:pk>/', _view, name='by-id'),
+            path('<slug:name>/', _view, name='by-slug'),
+            path('stats/', _view, name='stats'),
+        ])
+
+        self.assertEqual(resolver.resolve('api/stats/').url_name, 'by-slug')
+        self.assertEqual(resolver.resolve(f'api/{RULE_ID}/').url_name, 'by-id')
+
+    def test_prefix_without_slash_matches_longer_segments(self):
+        resolver = indexed_include('api/', [
+            path('foo', include([path('bar/', _view, name='foobar')])),
+            path('foo/', _view, name='foo'),
+        ])
+
+        self.assertEqual(resolver.resolve('api/foobar/').url_name, 'foobar')
+        self.assertEqual(resolver.resolve('api/foo/').url_name, 'foo')
+
+    def test_campaign_routes_resolve_like_the_linear_resolver(self):
+        prefix = 'api/v1/campaigns/'
+        indexed = indexed_include(prefix, 'apps.campaigns.urls')
+        linear = URLResolver(RoutePattern(prefix, is_endpoint=False), 'apps.campaigns.urls')
+
+        paths = set()
+        for name in linear.reverse_dict:
+            if not isinstance(name, str):
+                continue
+            for possibilities, *_ in linear.reverse_dict.getlist(name):
+                for template, params in possibilities:
+                    paths.add(prefix + template % {param: RULE_ID for param in params})
+
+        def outcome(resolver, url):
+            try:
+                match = resolver.resolve(url)
+            except Resolver404:
+                return None
+            return match.url_name, match.args, match.kwargs, match.route
+
+        resolved = 0
+        for url in sorted(paths):
+            with self.subTest(url=url):
+                expected = outcome(linear, url)
+                self.assertEqual(outcome(indexed, url), expected)
+                resolved += expected is not None
+        self.assertGreater(resolved, 50)
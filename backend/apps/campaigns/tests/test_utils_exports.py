@@ -0,0 +1,18 @@
+from importlib import import_module
+
+from django.test import SimpleTestCase
+
+from .. import utils
+
+
+class LazyExportTests(SimpleTestCase):
+    def test_lazy_table_matches_submodule_all(self):
+        for module_name in ('email_utils', 'sms_utils'):
+            with self.subTest(module=module_name):
+                module = import_module(f'{utils.__name__}.{module_name}')
+                self.assertEqual(utils._LAZY_MODULES[module_name], module.__all__)
+
+    def test_every_export_resolves(self):
+        for name in utils.__all__:
+            with self.subTest(name=name):
+                self.assertTrue(callable(getattr(utils, name)))
@@ -7,13 +7,18 @@ Simplified URL structure organized into clear sections:
 3. Automation Rules
 4. Email Delivery & Tracking
 5. SMS/WhatsApp Automation
-6. Admin/Platform Operations
+6. Admin/Platform Operations (apps/campaigns/urls_admin.py)
 7. Public Endpoints (Unsubscribe, Tracking)
 
 All endpoints use APIView for explicit control.
 """
 
-from django.urls import path
+from sys import intern
+
+from django.conf import settings
+from django.urls import URLResolver, include, path, re_path, register_converter
+
+from core.utils import UUIDStringConverter, lazy_view
 # Import campaign views
 from .views import (
     # Contact List Views
@@ -31,9 +36,7 @@ from .views import (
     CampaignDetailView,
     CampaignLaunchView,
     CampaignScheduleView,
-    CampaignPauseView,
-    CampaignResumeView,
-    CampaignCancelView,
+    CampaignTransitionView,
     CampaignResetView,
     CampaignPreviewView,
     CampaignTestSendView,
@@ -47,20 +50,6 @@ from .views import (
     GDPRForgetView,
     PublicContactSubscribeView,
     
-    # Admin Views
-    AdminEmailProviderListCreateView,
-    AdminEmailProviderDetailView,
-    AdminEmailProviderSetDefaultView,
-    AdminEmailProviderHealthCheckView,
-    AdminEmailProviderTestSendView,
-    AdminOrganizationConfigListView,
-    AdminOrganizationConfigDetailView,
-    AdminOrganizationSuspendView,
-    AdminOrganizationUnsuspendView,
-    AdminOrganizationUpgradePlanView,
-    AdminPlatformStatsView,
-    IsPlatformAdmin,
-    
     # Email Template Views
     EmailTemplateListCreateView,
     EmailTemplateDetailView,
@@ -105,222 +94,199 @@ from .views.notification_views import (
 # Import push notification views
 from .views.push_views import PushSubscriptionViewSet
 
-# Import template operation views
-from .views.template_operations import (
-    EmailTemplateUseView,
-    EmailTemplateBulkUseView,
-    EmailTemplateVersionHistoryView,
-    EmailTemplateCreateVersionView,
-    EmailTemplateSubmitForApprovalView,
-    TemplateApprovalReviewView,
-    TemplatePreviewTestView,
-    EmailTemplateUpdateFromGlobalView,
-)
+# Same shape as Django's <uuid:...> path converter
+UUID_RE = '[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
 
-# Import admin template views
-from .views.admin_templates import (
-    AdminGlobalTemplateListCreateView,
-    AdminGlobalTemplateDetailView,
-    AdminTemplateAnalyticsView,
-    AdminTemplateAnalyticsSummaryView,
-    AdminPendingApprovalsView,
-)
+# <uuid_str:pk> matches like <uuid:pk> but skips the uuid.UUID() round trip;
+# views only pass pk into ORM lookups, which take the string as-is.
+register_converter(UUIDStringConverter, 'uuid_str')
 
-# Import organization admin views
-from .views.organization_admin import (
-    OrganizationTemplateUsageView,
-    OrganizationTemplateNotificationsView,
-    OrganizationTemplateNotificationMarkReadView,
-    OrganizationTemplateUpdateStatusView,
-    OrganizationTeamTemplateStatsView,
-)
 
-# Import enhanced views
-from .views.enhanced_views import (
-    # Organization Email Configuration Views
-    OrganizationEmailConfigurationListCreateView,
-    OrganizationEmailConfigurationDetailView,
-    OrganizationEmailConfigurationResetUsageView,
-    OrganizationEmailConfigurationVerifyDomainView,
-    OrganizationEmailConfigurationUsageStatsView,
-    
-    # Email Provider Views (Shared/Platform Providers - read-only for org users)
-    EmailProviderListCreateView,
-    EmailProviderDetailView,
-    EmailProviderHealthCheckView,
-    EmailProviderTestSendView,
-    
-    # Organization Email Provider Views (links org to providers)
-    OrganizationEmailProviderListCreateView,
-    OrganizationEmailProviderDetailView,
+def views_from(module):
+    """
+    Return a factory for views of ``views.<module>`` referenced by dotted path.
+
+    The module is imported on the first request to one of its routes, which
+    keeps its serializer/task imports out of URLconf import in workers that
+    never serve those routes.
+    """
+    def factory(name, *decorators, **initkwargs):
+        return lazy_view(f'apps.campaigns.views.{module}.{name}', *decorators, **initkwargs)
+    return factory
 
-    # Organization Own Email Provider Views (org-owned providers)
-    OrganizationOwnEmailProviderListCreateView,
-    OrganizationOwnEmailProviderDetailView,
-    OrganizationOwnEmailProviderHealthCheckView,
-    OrganizationOwnEmailProviderTestSendView,
-    
-    # Email Delivery Log Views
-    EmailDeliveryLogListView,
-    EmailDeliveryLogDetailView,
-    EmailDeliveryLogResendView,
-    EmailDeliveryLogForwardView,
-    EmailDeliveryLogAnalyticsView,
-    
-    # Email Validation Views
-    EmailValidationListView,
-    EmailValidationDetailView,
-    
-    # Email Queue Views
-    EmailQueueListView,
-    EmailQueueDetailView,
-    EmailQueueProcessView,
-    
-    # Email Action Views
-    EmailActionListView,
-    EmailActionDetailView,
-    
-    # Enhanced Trigger View
-    EnhancedTriggerEmailView,
-)
 
+# Modules imported only by this URLconf are loaded lazily
+enhanced_view = views_from('enhanced_views')
+template_operation_view = views_from('template_operations')
+organization_admin_view = views_from('organization_admin')
 
-urlpatterns = [
+
+urlpatterns = (
     # ========================================================================
     # SECTION 1: CAMPAIGN MANAGEMENT
+    # Routes sharing a prefix are grouped under one include() so the prefix
+    # is stored once and the resolver skips the whole group on a mismatch.
     # ========================================================================
     
     # Campaigns
     path('', CampaignListCreateView.as_view(), name='campaign-list-create'),
-    path('<uuid:pk>/', CampaignDetailView.as_view(), name='campaign-detail'),
-    path('<uuid:pk>/launch/', CampaignLaunchView.as_view(), name='campaign-launch'),
-    path('<uuid:pk>/schedule/', CampaignScheduleView.as_view(), name='campaign-schedule'),
-    path('<uuid:pk>/pause/', CampaignPauseView.as_view(), name='campaign-pause'),
-    path('<uuid:pk>/resume/', CampaignResumeView.as_view(), name='campaign-resume'),
-    path('<uuid:pk>/cancel/', CampaignCancelView.as_view(), name='campaign-cancel'),
-    path('<uuid:pk>/reset/', CampaignResetView.as_view(), name='campaign-reset'),
-    path('<uuid:pk>/preview/', CampaignPreviewView.as_view(), name='campaign-preview'),
-    path('<uuid:pk>/test-send/', CampaignTestSendView.as_view(), name='campaign-test-send'),
-    path('<uuid:pk>/duplicate/', CampaignDuplicateView.as_view(), name='campaign-duplicate'),
-    path('<uuid:pk>/analytics/', CampaignAnalyticsView.as_view(), name='campaign-analytics'),
-    path('<uuid:pk>/refresh-stats/', CampaignRefreshStatsView.as_view(), name='campaign-refresh-stats'),
+    path('<uuid_str:pk>/', include([
+        path('', CampaignDetailView.as_view(), name='campaign-detail'),
+        path('launch/', CampaignLaunchView.as_view(), name='campaign-launch'),
+        path('schedule/', CampaignScheduleView.as_view(), name='campaign-schedule'),
+        path('pause/', CampaignTransitionView.as_view(transition='pause', success_message='Campaign paused'), name='campaign-pause'),
+        path('resume/', CampaignTransitionView.as_view(transition='resume', success_message='Campaign resumed'), name='campaign-resume'),
+        path('cancel/', CampaignTransitionView.as_view(transition='cancel', success_message='Campaign cancelled'), name='campaign-cancel'),
+        path('reset/', CampaignResetView.as_view(), name='campaign-reset'),
+        path('preview/', CampaignPreviewView.as_view(), name='campaign-preview'),
+        path('test-send/', CampaignTestSendView.as_view(), name='campaign-test-send'),
+        path('duplicate/', CampaignDuplicateView.as_view(), name='campaign-duplicate'),
+        path('analytics/', CampaignAnalyticsView.as_view(), name='campaign-analytics'),
+        path('refresh-stats/', CampaignRefreshStatsView.as_view(), name='campaign-refresh-stats'),
+    ])),
     
     # Contacts
-    path('contacts/', ContactsListView.as_view(), name='contact-list-create'),
-    path('contacts/bulk/', ContactBulkImportView.as_view(), name='contact-bulk-import'),
-    path('contacts/<uuid:pk>/', ContactDetailView.as_view(), name='contact-detail'),
+    path('contacts/', include([
+        path('', ContactsListView.as_view(), name='contact-list-create'),
+        path('bulk/', ContactBulkImportView.as_view(), name='contact-bulk-import'),
+        path('<uuid_str:pk>/', ContactDetailView.as_view(), name='contact-detail'),
+    ])),
     
     # Contact Lists
-    path('contact-lists/', ContactListListCreateView.as_view(), name='contact-list-list-create'),
-    path('contact-lists/<uuid:pk>/', ContactListDetailView.as_view(), name='contact-list-detail'),
-    path('contact-lists/<uuid:pk>/refresh-stats/', ContactListRefreshStatsView.as_view(), name='contact-list-refresh-stats'),
+    path('contact-lists/', include([
+        path('', ContactListListCreateView.as_view(), name='contact-list-list-create'),
+        path('<uuid_str:pk>/', ContactListDetailView.as_view(), name='contact-list-detail'),
+        path('<uuid_str:pk>/refresh-stats/', ContactListRefreshStatsView.as_view(), name='contact-list-refresh-stats'),
+    ])),
     
     # ========================================================================
     # SECTION 2: EMAIL CONFIGURATION
     # Organization-scoped email settings
     # ========================================================================
     
-    # Email Templates
-    path('templates/', EmailTemplateListCreateView.as_view(), name='email-template-list-create'),
-    path('templates/<uuid:pk>/', EmailTemplateDetailView.as_view(), name='email-template-detail'),
+    # Email Templates (including the template operations of SECTION 11)
+    path('templates/', include([
+        path('', EmailTemplateListCreateView.as_view(), name='email-template-list-create'),
+        path('<uuid_str:pk>/', EmailTemplateDetailView.as_view(), name='email-template-detail'),
+        
+        # Template duplication and usage
+        path('<uuid_str:pk>/use/', template_operation_view('EmailTemplateUseView'), name='template-use'),
+        path('bulk-use/', template_operation_view('EmailTemplateBulkUseView'), name='template-bulk-use'),
+        
+        # Template versioning
+        path('<uuid_str:pk>/versions/', template_operation_view('EmailTemplateVersionHistoryView'), name='template-versions'),
+        path('<uuid_str:pk>/create-version/', template_operation_view('EmailTemplateCreateVersionView'), name='template-create-version'),
+        
+        # Approval workflow
+        path('<uuid_str:pk>/submit-approval/', template_operation_view('EmailTemplateSubmitForApprovalView'), name='template-submit-approval'),
+        
+        # Preview and testing
+        path('preview-test/', template_operation_view('TemplatePreviewTestView'), name='template-preview-test'),
+        
+        # Template updates
+        path('<uuid_str:pk>/update-from-global/', template_operation_view('EmailTemplateUpdateFromGlobalView'), name='template-update-from-global'),
+    ])),
     
     # Organization Email Configuration
-    path('config/', OrganizationEmailConfigurationListCreateView.as_view(), name='org-email-config-list'),
-    path('config/<uuid:pk>/', OrganizationEmailConfigurationDetailView.as_view(), name='org-email-config-detail'),
-    path('config/<uuid:pk>/reset-usage/', OrganizationEmailConfigurationResetUsageView.as_view(), name='org-email-config-reset-usage'),
-    path('config/<uuid:pk>/verify-domain/', OrganizationEmailConfigurationVerifyDomainView.as_view(), name='org-email-config-verify-domain'),
-    path('config/usage-stats/', OrganizationEmailConfigurationUsageStatsView.as_view(), name='org-email-config-usage-stats'),
+    path('config/', include([
+        path('', enhanced_view('OrganizationEmailConfigurationListCreateView'), name='org-email-config-list'),
+        path('<uuid_str:pk>/', enhanced_view('OrganizationEmailConfigurationDetailView'), name='org-email-config-detail'),
+        path('<uuid_str:pk>/reset-usage/', enhanced_view('OrganizationEmailConfigurationResetUsageView'), name='org-email-config-reset-usage'),
+        path('<uuid_str:pk>/verify-domain/', enhanced_view('OrganizationEmailConfigurationVerifyDomainView'), name='org-email-config-verify-domain'),
+        path('usage-stats/', enhanced_view('OrganizationEmailConfigurationUsageStatsView'), name='org-email-config-usage-stats'),
+    ])),
     
     # Organization Email Providers (links org to shared/platform providers)
-    path('providers/', OrganizationEmailProviderListCreateView.as_view(), name='org-email-provider-list-create'),
-    path('providers/<uuid:pk>/', OrganizationEmailProviderDetailView.as_view(), name='org-email-provider-detail'),
+    path('providers/', include([
+        path('', enhanced_view('OrganizationEmailProviderListCreateView'), name='org-email-provider-list-create'),
+        path('<uuid_str:pk>/', enhanced_view('OrganizationEmailProviderDetailView'), name='org-email-provider-detail'),
+    ])),
 
     # Organization Own Email Providers (org-owned providers created by org admins)
-    path('org/providers/', OrganizationOwnEmailProviderListCreateView.as_view(), name='org-own-provider-list-create'),
-    path('org/providers/<uuid:pk>/', OrganizationOwnEmailProviderDetailView.as_view(), name='org-own-provider-detail'),
-    path('org/providers/<uuid:pk>/health-check/', OrganizationOwnEmailProviderHealthCheckView.as_view(), name='org-own-provider-health-check'),
-    path('org/providers/<uuid:pk>/test-send/', OrganizationOwnEmailProviderTestSendView.as_view(), name='org-own-provider-test-send'),
+    path('org/providers/', include([
+        path('', enhanced_view('OrganizationOwnEmailProviderListCreateView'), name='org-own-provider-list-create'),
+        path('<uuid_str:pk>/', enhanced_view('OrganizationOwnEmailProviderDetailView'), name='org-own-provider-detail'),
+        path('<uuid_str:pk>/health-check/', enhanced_view('OrganizationOwnEmailProviderHealthCheckView'), name='org-own-provider-health-check'),
+        path('<uuid_str:pk>/test-send/', enhanced_view('OrganizationOwnEmailProviderTestSendView'), name='org-own-provider-test-send'),
+    ])),
     
     # Shared Email Providers (read-only for regular users)
-    path('shared-providers/', EmailProviderListCreateView.as_view(), name='shared-email-provider-list'),
-    path('shared-providers/<uuid:pk>/', EmailProviderDetailView.as_view(), name='shared-email-provider-detail'),
-    path('shared-providers/<uuid:pk>/health-check/', EmailProviderHealthCheckView.as_view(), name='shared-email-provider-health-check'),
+    path('shared-providers/', include([
+        path('', enhanced_view('EmailProviderListCreateView'), name='shared-email-provider-list'),
+        path('<uuid_str:pk>/', enhanced_view('EmailProviderDetailView'), name='shared-email-provider-detail'),
+        path('<uuid_str:pk>/health-check/', enhanced_view('EmailProviderHealthCheckView'), name='shared-email-provider-health-check'),
+    ])),
     
     # ========================================================================
     # SECTION 3: AUTOMATION RULES
     # Organization-scoped automation rules
     # ========================================================================
     
-    path('rules/', AutomationRuleListCreateView.as_view(), name='automation-rule-list-create'),
-    path('rules/<uuid:pk>/', AutomationRuleDetailView.as_view(), name='automation-rule-detail'),
+    path('rules/', include([
+        path('', AutomationRuleListCreateView.as_view(), name='automation-rule-list-create'),
+        path('<uuid_str:pk>/', AutomationRuleDetailView.as_view(), name='automation-rule-detail'),
+    ])),
     
     # ========================================================================
     # SECTION 4: EMAIL DELIVERY & TRACKING
     # ========================================================================
     
-    # Trigger Email
-    path('trigger/email/', EnhancedTriggerEmailView.as_view(), name='trigger-email'),
-    path('trigger/email/<uuid:rule_id>/', EnhancedTriggerEmailView.as_view(), name='trigger-email-by-rule'),
+    # Trigger Email/SMS/WhatsApp
+    # Each channel is a single pattern with an optional rule_id, so the
+    # resolver runs one regex per channel whether or not a rule is given.
+    path('trigger/', include([
+        re_path(rf'^email/(?:(?P<rule_id>{UUID_RE})/)?$', enhanced_view('EnhancedTriggerEmailView'), name='trigger-email'),
+        re_path(rf'^sms/(?:(?P<rule_id>{UUID_RE})/)?$', TriggerSMSView.as_view(), name='trigger-sms'),
+        re_path(rf'^whatsapp/(?:(?P<rule_id>{UUID_RE})/)?$', TriggerWhatsAppView.as_view(), name='trigger-whatsapp'),
+        # Reverse-only aliases for the previous per-rule route names; the
+        # patterns above always match first.
+        re_path(rf'^email/(?P<rule_id>{UUID_RE})/$', enhanced_view('EnhancedTriggerEmailView'), name='trigger-email-by-rule'),
+        re_path(rf'^sms/(?P<rule_id>{UUID_RE})/$', TriggerSMSView.as_view(), name='trigger-sms-by-rule'),
+        re_path(rf'^whatsapp/(?P<rule_id>{UUID_RE})/$', TriggerWhatsAppView.as_view(), name='trigger-whatsapp-by-rule'),
+    ])),
     
     # Email Queue
-    path('queue/', EmailQueueListView.as_view(), name='email-queue-list'),
-    path('queue/<uuid:pk>/', EmailQueueDetailView.as_view(), name='email-queue-detail'),
-    path('queue/process/', EmailQueueProcessView.as_view(), name='email-queue-process'),
+    path('queue/', include([
+        path('', enhanced_view('EmailQueueListView'), name='email-queue-list'),
+        path('<uuid_str:pk>/', enhanced_view('EmailQueueDetailView'), name='email-queue-detail'),
+        path('process/', enhanced_view('EmailQueueProcessView'), name='email-queue-process'),
+    ])),
     
     # Delivery Logs
-    path('logs/', EmailDeliveryLogListView.as_view(), name='email-delivery-log-list'),
-    path('logs/<uuid:pk>/', EmailDeliveryLogDetailView.as_view(), name='email-delivery-log-detail'),
-    path('logs/<uuid:pk>/resend/', EmailDeliveryLogResendView.as_view(), name='email-delivery-log-resend'),
-    path('logs/<uuid:pk>/forward/', EmailDeliveryLogForwardView.as_view(), name='email-delivery-log-forward'),
-    path('logs/analytics/', EmailDeliveryLogAnalyticsView.as_view(), name='email-delivery-log-analytics'),
+    path('logs/', include([
+        path('', enhanced_view('EmailDeliveryLogListView'), name='email-delivery-log-list'),
+        path('<uuid_str:pk>/', enhanced_view('EmailDeliveryLogDetailView'), name='email-delivery-log-detail'),
+        path('<uuid_str:pk>/resend/', enhanced_view('EmailDeliveryLogResendView'), name='email-delivery-log-resend'),
+        path('<uuid_str:pk>/forward/', enhanced_view('EmailDeliveryLogForwardView'), name='email-delivery-log-forward'),
+        path('analytics/', enhanced_view('EmailDeliveryLogAnalyticsView'), name='email-delivery-log-analytics'),
+    ])),
     
     # Email Validation
-    path('validations/', EmailValidationListView.as_view(), name='email-validation-list'),
-    path('validations/<uuid:pk>/', EmailValidationDetailView.as_view(), name='email-validation-detail'),
+    path('validations/', include([
+        path('', enhanced_view('EmailValidationListView'), name='email-validation-list'),
+        path('<uuid_str:pk>/', enhanced_view('EmailValidationDetailView'), name='email-validation-detail'),
+    ])),
     
     # Email Actions
-    path('actions/', EmailActionListView.as_view(), name='email-action-list'),
-    path('actions/<uuid:pk>/', EmailActionDetailView.as_view(), name='email-action-detail'),
+    path('actions/', include([
+        path('', enhanced_view('EmailActionListView'), name='email-action-list'),
+        path('<uuid_str:pk>/', enhanced_view('EmailActionDetailView'), name='email-action-detail'),
+    ])),
     
     # ========================================================================
     # SECTION 5: SMS & WHATSAPP AUTOMATION
+    # SMS/WhatsApp trigger routes live in the trigger/ group above.
     # ========================================================================
     
-    # SMS Configuration
-    path('sms/configs/', SMSConfigurationListCreateView.as_view(), name='sms-config-list-create'),
-    path('sms/configs/<uuid:pk>/', SMSConfigurationDetailView.as_view(), name='sms-config-detail'),
-    
-    # SMS Templates
-    path('sms/templates/', SMSTemplateListCreateView.as_view(), name='sms-template-list-create'),
-    path('sms/templates/<uuid:pk>/', SMSTemplateDetailView.as_view(), name='sms-template-detail'),
-    
-    # Trigger SMS/WhatsApp
-    path('trigger/sms/', TriggerSMSView.as_view(), name='trigger-sms'),
-    path('trigger/sms/<uuid:rule_id>/', TriggerSMSView.as_view(), name='trigger-sms-by-rule'),
-    path('trigger/whatsapp/', TriggerWhatsAppView.as_view(), name='trigger-whatsapp'),
-    path('trigger/whatsapp/<uuid:rule_id>/', TriggerWhatsAppView.as_view(), name='trigger-whatsapp-by-rule'),
-    
-    # ========================================================================
-    # SECTION 6: ADMIN/PLATFORM OPERATIONS
-    # Requires platform admin permissions
-    # ========================================================================
-    
-    # Admin Email Providers
-    path('admin/providers/', AdminEmailProviderListCreateView.as_view(), name='admin-provider-list-create'),
-    path('admin/providers/<uuid:pk>/', AdminEmailProviderDetailView.as_view(), name='admin-provider-detail'),
-    path('admin/providers/<uuid:pk>/set-default/', AdminEmailProviderSetDefaultView.as_view(), name='admin-provider-set-default'),
-    path('admin/providers/<uuid:pk>/health-check/', AdminEmailProviderHealthCheckView.as_view(), name='admin-provider-health-check'),
-    path('admin/providers/<uuid:pk>/test-send/', AdminEmailProviderTestSendView.as_view(), name='admin-provider-test-send'),
-    
-    # Admin Organization Configs
-    path('admin/organizations/', AdminOrganizationConfigListView.as_view(), name='admin-org-config-list'),
-    path('admin/organizations/<uuid:pk>/', AdminOrganizationConfigDetailView.as_view(), name='admin-org-config-detail'),
-    path('admin/organizations/<uuid:pk>/suspend/', AdminOrganizationSuspendView.as_view(), name='admin-org-suspend'),
-    path('admin/organizations/<uuid:pk>/unsuspend/', AdminOrganizationUnsuspendView.as_view(), name='admin-org-unsuspend'),
-    path('admin/organizations/<uuid:pk>/upgrade-plan/', AdminOrganizationUpgradePlanView.as_view(), name='admin-org-upgrade-plan'),
-    
-    # Admin Platform Stats
-    path('admin/stats/', AdminPlatformStatsView.as_view(), name='admin-platform-stats'),
+    path('sms/', include([
+        # SMS Configuration
+        path('configs/', SMSConfigurationListCreateView.as_view(), name='sms-config-list-create'),
+        path('configs/<uuid_str:pk>/', SMSConfigurationDetailView.as_view(), name='sms-config-detail'),
+        
+        # SMS Templates
+        path('templates/', SMSTemplateListCreateView.as_view(), name='sms-template-list-create'),
+        path('templates/<uuid_str:pk>/', SMSTemplateDetailView.as_view(), name='sms-template-detail'),
+    ])),
     
     # ========================================================================
     # SECTION 7: PUBLIC ENDPOINTS
@@ -337,90 +303,93 @@ urlpatterns = [
     path('org/stats/', OrganizationStatsView.as_view(), name='org-stats'),
     path('stats/', AutomationStatsView.as_view(), name='automation-stats'),
     path('dispatches/', EmailDispatchReportView.as_view(), name='email-dispatch-report'),
-    path('health/', DebugAutoHealthCheckView.as_view(), name='health-check'),
     
     # ========================================================================
     # SECTION 9: TEMPLATE VARIABLES
     # For autocomplete and template personalization
     # ========================================================================
     
-    path('variables/', VariableListView.as_view(), name='variable-list'),
-    path('variables/extract/', VariableExtractView.as_view(), name='variable-extract'),
-    path('variables/validate/', VariableValidateView.as_view(), name='variable-validate'),
-    path('variables/preview/', VariablePreviewView.as_view(), name='variable-preview'),
-    path('variables/schema/', CustomFieldSchemaView.as_view(), name='custom-field-schema'),
+    path('variables/', include([
+        path('', VariableListView.as_view(), name='variable-list'),
+        path('extract/', VariableExtractView.as_view(), name='variable-extract'),
+        path('validate/', VariableValidateView.as_view(), name='variable-validate'),
+        path('preview/', VariablePreviewView.as_view(), name='variable-preview'),
+        path('schema/', CustomFieldSchemaView.as_view(), name='custom-field-schema'),
+    ])),
 
     # ========================================================================
     # SECTION 10: AI & AGENT INTEGRATIONS
     # ========================================================================
-    path('ai/generate/email/content/', GenerateEmailContentAIView.as_view(), name='generate-email-content-ai'),
-    path('ai/agent/contacts/', ContactAgentView.as_view(), name='contact-agent'),
+    path('ai/', include([
+        path('generate/email/content/', GenerateEmailContentAIView.as_view(), name='generate-email-content-ai'),
+        path('agent/contacts/', ContactAgentView.as_view(), name='contact-agent'),
+    ])),
     
     # ========================================================================
     # SECTION 11: TEMPLATE OPERATIONS
+    # Template-scoped operations are grouped under templates/ in SECTION 2.
     # ========================================================================
-    # Template duplication and usage
-    path('templates/<uuid:pk>/use/', EmailTemplateUseView.as_view(), name='template-use'),
-    path('templates/bulk-use/', EmailTemplateBulkUseView.as_view(), name='template-bulk-use'),
-    
-    # Template versioning
-    path('templates/<uuid:pk>/versions/', EmailTemplateVersionHistoryView.as_view(), name='template-versions'),
-    path('templates/<uuid:pk>/create-version/', EmailTemplateCreateVersionView.as_view(), name='template-create-version'),
-    
-    # Approval workflow
-    path('templates/<uuid:pk>/submit-approval/', EmailTemplateSubmitForApprovalView.as_view(), name='template-submit-approval'),
-    path('approvals/<uuid:pk>/review/', TemplateApprovalReviewView.as_view(), name='template-approval-review'),
-    
-    # Preview and testing
-    path('templates/preview-test/', TemplatePreviewTestView.as_view(), name='template-preview-test'),
-    
-    # Template updates
-    path('templates/<uuid:pk>/update-from-global/', EmailTemplateUpdateFromGlobalView.as_view(), name='template-update-from-global'),
-    
-    # ========================================================================
-    # SECTION 12: ADMIN TEMPLATE MANAGEMENT
-    # ========================================================================
-    # Global template management
-    path('admin/templates/', AdminGlobalTemplateListCreateView.as_view(), name='admin-templates-list'),
-    path('admin/templates/<uuid:pk>/', AdminGlobalTemplateDetailView.as_view(), name='admin-template-detail'),
-    
-    # Template analytics
-    path('admin/templates/<uuid:pk>/analytics/', AdminTemplateAnalyticsView.as_view(), name='admin-template-analytics'),
-    path('admin/templates/analytics/summary/', AdminTemplateAnalyticsSummaryView.as_view(), name='admin-template-analytics-summary'),
-    
-    # Approval management
-    path('admin/approvals/pending/', AdminPendingApprovalsView.as_view(), name='admin-pending-approvals'),
+    path('approvals/<uuid_str:pk>/review/', template_operation_view('TemplateApprovalReviewView'), name='template-approval-review'),
     
     # ========================================================================
     # SECTION 13: ORGANIZATION ADMIN INSIGHTS
     # ========================================================================
-    # Template usage tracking
-    path('organization/template-usage/', OrganizationTemplateUsageView.as_view(), name='organization-template-usage'),
-    
-    # Template notifications
-    path('organization/template-notifications/', OrganizationTemplateNotificationsView.as_view(), name='organization-template-notifications'),
-    path('organization/template-notifications/<uuid:pk>/mark-read/', OrganizationTemplateNotificationMarkReadView.as_view(), name='organization-notification-mark-read'),
-    
-    # Update status and stats
-    path('organization/template-updates/', OrganizationTemplateUpdateStatusView.as_view(), name='organization-template-updates'),
-    path('organization/team-template-stats/', OrganizationTeamTemplateStatsView.as_view(), name='organization-team-stats'),
+    path('organization/', include([
+        # Template usage tracking
+        path('template-usage/', organization_admin_view('OrganizationTemplateUsageView'), name='organization-template-usage'),
+        
+        # Template notifications
+        path('template-notifications/', organization_admin_view('OrganizationTemplateNotificationsView'), name='organization-template-notifications'),
+        path('template-notifications/<uuid_str:pk>/mark-read/', organization_admin_view('OrganizationTemplateNotificationMarkReadView'), name='organization-notification-mark-read'),
+        
+        # Update status and stats
+        path('template-updates/', organization_admin_view('OrganizationTemplateUpdateStatusView'), name='organization-template-updates'),
+        path('team-template-stats/', organization_admin_view('OrganizationTeamTemplateStatsView'), name='organization-team-stats'),
+    ])),
     
     # ========================================================================
     # SECTION 14: NOTIFICATIONS
     # Real-time notifications for campaigns and system events
     # ========================================================================
-    path('notifications/', NotificationListView.as_view(), name='notification-list'),
-    path('notifications/unread-count/', UnreadNotificationCountView.as_view(), name='notification-unread-count'),
-    path('notifications/<uuid:pk>/mark-read/', MarkNotificationReadView.as_view(), name='notification-mark-read'),
-    path('notifications/mark-all-read/', MarkAllNotificationsReadView.as_view(), name='notification-mark-all-read'),
-    path('notifications/<uuid:pk>/', DeleteNotificationView.as_view(), name='notification-delete'),
+    path('notifications/', include([
+        path('', NotificationListView.as_view(), name='notification-list'),
+        path('unread-count/', UnreadNotificationCountView.as_view(), name='notification-unread-count'),
+        path('<uuid_str:pk>/mark-read/', MarkNotificationReadView.as_view(), name='notification-mark-read'),
+        path('mark-all-read/', MarkAllNotificationsReadView.as_view(), name='notification-mark-all-read'),
+        path('<uuid_str:pk>/', DeleteNotificationView.as_view(), name='notification-delete'),
+    ])),
     
     # ========================================================================
     # SECTION 15: PUSH NOTIFICATIONS
     # Browser push notification subscriptions
     # ========================================================================
-    path('push/subscribe/', PushSubscriptionViewSet.as_view({'post': 'create'}), name='push-subscribe'),
-    path('push/subscriptions/', PushSubscriptionViewSet.as_view({'get': 'list'}), name='push-subscriptions'),
-    path('push/unsubscribe/', PushSubscriptionViewSet.as_view({'delete': 'destroy'}), name='push-unsubscribe'),
-    path('push/test/', PushSubscriptionViewSet.as_view({'post': 'test'}), name='push-test'),
-]
+    path('push/', include([
+        path('subscribe/', PushSubscriptionViewSet.as_view({'post': 'create'}), name='push-subscribe'),
+        path('subscriptions/', PushSubscriptionViewSet.as_view({'get': 'list'}), name='push-subscriptions'),
+        path('unsubscribe/', PushSubscriptionViewSet.as_view({'delete': 'destroy'}), name='push-unsubscribe'),
+        path('test/', PushSubscriptionViewSet.as_view({'post': 'test'}), name='push-test'),
+    ])),
+)
+
+# Debug-only routes
+debug_urlpatterns = (
+    path('health/', DebugAutoHealthCheckView.as_view(), name='health-check'),
+)
+
+if settings.DEBUG:
+    urlpatterns += debug_urlpatterns
+
+
+def intern_names(patterns):
+    """
+    Intern route names so the resolver's reverse dict keys share one object
+    per name (hyphenated names are not interned automatically by CPython).
+    """
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            intern_names(pattern.url_patterns)
+        elif pattern.name is not None:
+            pattern.name = intern(pattern.name)
+
+
+intern_names(urlpatterns)
@@ -0,0 +1,68 @@
+"""
+URL Configuration for the platform admin API
+
+Mounted by the project URLconf at ``api/v1/campaigns/admin/`` when
+``ENABLE_ADMIN_API`` is set, separately from the tenant-facing campaigns
+URLconf, so the campaigns resolver only holds the hot tenant routes.
+"""
+
+from django.urls import path
+
+# Shared route helpers; importing them also registers the uuid_str converter
+from .urls import intern_names, views_from
+from .views import (
+    AdminEmailProviderListCreateView,
+    AdminEmailProviderDetailView,
+    AdminEmailProviderSetDefaultView,
+    AdminEmailProviderHealthCheckView,
+    AdminEmailProviderTestSendView,
+    AdminOrganizationConfigListView,
+    AdminOrganizationConfigDetailView,
+    AdminOrganizationSuspendView,
+    AdminOrganizationUnsuspendView,
+    AdminOrganizationUpgradePlanView,
+    AdminPlatformStatsView,
+)
+
+admin_template_view = views_from('admin_templates')
+
+
+urlpatterns = [
+    # ========================================================================
+    # SECTION 6: ADMIN/PLATFORM OPERATIONS
+    # Requires platform admin permissions
+    # ========================================================================
+    
+    # Admin Email Providers
+    path('providers/', AdminEmailProviderListCreateView.as_view(), name='admin-provider-list-create'),
+    path('providers/<uuid_str:pk>/', AdminEmailProviderDetailView.as_view(), name='admin-provider-detail'),
+    path('providers/<uuid_str:pk>/set-default/', AdminEmailProviderSetDefaultView.as_view(), name='admin-provider-set-default'),
+    path('providers/<uuid_str:pk>/health-check/', AdminEmailProviderHealthCheckView.as_view(), name='admin-provider-health-check'),
+    path('providers/<uuid_str:pk>/test-send/', AdminEmailProviderTestSendView.as_view(), name='admin-provider-test-send'),
+    
+    # Admin Organization Configs
+    path('organizations/', AdminOrganizationConfigListView.as_view(), name='admin-org-config-list'),
+    path('organizations/<uuid_str:pk>/', AdminOrganizationConfigDetailView.as_view(), name='admin-org-config-detail'),
+    path('organizations/<uuid_str:pk>/suspend/', AdminOrganizationSuspendView.as_view(), name='admin-org-suspend'),
+    path('organizations/<uuid_str:pk>/unsuspend/', AdminOrganizationUnsuspendView.as_view(), name='admin-org-unsuspend'),
+    path('organizations/<uuid_str:pk>/upgrade-plan/', AdminOrganizationUpgradePlanView.as_view(), name='admin-org-upgrade-plan'),
+    
+    # Admin Platform Stats
+    path('stats/', AdminPlatformStatsView.as_view(), name='admin-platform-stats'),
+    
+    # ========================================================================
+    # SECTION 12: ADMIN TEMPLATE MANAGEMENT
+    # ========================================================================
+    # Global template management
+    path('templates/', admin_template_view('AdminGlobalTemplateListCreateView'), name='admin-templates-list'),
+    path('templates/<uuid_str:pk>/', admin_template_view('AdminGlobalTemplateDetailView'), name='admin-template-detail'),
+    
+    # Template analytics
+    path('templates/<uuid_str:pk>/analytics/', admin_template_view('AdminTemplateAnalyticsView'), name='admin-template-analytics'),
+    path('templates/analytics/summary/', admin_template_view('AdminTemplateAnalyticsSummaryView'), name='admin-template-analytics-summary'),
+    
+    # Approval management
+    path('approvals/pending/', admin_template_view('AdminPendingApprovalsView'), name='admin-pending-approvals'),
+]
+
+intern_names(urlpatterns)
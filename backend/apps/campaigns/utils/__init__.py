@@ -1,82 +1,75 @@
 # Utils package for automation rule functionality
 
-# Import from crypto module
-from .crypto import (
-    get_encryption_key,
-    encrypt_data,
-    decrypt_data,
-)
-
-# Import from email_utils module
-from .email_utils import (
-    is_email_service_active,
-    process_template_variables,
-    render_email_template,
-    send_email_for_specific_rule,
-    send_automated_email,
-)
-
-# Import from sms_utils module
-from .sms_utils import (
-    send_sms,
-    send_whatsapp,
-)
-
-# Import from tenant_service module
-from .tenant_service import TenantServiceAPI
-
-# Import from unified_email_sender module
-from .unified_email_sender import UnifiedEmailSender
-
-# Import from sync_utils module
-from .sync_utils import (
-    ConfigurationHierarchy,
-    RateLimitChecker,
-    ConfigurationValidator,
-    ConfigurationSync,
-)
-
-# Import from error_handlers module
-from .error_handlers import EmailErrorHandler
-
-# Import from hierarchy_resolver module
-from .hierarchy_resolver import HierarchicalResolver, is_email_service_active as hierarchical_is_email_service_active
+from importlib import import_module
 
-# Make all functions available at the package level
-__all__ = [
-    # Crypto functions
-    'get_encryption_key',
-    'encrypt_data',
-    'decrypt_data',
-    
+# Crypto functions (small and used by serializers on every import)
+from . import crypto
+from .crypto import *
+
+# Everything else is resolved on first attribute access (PEP 562), so
+# ``from apps.campaigns.utils import encrypt_data`` does not drag in Twilio,
+# requests, the tenant API client and the campaign models.
+# Maps submodule -> names re-exported from it under the same name. Reading
+# each submodule's __all__ here would import it, so the email_utils and
+# sms_utils entries repeat their __all__; tests keep the two in sync.
+_LAZY_MODULES = {
     # Email functions
-    'is_email_service_active',
-    'process_template_variables',
-    'render_email_template',
-    'send_email_for_specific_rule',
-    'send_automated_email',
-    
+    'email_utils': (
+        'is_email_service_active',
+        'process_template_variables',
+        'render_email_template',
+        'send_email_for_specific_rule',
+        'send_automated_email',
+    ),
+
     # SMS/WhatsApp functions
-    'send_sms',
-    'send_whatsapp',
-    
+    'sms_utils': ('send_sms', 'send_whatsapp', 'send_sms_async', 'send_whatsapp_async'),
+
     # Tenant service
-    'TenantServiceAPI',
-    
+    'tenant_service': ('TenantServiceAPI',),
+
     # Unified email sender
-    'UnifiedEmailSender',
-    
+    'unified_email_sender': ('UnifiedEmailSender',),
+
     # Configuration sync utilities
-    'ConfigurationHierarchy',
-    'RateLimitChecker',
-    'ConfigurationValidator',
-    'ConfigurationSync',
-    
+    'sync_utils': (
+        'ConfigurationHierarchy',
+        'RateLimitChecker',
+        'ConfigurationValidator',
+        'ConfigurationSync',
+    ),
+
     # Error handlers
-    'EmailErrorHandler',
-    
+    'error_handlers': ('EmailErrorHandler',),
+
     # Hierarchical resolver
-    'HierarchicalResolver',
-]
+    'hierarchy_resolver': ('HierarchicalResolver',),
+}
+
+# exported name -> (submodule, attribute in that submodule)
+_LAZY_ATTRS = {
+    name: (module_name, name)
+    for module_name, names in _LAZY_MODULES.items()
+    for name in names
+}
+# Renamed re-exports, kept out of __all__
+_LAZY_ATTRS['hierarchical_is_email_service_active'] = ('hierarchy_resolver', 'is_email_service_active')
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f'.{module_name}', __name__), attr)
+    # Cache on the package so later lookups skip __getattr__ entirely
+    globals()[name] = value
+    return value
 
 
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
+# Make all functions available at the package level
+__all__ = crypto.__all__ + sum(_LAZY_MODULES.values(), ())
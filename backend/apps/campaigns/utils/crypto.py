@@ -68,4 +68,11 @@ def decrypt_data(encrypted_data: str) -> str:
         logger.warning(f"Decryption failed, might be legacy unencrypted data: {e}")
         # If decryption fails (e.g., data is not encrypted or key is wrong),
         # return the original data. This handles legacy non-encrypted passwords.
-        return encrypted_data
\ No newline at end of file
+        return encrypted_data
+
+
+__all__ = (
+    'get_encryption_key',
+    'encrypt_data',
+    'decrypt_data',
+)
@@ -1,19 +1,185 @@
+import hashlib
 import logging
-import boto3
 import json
+import re
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
+from enum import IntEnum
+from functools import cached_property, lru_cache
 import requests
+import ujson
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, NamedTuple, Optional, List, Tuple
 from abc import ABC, abstractmethod
 from django.conf import settings
 from django.utils import timezone
-from botocore.exceptions import BotoCoreError, ClientError
 import smtplib
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.policy import compat32
+
+from .error_handlers import EmailErrorHandler
+from .smtp_pool import SMTP, SMTP_SSL, send_pipelined, smtp_pool
 
 logger = logging.getLogger(__name__)
 
+_SES_CHARSET = 'UTF-8'
+
+# Serialization policy for pipelined SMTP sends; the wire needs CRLF
+_SMTP_POLICY = compat32.clone(linesep='\r\n')
+
+# Remediation hints returned with SES ClientErrors, by error code
+_SES_ERROR_SUGGESTIONS: Dict[str, Tuple[str, ...]] = {
+    'MessageRejected': (
+        "Verify sender email is verified in SES",
+        "Check recipient email format",
+        "Ensure content doesn't trigger spam filters",
+    ),
+    'SendingPausedException': (
+        "Account sending is paused, check SES console",
+        "Contact AWS support to resume sending",
+    ),
+    'MailFromDomainNotVerifiedException': (
+        "Verify the sender domain in SES console",
+        "Add required DNS records for domain verification",
+    ),
+    'ConfigurationSetDoesNotExistException': (
+        "Check configuration set name",
+        "Ensure configuration set exists in your AWS region",
+    ),
+}
+
+# SES MaxSendRate is looked up once per account/region and re-read this often
+SES_SEND_QUOTA_REFRESH_SECONDS = 600
+_ses_send_limiters: Dict[tuple, Tuple[Optional['_TokenBucket'], float]] = {}
+_ses_send_limiters_lock = threading.Lock()
+
+# Credential shapes checked before any network probe in validate_config
+SES_ACCESS_KEY_RE = re.compile(r'^(AKIA|ASIA)[A-Z0-9]{16}$')
+SENDGRID_API_KEY_PREFIX = 'SG.'
+BREVO_API_KEY_PREFIX = 'xkeysib-'
+
+# Credentials that passed a live validate_config probe are trusted for this
+# long, keyed by a SHA-256 fingerprint of the provider and credentials
+VALIDATION_CACHE_SECONDS = 300
+_validated_configs: Dict[str, float] = {}
+_validated_configs_lock = threading.Lock()
+
+# Upper bound on concurrent sends issued by EmailProviderInterface.send_many
+EMAIL_SEND_MAX_WORKERS = 10
+
+# SMTPProvider.send_many spreads messages over up to this many sessions at
+# once, but never gives a session fewer than the minimum messages
+SMTP_BATCH_MAX_CONNECTIONS = 4
+SMTP_BATCH_MIN_MESSAGES_PER_CONNECTION = 10
+
+# OAuth2 client-credential tokens keyed by (tenant_id, client_id,
+# client_secret) -> (access_token, monotonic expiry). Tokens are dropped this
+# many seconds before they actually expire.
+OAUTH2_TOKEN_EXPIRY_MARGIN = 60
+_oauth2_tokens: Dict[tuple, Tuple[str, float]] = {}
+_oauth2_tokens_lock = threading.Lock()
+# One lock per cache key, so concurrent misses wait for a single refresh
+# instead of each requesting a token
+_oauth2_refresh_locks: Dict[tuple, threading.Lock] = {}
+
+
+def _cached_oauth2_token(cache_key: tuple) -> Optional[str]:
+    with _oauth2_tokens_lock:
+        cached = _oauth2_tokens.get(cache_key)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
+    return None
+
+
+# Ready provider instances, so repeated sends for a tenant skip the provider
+# queries, the config decryption and the provider set-up (clients, parsed
+# settings). Instances hold no per-send state, so they are shared between
+# threads. Cleared by the provider model signals; other processes pick up
+# changes via the TTL.
+PROVIDER_CACHE_SECONDS = 60
+_providers = TTLCache(maxsize=1024, ttl=PROVIDER_CACHE_SECONDS)
+_providers_lock = threading.Lock()
+
+
+def clear_provider_cache() -> None:
+    """Forget every cached provider instance in this process"""
+    with _providers_lock:
+        _providers.clear()
+
+
+def _cached_provider(cache_key: tuple, build) -> Optional['EmailProviderInterface']:
+    """Return the cached provider for cache_key, or build() it (None is not cached)"""
+    with _providers_lock:
+        cached = _providers.get(cache_key)
+    if cached is None:
+        cached = build()
+        if cached is not None:
+            with _providers_lock:
+                _providers[cache_key] = cached
+    return cached
+
+
+def _record_provider_usage(model, pk, count: int = 1) -> None:
+    """
+    Atomically add count sends to a provider row's usage counters.
+    
+    A single UPDATE with F() expressions avoids the read-modify-write race
+    of incrementing in Python and saving the whole row.
+    """
+    from django.db.models import F
+    model.objects.filter(pk=pk).update(
+        emails_sent_today=F('emails_sent_today') + count,
+        emails_sent_this_hour=F('emails_sent_this_hour') + count,
+        last_used_at=timezone.now(),
+    )
+
+
+# Error payloads share one ISO timestamp per this many seconds
+ERROR_TIMESTAMP_RESOLUTION = 0.05
+_error_timestamp_cache: Tuple[float, str] = (0.0, '')
+
+
+def _error_timestamp() -> str:
+    """
+    ``timezone.now().isoformat()`` memoised at ERROR_TIMESTAMP_RESOLUTION.
+
+    A batch that fails hundreds of sends at once builds one timestamp string
+    instead of one per error.
+    """
+    global _error_timestamp_cache
+    now = time.monotonic()
+    expires_at, value = _error_timestamp_cache
+    if now >= expires_at:
+        value = timezone.now().isoformat()
+        # Single tuple rebind, so concurrent readers never see a torn pair
+        _error_timestamp_cache = (now + ERROR_TIMESTAMP_RESOLUTION, value)
+    return value
+
+
+def _config_fingerprint(provider_type: str, *credentials) -> str:
+    """Stable digest of a provider's credentials, so secrets are not kept as keys"""
+    return hashlib.sha256(
+        '\x00'.join([provider_type, *(str(value) for value in credentials)]).encode('utf-8')
+    ).hexdigest()
+
+
+def _recently_validated(fingerprint: str) -> bool:
+    with _validated_configs_lock:
+        expires_at = _validated_configs.get(fingerprint)
+    return expires_at is not None and time.monotonic() < expires_at
+
+
+def _remember_validated(fingerprint: str):
+    with _validated_configs_lock:
+        _validated_configs[fingerprint] = time.monotonic() + VALIDATION_CACHE_SECONDS
+
 
 class EmailProviderException(Exception):
     """Custom exception for email provider errors with standardized format"""
@@ -34,11 +200,92 @@ class EmailProviderException(Exception):
                 "code": self.error_code,
                 "provider": self.provider_type,
                 "suggestions": self.suggestions,
-                "timestamp": timezone.now().isoformat()
+                "timestamp": _error_timestamp()
             }
         }
 
 
+# SMTP health_check results are reused for this many seconds, so polling
+# dashboards do not open a session on every request
+HEALTH_CHECK_CACHE_SECONDS = 30
+_health_results = TTLCache(maxsize=1024, ttl=HEALTH_CHECK_CACHE_SECONDS)
+_health_results_lock = threading.Lock()
+
+# A provider that fails this many sends in a row is skipped for
+# CIRCUIT_OPEN_SECONDS before a single trial send is let through
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 60
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker (CLOSED -> OPEN -> HALF_OPEN).
+    
+    While OPEN, allow() refuses calls so a dead provider costs nothing
+    instead of a connect timeout per send. After open_seconds one trial call
+    is allowed (HALF_OPEN); its outcome closes or re-opens the circuit.
+    Every call allow() lets through must be reported with record_success()
+    or record_failure(), or a HALF_OPEN circuit never settles.
+    """
+    
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+    
+    def __init__(self,
+                 failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 open_seconds: float = CIRCUIT_OPEN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Whether a call may be attempted now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                # Let exactly one trial call through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider_id) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider"""
+    key = str(provider_id)
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(key)
+        if breaker is None:
+            breaker = _circuit_breakers[key] = CircuitBreaker()
+    return breaker
+
+
+@lru_cache(maxsize=None)
+def _get_send_executor() -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used for concurrent sends"""
+    return ThreadPoolExecutor(max_workers=EMAIL_SEND_MAX_WORKERS, thread_name_prefix='email-send')
+
+
 class EmailProviderInterface(ABC):
     """Abstract base class for all email providers"""
     
@@ -67,6 +314,160 @@ class EmailProviderInterface(ABC):
     def health_check(self) -> Tuple[bool, str]:
         """Check if provider is healthy and operational"""
         pass
+    
+    def invalidate_health(self) -> None:
+        """Drop any cached health_check result (after a failed send)"""
+    
+    def send_many(self, messages: List[Dict[str, Any]]) -> List[Tuple[bool, str, Dict[str, Any]]]:
+        """
+        Send several emails concurrently.
+        
+        Each item holds the keyword arguments of :meth:`send_email`. Sends
+        are network-bound, so they are fanned out over a shared thread pool
+        (SMTP connections are pooled, SES clients and the HTTP session are
+        thread-safe). Results are returned in input order.
+        """
+        def send(message):
+            try:
+                return self.send_email(**message)
+            except Exception as e:
+                logger.error(f"Error sending to {message.get('recipient_email')}: {e}")
+                return False, "", {'error_message': str(e), 'error_type': 'UnexpectedError'}
+        
+        if len(messages) <= 1:
+            return [send(message) for message in messages]
+        return list(_get_send_executor().map(send, messages))
+
+
+@lru_cache(maxsize=None)
+def _get_http_session() -> requests.Session:
+    """
+    Return the process-wide session used for provider HTTP APIs.
+
+    Keeping connections in a pool lets consecutive sends to the same API host
+    skip the TCP and TLS handshakes. Credentials are passed per request, so
+    one session serves every tenant. Retries only cover failures before the
+    request reaches the server (POSTs are not replayed after being sent).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def _build_ses_message(subject: str, html_content: str, text_content: str = None) -> Dict[str, Any]:
+    """Build the ``Message`` argument of SES SendEmail"""
+    body = {}
+    if html_content:
+        body['Html'] = {'Data': html_content, 'Charset': _SES_CHARSET}
+    if text_content or not html_content:
+        # Fall back to the subject when no content is provided at all
+        body['Text'] = {'Data': text_content or subject, 'Charset': _SES_CHARSET}
+    return {'Subject': {'Data': subject, 'Charset': _SES_CHARSET}, 'Body': body}
+
+
+def _build_mime_message(subject: str,
+                        from_email: str,
+                        recipient_email: str,
+                        html_content: str,
+                        text_content: str = None,
+                        headers: Dict[str, Any] = None) -> Message:
+    """
+    Build the MIME message for SMTP and raw sends.
+
+    multipart/alternative is only used when there is both a text and an HTML
+    body; a single body is sent as one text/plain or text/html part, which
+    skips the boundary wrapping.
+    """
+    if text_content and html_content:
+        msg = MIMEMultipart('alternative')
+        msg.attach(MIMEText(text_content, 'plain', 'utf-8'))
+        msg.attach(MIMEText(html_content, 'html', 'utf-8'))
+    elif html_content:
+        msg = MIMEText(html_content, 'html', 'utf-8')
+    else:
+        # Fall back to the subject when no content is provided at all
+        msg = MIMEText(text_content or subject, 'plain', 'utf-8')
+    
+    msg['Subject'] = subject
+    msg['From'] = from_email
+    msg['To'] = recipient_email
+    
+    if headers:
+        for key, value in headers.items():
+            msg[key] = value
+    
+    return msg
+
+
+class _TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens/second"""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens: int = 1):
+        """Take ``tokens``, sleeping until the bucket has refilled enough"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Going negative reserves the tokens; the caller waits out the debt
+            self.tokens -= tokens
+            deficit = -self.tokens
+        if deficit > 0:
+            time.sleep(deficit / self.rate)
+
+
+@lru_cache(maxsize=32)
+def _get_ses_client(aws_access_key_id, aws_secret_access_key, aws_session_token, region_name):
+    """
+    Return a shared SES client for one credential set and region.
+
+    Building a boto3 client loads the service model and TLS context, which
+    costs far more than a send; clients are thread-safe, so every provider
+    instance with the same credentials reuses one.
+    """
+    # boto3 is imported here so processes that only use HTTP/SMTP providers
+    # never pay its import cost
+    import boto3
+
+    return boto3.client(
+        'ses',
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        aws_session_token=aws_session_token,
+        region_name=region_name,
+        config=_get_ses_config()
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_ses_config():
+    """
+    botocore client config shared by every SES client.
+
+    Keepalive and a larger connection pool let concurrent sends (send_many)
+    reuse TLS connections, and adaptive retries back off on SES throttling.
+    """
+    from botocore.config import Config
+
+    return Config(
+        retries={'max_attempts': 5, 'mode': 'adaptive'},
+        max_pool_connections=50,
+        tcp_keepalive=True,
+        connect_timeout=3,
+        read_timeout=10,
+    )
 
 
 class AWSSESProvider(EmailProviderInterface):
@@ -89,17 +490,45 @@ class AWSSESProvider(EmailProviderInterface):
             )
             # Support temporary credentials via STS
             session_token = self.config.get('aws_session_token') or self.config.get('session_token')
-            self.client = boto3.client(
-                'ses',
-                aws_access_key_id=self.config.get('aws_access_key_id'),
-                aws_secret_access_key=self.config.get('aws_secret_access_key'),
-                aws_session_token=session_token,
-                region_name=region
+            self._send_limiter_key = (self.config.get('aws_access_key_id'), region)
+            self.client = _get_ses_client(
+                self.config.get('aws_access_key_id'),
+                self.config.get('aws_secret_access_key'),
+                session_token,
+                region
             )
         except Exception as e:
             logger.error(f"Failed to initialize SES client: {e}")
             raise
     
+    def _throttle(self, count: int = 1):
+        """
+        Wait until ``count`` messages fit within the account's SES MaxSendRate.
+        
+        The rate comes from get_send_quota(), fetched once per access key and
+        region and refreshed every SES_SEND_QUOTA_REFRESH_SECONDS, so bulk
+        sends pace themselves instead of hitting SES throttling errors.
+        """
+        now = time.monotonic()
+        with _ses_send_limiters_lock:
+            bucket, refresh_at = _ses_send_limiters.get(self._send_limiter_key, (None, 0.0))
+        
+        if now >= refresh_at:
+            try:
+                rate = float(self.client.get_send_quota().get('MaxSendRate') or 0)
+            except Exception as e:
+                logger.warning(f"Could not read SES send quota, sending unthrottled: {e}")
+                rate = 0.0
+            if not rate:
+                bucket = None
+            elif bucket is None or bucket.rate != rate:
+                bucket = _TokenBucket(rate)
+            with _ses_send_limiters_lock:
+                _ses_send_limiters[self._send_limiter_key] = (bucket, now + SES_SEND_QUOTA_REFRESH_SECONDS)
+        
+        if bucket is not None:
+            bucket.acquire(count)
+    
     def send_email(self, 
                    recipient_email: str, 
                    subject: str, 
@@ -108,10 +537,9 @@ class AWSSESProvider(EmailProviderInterface):
                    sender_email: str = None,
                    headers: Dict[str, Any] = None) -> Tuple[bool, str, Dict[str, Any]]:
         """Send email via AWS SES"""
+        from botocore.exceptions import BotoCoreError, ClientError
+
         try:
-            # Prepare email content
-            destination = {'ToAddresses': [recipient_email]}
-            
             # Use configured sender or default (support multiple keys)
             source = (
                 sender_email
@@ -122,32 +550,27 @@ class AWSSESProvider(EmailProviderInterface):
             if not source:
                 return False, "", {"error": "No sender email configured"}
             
-            message = {
-                'Subject': {'Data': subject, 'Charset': 'UTF-8'},
-                'Body': {}
-            }
-            
-            if html_content:
-                message['Body']['Html'] = {'Data': html_content, 'Charset': 'UTF-8'}
-            
-            if text_content:
-                message['Body']['Text'] = {'Data': text_content, 'Charset': 'UTF-8'}
-            elif not html_content:
-                # If no content provided, create basic text
-                message['Body']['Text'] = {'Data': subject, 'Charset': 'UTF-8'}
-            
-            # Add custom headers if provided
-            if headers:
-                # SES doesn't support arbitrary headers in the simple send_email method
-                # For custom headers, we'd need to use send_raw_email
-                pass
-            
-            # Send email
-            response = self.client.send_email(
-                Source=source,
-                Destination=destination,
-                Message=message
-            )
+            if headers and self.config.get('use_raw_email'):
+                # The simple SendEmail API has no custom headers (e.g.
+                # List-Unsubscribe), so send the serialized MIME message raw.
+                # Opt-in per provider: the credentials then also need the
+                # ses:SendRawEmail permission, not just ses:SendEmail.
+                msg = _build_mime_message(
+                    subject, source, recipient_email, html_content, text_content, headers
+                )
+                self._throttle()
+                response = self.client.send_raw_email(
+                    Source=source,
+                    Destinations=[recipient_email],
+                    RawMessage={'Data': msg.as_bytes()}
+                )
+            else:
+                self._throttle()
+                response = self.client.send_email(
+                    Source=source,
+                    Destination={'ToAddresses': [recipient_email]},
+                    Message=_build_ses_message(subject, html_content, text_content)
+                )
             
             message_id = response.get('MessageId', '')
             logger.info(f"Email sent successfully via SES: {message_id}")
@@ -164,28 +587,7 @@ class AWSSESProvider(EmailProviderInterface):
             logger.error(f"SES ClientError: {error_code} - {error_message}")
             
             # Provide specific suggestions based on error code
-            suggestions = []
-            if error_code == 'MessageRejected':
-                suggestions = [
-                    "Verify sender email is verified in SES",
-                    "Check recipient email format",
-                    "Ensure content doesn't trigger spam filters"
-                ]
-            elif error_code == 'SendingPausedException':
-                suggestions = [
-                    "Account sending is paused, check SES console",
-                    "Contact AWS support to resume sending"
-                ]
-            elif error_code == 'MailFromDomainNotVerifiedException':
-                suggestions = [
-                    "Verify the sender domain in SES console",
-                    "Add required DNS records for domain verification"
-                ]
-            elif error_code == 'ConfigurationSetDoesNotExistException':
-                suggestions = [
-                    "Check configuration set name",
-                    "Ensure configuration set exists in your AWS region"
-                ]
+            suggestions = list(_SES_ERROR_SUGGESTIONS.get(error_code, ()))
             
             return False, "", {
                 'success': False,
@@ -195,7 +597,7 @@ class AWSSESProvider(EmailProviderInterface):
                     'provider': 'AWS_SES',
                     'type': 'ClientError',
                     'suggestions': suggestions,
-                    'timestamp': timezone.now().isoformat()
+                    'timestamp': _error_timestamp()
                 }
             }
             
@@ -213,7 +615,7 @@ class AWSSESProvider(EmailProviderInterface):
                         "Verify AWS region configuration",
                         "Ensure SES service is available in your region"
                     ],
-                    'timestamp': timezone.now().isoformat()
+                    'timestamp': _error_timestamp()
                 }
             }
             
@@ -231,12 +633,14 @@ class AWSSESProvider(EmailProviderInterface):
                         "Verify network connectivity",
                         "Review application logs for more details"
                     ],
-                    'timestamp': timezone.now().isoformat()
+                    'timestamp': _error_timestamp()
                 }
             }
     
     def validate_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate SES configuration"""
+        from botocore.exceptions import ClientError
+
         # Normalize region
         region = config.get('region') or config.get('region_name') or config.get('aws_region_name')
         
@@ -250,16 +654,26 @@ class AWSSESProvider(EmailProviderInterface):
         if missing:
             return False, f"Missing required field(s): {', '.join(missing)}"
         
+        if not SES_ACCESS_KEY_RE.match(config['aws_access_key_id']):
+            return False, "aws_access_key_id is not a valid AWS access key ID"
+        
+        session_token = config.get('aws_session_token') or config.get('session_token')
+        fingerprint = _config_fingerprint(
+            'AWS_SES', config['aws_access_key_id'], config['aws_secret_access_key'], session_token, region
+        )
+        if _recently_validated(fingerprint):
+            return True, "Configuration valid"
+        
         # Test connection
         try:
-            test_client = boto3.client(
-                'ses',
-                aws_access_key_id=config.get('aws_access_key_id'),
-                aws_secret_access_key=config.get('aws_secret_access_key'),
-                aws_session_token=(config.get('aws_session_token') or config.get('session_token')),
-                region_name=region
+            test_client = _get_ses_client(
+                config.get('aws_access_key_id'),
+                config.get('aws_secret_access_key'),
+                session_token,
+                region
             )
             test_client.get_send_quota()
+            _remember_validated(fingerprint)
             return True, "Configuration valid"
         except ClientError as e:
             code = e.response.get('Error', {}).get('Code')
@@ -290,6 +704,8 @@ class AWSSESProvider(EmailProviderInterface):
 class SendGridProvider(EmailProviderInterface):
     """SendGrid email provider implementation"""
     
+    MAIL_SEND_URL = 'https://api.sendgrid.com/v3/mail/send'
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.client = None
@@ -338,13 +754,23 @@ class SendGridProvider(EmailProviderInterface):
                 for key, value in headers.items():
                     message.header = {key: value}
             
-            # Send email
-            response = self.client.send(message)
+            # Post through the pooled keep-alive session (gzip negotiated by
+            # requests) instead of the SDK's one-connection-per-call urllib
+            response = _get_http_session().post(
+                self.MAIL_SEND_URL,
+                headers={
+                    'Authorization': f"Bearer {self.config['api_key']}",
+                    'Content-Type': 'application/json',
+                },
+                data=ujson.dumps(
+                    message.get(), ensure_ascii=False, escape_forward_slashes=False
+                ).encode('utf-8'),
+            )
             
             # SendGrid returns 202 for success
             if response.status_code == 202:
                 # SendGrid doesn't return message ID in the response headers typically
-                message_id = response.headers.get('X-Message-Id', f"sendgrid_{timezone.now().timestamp()}")
+                message_id = response.headers.get('X-Message-Id') or f"sendgrid_{secrets.token_hex(8)}"
                 
                 return True, message_id, {
                     'provider': 'SENDGRID',
@@ -355,7 +781,7 @@ class SendGridProvider(EmailProviderInterface):
                 return False, "", {
                     'provider': 'SENDGRID',
                     'status_code': response.status_code,
-                    'error_message': response.body
+                    'error_message': response.text
                 }
                 
         except Exception as e:
@@ -371,6 +797,13 @@ class SendGridProvider(EmailProviderInterface):
         if not config.get('api_key'):
             return False, "SendGrid API key is required"
         
+        if not config['api_key'].startswith(SENDGRID_API_KEY_PREFIX):
+            return False, f"SendGrid API keys start with '{SENDGRID_API_KEY_PREFIX}'"
+        
+        fingerprint = _config_fingerprint('SENDGRID', config['api_key'])
+        if _recently_validated(fingerprint):
+            return True, "Configuration valid"
+        
         try:
             import sendgrid
             # Test the API key
@@ -378,6 +811,7 @@ class SendGridProvider(EmailProviderInterface):
             # Make a simple API call to test the key
             response = test_client.user.get()
             if response.status_code == 200:
+                _remember_validated(fingerprint)
                 return True, "Configuration valid"
             else:
                 return False, f"API key test failed with status {response.status_code}"
@@ -415,8 +849,6 @@ class BrevoProvider(EmailProviderInterface):
     
     def _make_api_request(self, endpoint: str, method: str = 'GET', data: Dict[str, Any] = None):
         """Make API request to Brevo"""
-        import requests
-        
         headers = {
             'Accept': 'application/json',
             'Content-Type': 'application/json',
@@ -425,10 +857,14 @@ class BrevoProvider(EmailProviderInterface):
         
         url = f"{self.base_url}/{endpoint}"
         
+        session = _get_http_session()
         if method == 'GET':
-            response = requests.get(url, headers=headers)
+            response = session.get(url, headers=headers)
         elif method == 'POST':
-            response = requests.post(url, headers=headers, json=data)
+            # ujson serializes large HTML bodies several times faster than
+            # the stdlib encoder requests would use for json=
+            body = ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False).encode('utf-8')
+            response = session.post(url, headers=headers, data=body)
         else:
             raise ValueError(f"Unsupported HTTP method: {method}")
         
@@ -485,8 +921,8 @@ class BrevoProvider(EmailProviderInterface):
             response = self._make_api_request('smtp/email', method='POST', data=email_data)
             
             if response.status_code == 201:
-                response_data = response.json()
-                message_id = response_data.get('messageId', f"brevo_{timezone.now().timestamp()}")
+                response_data = ujson.loads(response.content)
+                message_id = response_data.get('messageId') or f"brevo_{secrets.token_hex(8)}"
                 
                 logger.info(f"Email sent successfully via Brevo: {message_id}")
                 
@@ -496,7 +932,7 @@ class BrevoProvider(EmailProviderInterface):
                     'response': response_data
                 }
             else:
-                error_data = response.json() if response.content else {}
+                error_data = ujson.loads(response.content) if response.content else {}
                 return False, "", {
                     'provider': 'BREVO',
                     'status_code': response.status_code,
@@ -521,6 +957,13 @@ class BrevoProvider(EmailProviderInterface):
         if not config.get('from_email'):
             return False, "From email is required for Brevo"
         
+        if not config['api_key'].startswith(BREVO_API_KEY_PREFIX):
+            return False, f"Brevo API keys start with '{BREVO_API_KEY_PREFIX}'"
+        
+        fingerprint = _config_fingerprint('BREVO', config['api_key'])
+        if _recently_validated(fingerprint):
+            return True, "Configuration valid"
+        
         try:
             # Test API key by making an account info request
             test_headers = {
@@ -528,10 +971,10 @@ class BrevoProvider(EmailProviderInterface):
                 'api-key': config['api_key']
             }
             
-            import requests
-            response = requests.get(f"{self.base_url}/account", headers=test_headers)
+            response = _get_http_session().get(f"{self.base_url}/account", headers=test_headers)
             
             if response.status_code == 200:
+                _remember_validated(fingerprint)
                 return True, "Configuration valid"
             else:
                 error_data = response.json() if response.content else {}
@@ -564,51 +1007,136 @@ class BrevoProvider(EmailProviderInterface):
             return False, f"Health check failed: {str(e)}"
 
 
+class SMTPKind(IntEnum):
+    """SMTP services with provider-specific behaviour"""
+    OUTLOOK = 1
+    GMAIL = 2
+    YAHOO = 3
+    CUSTOM = 4
+
+
+# Substring of the SMTP host -> kind, checked in order
+_SMTP_KIND_MARKERS = (
+    ('outlook', SMTPKind.OUTLOOK),
+    ('office365', SMTPKind.OUTLOOK),
+    ('gmail', SMTPKind.GMAIL),
+    ('yahoo', SMTPKind.YAHOO),
+)
+
+_OUTLOOK_STATIC_HEADERS = (
+    ('X-MS-Exchange-Organization-AuthAs', 'Internal'),
+    ('X-MS-Exchange-Organization-AuthMechanism', '10'),
+)
+
+_SMTP_KIND_NAMES = {
+    SMTPKind.OUTLOOK: 'Outlook SMTP',
+    SMTPKind.GMAIL: 'Gmail SMTP',
+    SMTPKind.YAHOO: 'Yahoo SMTP',
+    SMTPKind.CUSTOM: 'Custom SMTP',
+}
+
+# Estimated daily sending limit by kind, when the config sets none
+_SMTP_KIND_DAILY_LIMITS = {
+    SMTPKind.OUTLOOK: 10000,  # Microsoft 365 typical limit
+    SMTPKind.GMAIL: 2000,     # Gmail Workspace limit
+}
+_SMTP_DEFAULT_DAILY_LIMIT = 1000  # Conservative default
+
+
+class _SMTPSettings(NamedTuple):
+    """Connection settings read once from an SMTP provider config"""
+    server: Optional[str]
+    port: int
+    use_ssl: bool
+    use_tls: bool
+    auth_method: str
+    username: Optional[str]
+    password: Optional[str]
+    from_email: Optional[str]
+
+
 class SMTPProvider(EmailProviderInterface):
     """Enhanced SMTP email provider with OAuth2 support for Outlook/Microsoft 365"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.provider_name = self._detect_provider_name()
+        use_ssl = config.get('use_ssl', False)
+        self.settings = _SMTPSettings(
+            server=config.get('smtp_server') or config.get('host'),
+            port=config.get('smtp_port') or config.get('port', 587),
+            use_ssl=use_ssl,
+            use_tls=config.get('use_tls', not use_ssl),
+            auth_method=config.get('auth_method', 'basic'),
+            username=config.get('username'),
+            password=config.get('password'),
+            from_email=config.get('from_email') or config.get('username'),
+        )
+        self.kind = self._detect_kind()
+        self._provider_headers = self._build_provider_headers()
     
-    def _detect_provider_name(self) -> str:
+    def _detect_kind(self) -> 'SMTPKind':
         """Detect the SMTP provider based on server configuration"""
-        smtp_server = self.config.get('smtp_server', '').lower()
-        
-        if 'outlook' in smtp_server or 'office365' in smtp_server:
-            return 'Outlook SMTP'
-        elif 'gmail' in smtp_server:
-            return 'Gmail SMTP'
-        elif 'yahoo' in smtp_server:
-            return 'Yahoo SMTP'
-        else:
-            return 'Custom SMTP'
+        smtp_server = (self.settings.server or '').lower()
+        for marker, kind in _SMTP_KIND_MARKERS:
+            if marker in smtp_server:
+                return kind
+        return SMTPKind.CUSTOM
+    
+    def _build_provider_headers(self) -> Tuple[Tuple[str, str], ...]:
+        """Headers added to every message for this provider kind"""
+        if self.kind != SMTPKind.OUTLOOK:
+            return ()
+        
+        headers = _OUTLOOK_STATIC_HEADERS
+        
+        # Add importance and sensitivity for Outlook
+        importance = self.config.get('importance', 'normal')
+        sensitivity = self.config.get('sensitivity', 'normal')
+        
+        if importance != 'normal':
+            headers += (('Importance', importance),)
+        if sensitivity != 'normal':
+            headers += (('Sensitivity', sensitivity),)
+        return headers
+    
+    @cached_property
+    def provider_name(self) -> str:
+        """Human-readable provider name, e.g. 'Outlook SMTP'"""
+        return _SMTP_KIND_NAMES[self.kind]
+    
+    @cached_property
+    def daily_limit(self) -> int:
+        """Configured daily limit, or an estimate for the provider kind"""
+        return self.config.get('daily_limit') or _SMTP_KIND_DAILY_LIMITS.get(self.kind, _SMTP_DEFAULT_DAILY_LIMIT)
+    
+    @cached_property
+    def _message_id_prefix(self) -> str:
+        """provider_name as a message ID prefix, e.g. 'outlook_smtp'"""
+        return self.provider_name.lower().replace(' ', '_')
     
     def _authenticate_oauth2(self, server, username: str, access_token: str):
         """Authenticate using OAuth2 for Microsoft 365/Outlook"""
         try:
-            # OAuth2 string format for SMTP
-            auth_string = f"user={username}\x01auth=Bearer {access_token}\x01\x01"
-            auth_string = auth_string.encode('ascii')
-            
-            # Use base64 encoding for the auth string
-            import base64
-            auth_string = base64.b64encode(auth_string).decode('ascii')
+            # Base64 of the SASL XOAUTH2 string: user=...^Aauth=Bearer ...^A^A
+            auth_string = base64.b64encode(
+                f"user={username}\x01auth=Bearer {access_token}\x01\x01".encode('ascii')
+            ).decode('ascii')
             
-            # Send AUTH command
-            server.docmd('AUTH', f'XOAUTH2 {auth_string}')
+            # Send AUTH command; docmd does not raise on a rejected AUTH, and
+            # an unauthenticated session must not be cached for reuse
+            code, response = server.docmd('AUTH', f'XOAUTH2 {auth_string}')
+            if code != 235:
+                raise smtplib.SMTPAuthenticationError(code, response)
             
         except Exception as e:
             raise Exception(f"OAuth2 authentication failed: {str(e)}")
     
     def _get_oauth2_token(self) -> Optional[str]:
         """Get OAuth2 access token for Microsoft Graph API"""
-        if not self.config.get('auth_method') == 'OAUTH2':
+        if self.settings.auth_method != 'OAUTH2':
             return None
             
         try:
-            import requests
-            
             tenant_id = self.config.get('tenant_id')
             client_id = self.config.get('client_id')
             client_secret = self.config.get('client_secret')
@@ -616,29 +1144,118 @@ class SMTPProvider(EmailProviderInterface):
             if not all([tenant_id, client_id, client_secret]):
                 raise ValueError("Missing OAuth2 configuration")
             
-            # Microsoft OAuth2 endpoint
-            token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-            
-            data = {
-                'grant_type': 'client_credentials',
-                'client_id': client_id,
-                'client_secret': client_secret,
-                'scope': 'https://graph.microsoft.com/.default'
-            }
-            
-            response = requests.post(token_url, data=data)
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                return token_data.get('access_token')
-            else:
-                logger.error(f"OAuth2 token request failed: {response.text}")
-                return None
+            # Tokens are valid for about an hour; reuse until close to expiry
+            cache_key = (tenant_id, client_id, client_secret)
+            access_token = _cached_oauth2_token(cache_key)
+            if access_token:
+                return access_token
+            
+            with _oauth2_tokens_lock:
+                refresh_lock = _oauth2_refresh_locks.setdefault(cache_key, threading.Lock())
+            with refresh_lock:
+                # Another thread may have refreshed while this one waited
+                access_token = _cached_oauth2_token(cache_key)
+                if access_token:
+                    return access_token
+                return self._request_oauth2_token(cache_key)
                 
         except Exception as e:
             logger.error(f"Error getting OAuth2 token: {e}")
             return None
     
+    def _request_oauth2_token(self, cache_key: tuple) -> Optional[str]:
+        """Request a client-credentials token and cache it until near expiry"""
+        tenant_id, client_id, client_secret = cache_key
+        
+        # Microsoft OAuth2 endpoint
+        token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+        
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scope': 'https://graph.microsoft.com/.default'
+        }
+        
+        response = _get_http_session().post(token_url, data=data)
+        
+        if response.status_code == 200:
+            token_data = response.json()
+            access_token = token_data.get('access_token')
+            if access_token:
+                expires_at = (
+                    time.monotonic()
+                    + int(token_data.get('expires_in', 3600))
+                    - OAUTH2_TOKEN_EXPIRY_MARGIN
+                )
+                with _oauth2_tokens_lock:
+                    _oauth2_tokens[cache_key] = (access_token, expires_at)
+            return access_token
+        else:
+            logger.error(f"OAuth2 token request failed: {response.text}")
+            return None
+    
+    @cached_property
+    def _connection_key(self) -> tuple:
+        """Identify connections that can be shared between provider instances"""
+        settings = self.settings
+        return (
+            settings.server,
+            settings.port,
+            settings.use_ssl,
+            settings.use_tls,
+            settings.auth_method,
+            settings.username,
+            # Sessions authenticated with other credentials must not be reused
+            _config_fingerprint(
+                'SMTP',
+                settings.password,
+                self.config.get('tenant_id'),
+                self.config.get('client_id'),
+                self.config.get('client_secret'),
+            ),
+        )
+    
+    def _connect(self):
+        """Open an unauthenticated SMTP session with the configured SSL/TLS mode"""
+        settings = self.settings
+        
+        if settings.use_ssl:
+            # Use SMTP_SSL for port 465 (Gmail SSL)
+            return SMTP_SSL(settings.server, settings.port)
+        
+        # Use regular SMTP for port 587 (Gmail TLS)
+        server = SMTP(settings.server, settings.port)
+        if settings.use_tls:
+            server.starttls()
+        return server
+    
+    def _open_connection(self):
+        """
+        Connect and authenticate a new SMTP session.
+        
+        Returns None when an OAuth2 token could not be obtained.
+        """
+        settings = self.settings
+        server = self._connect()
+        
+        try:
+            if settings.auth_method == 'OAUTH2':
+                # Use OAuth2 authentication
+                access_token = self._get_oauth2_token()
+                if not access_token:
+                    server.close()
+                    return None
+                self._authenticate_oauth2(server, settings.username, access_token)
+            elif settings.username and settings.password:
+                # Use basic authentication
+                server.login(settings.username, settings.password)
+        except Exception:
+            server.close()
+            raise
+        
+        return server
+    
     def send_email(self, 
                    recipient_email: str, 
                    subject: str, 
@@ -649,93 +1266,42 @@ class SMTPProvider(EmailProviderInterface):
         """Send email via SMTP with enhanced authentication support"""
         try:
             # Use configured sender or default
-            from_email = sender_email or self.config.get('from_email') or self.config.get('username')
+            from_email = sender_email or self.settings.from_email
             if not from_email:
                 return False, "", {"error": "No sender email configured"}
             
             # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = from_email
-            msg['To'] = recipient_email
+            msg = _build_mime_message(
+                subject, from_email, recipient_email, html_content, text_content, headers
+            )
             
             # Add provider-specific headers
-            if self.provider_name == 'Outlook SMTP':
-                msg['X-MS-Exchange-Organization-AuthAs'] = 'Internal'
-                msg['X-MS-Exchange-Organization-AuthMechanism'] = '10'
-                
-                # Add importance and sensitivity for Outlook
-                importance = self.config.get('importance', 'normal')
-                sensitivity = self.config.get('sensitivity', 'normal')
-                
-                if importance != 'normal':
-                    msg['Importance'] = importance
-                if sensitivity != 'normal':
-                    msg['Sensitivity'] = sensitivity
-            
-            # Add custom headers
-            if headers:
-                for key, value in headers.items():
-                    msg[key] = value
-            
-            # Add content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain', 'utf-8')
-                msg.attach(text_part)
+            for key, value in self._provider_headers:
+                msg[key] = value
             
-            if html_content:
-                html_part = MIMEText(html_content, 'html', 'utf-8')
-                msg.attach(html_part)
-            
-            # Connect to SMTP server with proper SSL/TLS handling
-            smtp_server = self.config.get('smtp_server') or self.config.get('host')
-            smtp_port = self.config.get('smtp_port') or self.config.get('port', 587)
-            
-            use_ssl = self.config.get('use_ssl', False)
-            use_tls = self.config.get('use_tls', not use_ssl)
-            
-            if use_ssl:
-                # Use SMTP_SSL for port 465 (Gmail SSL)
-                server = smtplib.SMTP_SSL(smtp_server, smtp_port)
-            else:
-                # Use regular SMTP for port 587 (Gmail TLS)
-                server = smtplib.SMTP(smtp_server, smtp_port)
-                if use_tls:
-                    server.starttls()
-            
-            # Authenticate
-            username = self.config.get('username')
-            
-            if self.config.get('auth_method') == 'OAUTH2':
-                # Use OAuth2 authentication
-                access_token = self._get_oauth2_token()
-                if access_token:
-                    self._authenticate_oauth2(server, username, access_token)
-                else:
+            # Reuse a pooled authenticated connection when possible
+            with smtp_pool.connection(self._connection_key, self._open_connection) as server:
+                if server is None:
                     return False, "", {
                         'provider': 'SMTP',
                         'error_message': 'Failed to obtain OAuth2 access token',
                         'error_type': 'AuthenticationError'
                     }
-            elif username and self.config.get('password'):
-                # Use basic authentication
-                server.login(username, self.config['password'])
-            
-            # Send email
-            text = msg.as_string()
-            server.sendmail(from_email, recipient_email, text)
-            server.quit()
+                
+                # Send email; send_message flattens the MIME tree straight to
+                # bytes instead of building an intermediate str copy first
+                server.send_message(msg, from_addr=from_email, to_addrs=[recipient_email])
             
-            # Generate provider-specific message ID
-            timestamp = timezone.now().timestamp()
-            message_id = f"{self.provider_name.lower().replace(' ', '_')}_{timestamp}"
+            # Generate provider-specific message ID (random, so concurrent
+            # sends never collide the way timestamps could)
+            message_id = f"{self._message_id_prefix}_{secrets.token_hex(8)}"
             
             return True, message_id, {
                 'provider': 'SMTP',
                 'provider_name': self.provider_name,
                 'message_id': message_id,
-                'smtp_server': smtp_server,
-                'auth_method': self.config.get('auth_method', 'basic')
+                'smtp_server': self.settings.server,
+                'auth_method': self.settings.auth_method
             }
             
         except Exception as e:
@@ -747,6 +1313,110 @@ class SMTPProvider(EmailProviderInterface):
                 'error_type': 'SMTPError'
             }
     
+    def send_many(self, messages: List[Dict[str, Any]]) -> List[Tuple[bool, str, Dict[str, Any]]]:
+        """
+        Send several emails over pooled SMTP sessions.
+        
+        When the server supports PIPELINING, each message's envelope takes
+        one round trip instead of one per command. Large batches are split
+        over up to SMTP_BATCH_MAX_CONNECTIONS sessions sending concurrently.
+        Results are returned in input order.
+        """
+        # Stay within the pool's per-connection message cap, and split the
+        # rest evenly over the sessions
+        connections = max(1, min(
+            SMTP_BATCH_MAX_CONNECTIONS,
+            len(messages) // SMTP_BATCH_MIN_MESSAGES_PER_CONNECTION
+        ))
+        chunk_size = max(1, min(smtp_pool.max_messages, -(-len(messages) // connections)))
+        chunks = [messages[start:start + chunk_size] for start in range(0, len(messages), chunk_size)]
+        
+        if len(chunks) <= 1:
+            chunk_results = [self._send_chunk(chunk) for chunk in chunks]
+        else:
+            chunk_results = list(_get_send_executor().map(self._send_chunk, chunks))
+        return [result for results in chunk_results for result in results]
+    
+    def _send_chunk(self, messages: List[Dict[str, Any]]) -> List[Tuple[bool, str, Dict[str, Any]]]:
+        """Send each message over a single pooled session"""
+        key = self._connection_key
+        try:
+            server = smtp_pool.acquire(key, self._open_connection)
+        except Exception as e:
+            logger.error(f"SMTP error ({self.provider_name}): {e}")
+            server = None
+            error = {'error_message': str(e), 'error_type': 'SMTPError'}
+        else:
+            error = {'error_message': 'Failed to obtain OAuth2 access token',
+                     'error_type': 'AuthenticationError'}
+        if server is None:
+            return [
+                (False, "", {'provider': 'SMTP', 'provider_name': self.provider_name, **error})
+                for _ in messages
+            ]
+        
+        results = []
+        reusable = True
+        for message in messages:
+            if not reusable:
+                results.append((False, "", {
+                    'provider': 'SMTP',
+                    'provider_name': self.provider_name,
+                    'error_message': 'SMTP session lost earlier in the batch',
+                    'error_type': 'SMTPError'
+                }))
+                continue
+            
+            recipient_email = message['recipient_email']
+            from_email = message.get('sender_email') or self.settings.from_email
+            if not from_email:
+                results.append((False, "", {"error": "No sender email configured"}))
+                continue
+            
+            # Every message is built on its own, so concurrent chunks never
+            # share a Message object
+            msg = _build_mime_message(
+                message['subject'], from_email, recipient_email, message['html_content'],
+                message.get('text_content'), message.get('headers')
+            )
+            for header, value in self._provider_headers:
+                msg[header] = value
+            
+            try:
+                send_pipelined(server, from_email, [recipient_email], msg.as_bytes(policy=_SMTP_POLICY))
+            except (smtplib.SMTPSenderRefused, smtplib.SMTPRecipientsRefused,
+                    smtplib.SMTPDataError) as e:
+                # The transaction was rejected but the session is still usable
+                results.append((False, "", {
+                    'provider': 'SMTP',
+                    'provider_name': self.provider_name,
+                    'error_message': str(e),
+                    'error_type': 'SMTPError'
+                }))
+                continue
+            except Exception as e:
+                logger.error(f"SMTP error ({self.provider_name}): {e}")
+                reusable = False
+                results.append((False, "", {
+                    'provider': 'SMTP',
+                    'provider_name': self.provider_name,
+                    'error_message': str(e),
+                    'error_type': 'SMTPError'
+                }))
+                continue
+            
+            message_id = f"{self._message_id_prefix}_{secrets.token_hex(8)}"
+            results.append((True, message_id, {
+                'provider': 'SMTP',
+                'provider_name': self.provider_name,
+                'message_id': message_id,
+                'smtp_server': self.settings.server,
+                'auth_method': self.settings.auth_method
+            }))
+        
+        smtp_pool.release(key, server, reusable=reusable, messages=len(messages))
+        return results
+    
     def validate_config(self, config: Dict[str, Any]) -> Tuple[bool, str]:
         """Validate SMTP configuration with OAuth2 support"""
         # Basic required fields
@@ -761,6 +1431,16 @@ class SMTPProvider(EmailProviderInterface):
         
         # Check authentication configuration
         auth_method = config.get('auth_method', 'basic')
+        # Accept multiple field name variations
+        username = (
+            config.get('username') 
+            or config.get('smtp_username') 
+            or config.get('email_host_user')
+        )
+        password = (
+            config.get('password') 
+            or config.get('smtp_password')
+        )
         
         if auth_method == 'OAUTH2':
             # Validate OAuth2 configuration
@@ -769,17 +1449,7 @@ class SMTPProvider(EmailProviderInterface):
                 if not config.get(field):
                     return False, f"Missing required OAuth2 field: {field}"
         else:
-            # Validate basic authentication - accept multiple field name variations
-            username = (
-                config.get('username') 
-                or config.get('smtp_username') 
-                or config.get('email_host_user')
-            )
-            password = (
-                config.get('password') 
-                or config.get('smtp_password')
-            )
-            
+            # Validate basic authentication
             if not username or not password:
                 return False, "Username and password are required for basic authentication"
         
@@ -810,16 +1480,6 @@ class SMTPProvider(EmailProviderInterface):
                     return False, "Failed to obtain OAuth2 access token"
             else:
                 # Test basic authentication - use the extracted username/password
-                username = (
-                    config.get('username') 
-                    or config.get('smtp_username') 
-                    or config.get('email_host_user')
-                )
-                password = (
-                    config.get('password') 
-                    or config.get('smtp_password')
-                )
-                
                 if username and password:
                     server.login(username, password)
                 
@@ -830,75 +1490,71 @@ class SMTPProvider(EmailProviderInterface):
             return False, f"Configuration test failed: {str(e)}"
     
     def health_check(self) -> Tuple[bool, str]:
-        """Enhanced SMTP server health check with provider-specific details"""
+        """
+        Enhanced SMTP server health check with provider-specific details.
+        
+        Results are reused for HEALTH_CHECK_CACHE_SECONDS per connection.
+        """
+        with _health_results_lock:
+            cached = _health_results.get(self._connection_key)
+        if cached is not None:
+            return cached
+        result = self._probe_health()
+        with _health_results_lock:
+            _health_results[self._connection_key] = result
+        return result
+    
+    def invalidate_health(self) -> None:
+        with _health_results_lock:
+            _health_results.pop(self._connection_key, None)
+    
+    def _probe_health(self) -> Tuple[bool, str]:
+        """Run the health check against the server"""
         try:
-            smtp_server = self.config.get('smtp_server') or self.config.get('host')
-            smtp_port = self.config.get('smtp_port') or self.config.get('port', 587)
-            
-            # Handle SSL vs TLS properly
-            use_ssl = self.config.get('use_ssl', False)
-            use_tls = self.config.get('use_tls', not use_ssl)
-            
-            if use_ssl:
-                # Use SMTP_SSL for port 465 (Gmail SSL)
-                server = smtplib.SMTP_SSL(smtp_server, smtp_port)
-            else:
-                # Use regular SMTP for port 587 (Gmail TLS)
-                server = smtplib.SMTP(smtp_server, smtp_port)
-                if use_tls:
-                    server.starttls()
-                
-            status = server.noop()  # No-operation to test connection
+            settings = self.settings
             
             # Prepare detailed health info
             health_details = {
                 'connection': 'OK',
-                'smtp_server': f"{smtp_server}:{smtp_port}",
-                'ssl_enabled': self.config.get('use_ssl', False),
-                'tls_enabled': self.config.get('use_tls', not self.config.get('use_ssl', False)),
+                'smtp_server': f"{settings.server}:{settings.port}",
+                'ssl_enabled': settings.use_ssl,
+                'tls_enabled': settings.use_tls,
                 'provider_name': self.provider_name
             }
             
             # Check authentication method
-            auth_method = self.config.get('auth_method', 'basic')
+            auth_method = settings.auth_method
             health_details['auth_method'] = auth_method
             
-            if auth_method == 'OAUTH2':
-                # Check OAuth2 token status
-                access_token = self._get_oauth2_token()
-                health_details['oauth_token_valid'] = access_token is not None
-                
-                if access_token:
-                    # For Outlook, we could check token expiry here
-                    health_details['authentication'] = 'VALID'
-                else:
-                    health_details['authentication'] = 'FAILED'
-                    
-            else:
-                # Test basic auth if credentials available
-                if self.config.get('username') and self.config.get('password'):
-                    try:
-                        server.login(self.config['username'], self.config['password'])
-                        health_details['authentication'] = 'VALID'
-                    except Exception as auth_e:
+            # Probe a pooled session: a warm one only needs a NOOP, a new one
+            # is authenticated on the way in and kept for the next send
+            try:
+                with smtp_pool.connection(self._connection_key, self._open_connection) as server:
+                    if server is None:
+                        # OAuth2 token could not be obtained; check the
+                        # server is at least reachable
+                        server = self._connect()
+                        try:
+                            server.noop()
+                        finally:
+                            server.quit()
+                        health_details['oauth_token_valid'] = False
                         health_details['authentication'] = 'FAILED'
-                        health_details['auth_error'] = str(auth_e)
-                else:
-                    health_details['authentication'] = 'NO_CREDENTIALS'
-            
-            server.quit()
+                    else:
+                        server.noop()  # No-operation to test connection
+                        if auth_method == 'OAUTH2':
+                            health_details['oauth_token_valid'] = True
+                            health_details['authentication'] = 'VALID'
+                        elif settings.username and settings.password:
+                            health_details['authentication'] = 'VALID'
+                        else:
+                            health_details['authentication'] = 'NO_CREDENTIALS'
+            except smtplib.SMTPAuthenticationError as auth_e:
+                health_details['authentication'] = 'FAILED'
+                health_details['auth_error'] = str(auth_e)
             
             # Estimate daily limits based on provider
-            daily_limit = self.config.get('daily_limit')
-            if not daily_limit:
-                if 'outlook' in smtp_server.lower():
-                    daily_limit = 10000  # Microsoft 365 typical limit
-                elif 'gmail' in smtp_server.lower():
-                    daily_limit = 2000   # Gmail Workspace limit
-                else:
-                    daily_limit = 1000   # Conservative default
-            
-            health_details['daily_limit'] = daily_limit
+            health_details['daily_limit'] = self.daily_limit
             health_details['estimated_daily_sent'] = self.config.get('estimated_daily_sent', 0)
             
             return True, f"{self.provider_name} healthy - {health_details}"
@@ -940,7 +1596,6 @@ class EmailProviderManager:
     
     def __init__(self, tenant_id: Optional[str]):
         self.tenant_id = tenant_id
-        self._providers_cache = {}
     
     def get_provider_for_tenant(self, provider_config=None) -> Optional[EmailProviderInterface]:
         """Get the appropriate email provider for a tenant
@@ -949,63 +1604,113 @@ class EmailProviderManager:
         1. Tenant-owned provider (if exists and enabled)
         2. Primary tenant-bound global provider
         3. Global default provider
+        
+        The provider instance is cached per tenant (see
+        PROVIDER_CACHE_SECONDS).
         """
-        from ..models.provider_models import TenantEmailProvider, EmailProvider
-        from django.db.models import Q
+        def build():
+            resolved = self._resolve_provider_config(provider_config)
+            if resolved is None:
+                return None
+            return EmailProviderFactory.create_provider(*resolved)
         
         try:
-            # If specific provider config is provided, use it
-            if provider_config:
-                provider_type = provider_config.provider.provider_type
-                config = provider_config.get_effective_config()
-                return EmailProviderFactory.create_provider(provider_type, config)
-            
-            # 1. Check for tenant-owned provider first
-            if self.tenant_id:
-                tenant_owned_provider = EmailProvider.objects.filter(
-                    tenant_id=self.tenant_id,
-                    is_global=False,
-                    activated_by_root=True,
-                    activated_by_tmd=True,
-                    is_default=True  # Use the default tenant-owned provider
-                ).first()
-                
-                if tenant_owned_provider:
-                    config = tenant_owned_provider.decrypt_config()
-                    return EmailProviderFactory.create_provider(tenant_owned_provider.provider_type, config)
-            
-            # 2. Get primary provider from tenant-bound global providers
-            tenant_provider = None
-            if self.tenant_id:
-                tenant_provider = TenantEmailProvider.objects.filter(
-                    tenant_id=self.tenant_id,
-                    is_enabled=True,
-                    is_primary=True
-                ).select_related('provider').first()
-            
-            if tenant_provider:
-                provider_type = tenant_provider.provider.provider_type
-                config = tenant_provider.get_effective_config()
-                return EmailProviderFactory.create_provider(provider_type, config)
+            cache_key = ('tenant', self.tenant_id, provider_config.pk if provider_config else 'default')
+            return _cached_provider(cache_key, build)
             
-            # 3. Fallback to global default provider
-            default_provider = EmailProvider.objects.filter(
-                is_global=True,
-                tenant_id__isnull=True,
+        except Exception as e:
+            logger.error(f"Error getting provider for tenant {self.tenant_id}: {e}")
+            return None
+    
+    def _resolve_provider_config(self, provider_config=None) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Run the provider lookup chain; return (provider_type, config) or None"""
+        from ..models.provider_models import TenantEmailProvider, EmailProvider
+        
+        # If specific provider config is provided, use it
+        if provider_config:
+            return provider_config.provider.provider_type, provider_config.get_effective_config()
+        
+        # 1. Check for tenant-owned provider first
+        if self.tenant_id:
+            tenant_owned_provider = EmailProvider.objects.filter(
+                tenant_id=self.tenant_id,
+                is_global=False,
                 activated_by_root=True,
                 activated_by_tmd=True,
-                is_default=True
+                is_default=True  # Use the default tenant-owned provider
             ).first()
             
-            if default_provider:
-                config = default_provider.decrypt_config()
-                return EmailProviderFactory.create_provider(default_provider.provider_type, config)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error getting provider for tenant {self.tenant_id}: {e}")
-            return None
+            if tenant_owned_provider:
+                return tenant_owned_provider.provider_type, tenant_owned_provider.decrypt_config()
+        
+        # 2. Get primary provider from tenant-bound global providers
+        tenant_provider = None
+        if self.tenant_id:
+            tenant_provider = TenantEmailProvider.objects.filter(
+                tenant_id=self.tenant_id,
+                is_enabled=True,
+                is_primary=True
+            ).select_related('provider').first()
+        
+        if tenant_provider:
+            return tenant_provider.provider.provider_type, tenant_provider.get_effective_config()
+        
+        # 3. Fallback to global default provider
+        default_provider = EmailProvider.objects.filter(
+            is_global=True,
+            tenant_id__isnull=True,
+            activated_by_root=True,
+            activated_by_tmd=True,
+            is_default=True
+        ).first()
+        
+        if default_provider:
+            return default_provider.provider_type, default_provider.decrypt_config()
+        
+        return None
+        
+    def _get_tenant_providers(self):
+        """
+        Enabled providers bound to the tenant, in fallback order.
+        
+        Rows that can_send_email() would reject for being inactive, unhealthy
+        or over their limits are filtered out in SQL, so they are neither
+        fetched nor have their configuration decrypted.
+        """
+        from django.db.models import F, Value
+        from django.db.models.functions import Coalesce, NullIf
+        from ..models.provider_models import OrganizationEmailProvider
+        
+        if not self.tenant_id:
+            return OrganizationEmailProvider.objects.none()
+        # tenant_id is the organization the providers are attached to
+        return OrganizationEmailProvider.objects.filter(
+            organization_id=self.tenant_id,
+            is_enabled=True,
+        ).alias(
+            # Same as get_rate_limits(): an unset or zero override falls back
+            # to the provider's limit
+            daily_limit=Coalesce(NullIf('custom_max_emails_per_day', Value(0)), 'provider__max_emails_per_day'),
+            hourly_limit=Coalesce(NullIf('custom_max_emails_per_hour', Value(0)), 'provider__max_emails_per_hour'),
+        ).filter(
+            provider__is_active=True,
+            emails_sent_today__lt=F('daily_limit'),
+            emails_sent_this_hour__lt=F('hourly_limit'),
+            provider__emails_sent_today__lt=F('provider__max_emails_per_day'),
+            provider__emails_sent_this_hour__lt=F('provider__max_emails_per_hour'),
+        ).exclude(
+            provider__health_status='UNHEALTHY'
+        ).select_related('provider').order_by('-is_primary', 'provider__priority')
+    
+    def _get_default_provider(self):
+        """Shared default provider used when every tenant provider fails"""
+        from ..models.provider_models import EmailProvider
+        
+        return EmailProvider.objects.filter(
+            is_shared=True,
+            is_default=True,
+            is_active=True
+        ).first()
     
     def send_email_with_fallback(self, 
                                 recipient_email: str, 
@@ -1018,19 +1723,13 @@ class EmailProviderManager:
         from ..models.provider_models import TenantEmailProvider, EmailProvider
         
         # Get all available providers for tenant, ordered by priority
-        if self.tenant_id:
-            tenant_providers = TenantEmailProvider.objects.filter(
-                tenant_id=self.tenant_id,
-                is_enabled=True,
-                provider__activated_by_root=True,
-                provider__activated_by_tmd=True
-            ).select_related('provider').order_by('-is_primary', 'provider__priority')
-        else:
-            tenant_providers = TenantEmailProvider.objects.none()
+        tenant_providers = self._get_tenant_providers()
         
         last_error = {}
         
         for tenant_provider in tenant_providers:
+            breaker = get_circuit_breaker(f'tenant_provider:{tenant_provider.pk}')
+            provider = None
             try:
                 # Check if provider can send email
                 can_send, reason = tenant_provider.can_send_email()
@@ -1038,10 +1737,17 @@ class EmailProviderManager:
                     logger.warning(f"Skipping provider {tenant_provider.provider.name}: {reason}")
                     continue
                 
+                # Skip providers that keep failing without waiting on them
+                if not breaker.allow():
+                    logger.warning(f"Skipping provider {tenant_provider.provider.name}: circuit open")
+                    continue
+                
                 # Create provider instance
-                provider = EmailProviderFactory.create_provider(
-                    tenant_provider.provider.provider_type,
-                    tenant_provider.get_effective_config()
+                provider = _cached_provider(
+                    ('tenant_provider', tenant_provider.pk),
+                    lambda: EmailProviderFactory.create_provider(
+                        tenant_provider.provider.provider_type, tenant_provider.get_effective_config()
+                    )
                 )
                 
                 # Attempt to send email
@@ -1055,18 +1761,13 @@ class EmailProviderManager:
                 )
                 
                 if success:
+                    breaker.record_success()
+                    
                     # Update usage counters
-                    tenant_provider.emails_sent_today += 1
-                    tenant_provider.emails_sent_this_hour += 1
-                    tenant_provider.last_used_at = timezone.now()
-                    tenant_provider.save()
+                    _record_provider_usage(TenantEmailProvider, tenant_provider.pk)
                     
                     # Update provider usage
-                    provider_obj = tenant_provider.provider
-                    provider_obj.emails_sent_today += 1
-                    provider_obj.emails_sent_this_hour += 1
-                    provider_obj.last_used_at = timezone.now()
-                    provider_obj.save()
+                    _record_provider_usage(EmailProvider, tenant_provider.provider_id)
                     
                     logger.info(f"Email sent successfully via {tenant_provider.provider.name}")
                     response_data['provider_name'] = tenant_provider.provider.name
@@ -1077,24 +1778,39 @@ class EmailProviderManager:
                     return True, message_id, response_data
                 
                 else:
+                    # A rejected recipient says nothing about the provider:
+                    # it answered, which also settles a HALF_OPEN trial
+                    if EmailErrorHandler.is_provider_failure(response_data, tenant_provider.provider.provider_type):
+                        breaker.record_failure()
+                        provider.invalidate_health()
+                    else:
+                        breaker.record_success()
                     last_error = response_data
                     logger.warning(f"Failed to send via {tenant_provider.provider.name}: {response_data}")
                     
             except Exception as e:
-                logger.error(f"Error with provider {tenant_provider.provider.name}: {e}")
                 last_error = {'error_message': str(e), 'provider': tenant_provider.provider.name}
+                if EmailErrorHandler.is_provider_failure(last_error, tenant_provider.provider.provider_type):
+                    breaker.record_failure()
+                    if provider is not None:
+                        provider.invalidate_health()
+                else:
+                    breaker.record_success()
+                logger.error(f"Error with provider {tenant_provider.provider.name}: {e}")
         
         # Fallback to global default provider if tenant-specific providers are unavailable or failed
-        default_provider = EmailProvider.objects.filter(
-            activated_by_root=True,
-            activated_by_tmd=True,
-            is_default=True
-        ).first()
-        if default_provider:
+        default_provider = self._get_default_provider()
+        breaker = get_circuit_breaker(f'provider:{default_provider.pk}') if default_provider else None
+        if default_provider and not breaker.allow():
+            logger.warning(f"Skipping default provider {default_provider.name}: circuit open")
+        elif default_provider:
+            provider_instance = None
             try:
-                provider_instance = EmailProviderFactory.create_provider(
-                    default_provider.provider_type,
-                    default_provider.decrypt_config()
+                provider_instance = _cached_provider(
+                    ('provider', default_provider.pk),
+                    lambda: EmailProviderFactory.create_provider(
+                        default_provider.provider_type, default_provider.decrypt_config()
+                    )
                 )
                 success, message_id, response_data = provider_instance.send_email(
                     recipient_email=recipient_email,
@@ -1106,10 +1822,8 @@ class EmailProviderManager:
                 )
 
                 if success:
-                    default_provider.emails_sent_today += 1
-                    default_provider.emails_sent_this_hour += 1
-                    default_provider.last_used_at = timezone.now()
-                    default_provider.save()
+                    breaker.record_success()
+                    _record_provider_usage(EmailProvider, default_provider.pk)
 
                     response_data['provider_name'] = default_provider.name
                     response_data['provider_id'] = str(default_provider.id)
@@ -1118,10 +1832,24 @@ class EmailProviderManager:
                         response_data['message_id'] = message_id
                     return True, message_id, response_data
 
+                # The default provider's breaker is shared by every tenant,
+                # so only failures of the provider itself may open it; any
+                # other outcome means it answered and counts as a success
+                if EmailErrorHandler.is_provider_failure(response_data, default_provider.provider_type):
+                    breaker.record_failure()
+                    provider_instance.invalidate_health()
+                else:
+                    breaker.record_success()
                 last_error = response_data
             except Exception as e:
-                logger.error(f"Error with default provider {default_provider.name}: {e}")
                 last_error = {'error_message': str(e), 'provider': default_provider.name}
+                if EmailErrorHandler.is_provider_failure(last_error, default_provider.provider_type):
+                    breaker.record_failure()
+                    if provider_instance is not None:
+                        provider_instance.invalidate_health()
+                else:
+                    breaker.record_success()
+                logger.error(f"Error with default provider {default_provider.name}: {e}")
 
         # If all providers failed
-        return False, "", last_error or {'error_message': 'No available email providers'}
\ No newline at end of file
+        return False, "", last_error or {'error_message': 'No available email providers'}
@@ -1,9 +1,9 @@
 import re
 import logging
+from functools import lru_cache
 from django.core.mail import EmailMultiAlternatives
-from django.template import Template, Context
+from django.db.models import Case, Q, Value, When
 from django.utils import timezone
-from django.utils.html import strip_tags
 from ..models import AutomationRule, EmailTemplate, EmailProvider
 from ..backends import DynamicEmailBackend
 
@@ -13,6 +13,7 @@ from ..backends import DynamicEmailBackend
 
 # Import the new unified email sender
 from .unified_email_sender import UnifiedEmailSender
+from .template_utils import html_to_text, render_template_source
 
 # Import hierarchical resolver for new architecture
 from .hierarchy_resolver import HierarchicalResolver
@@ -20,6 +21,48 @@ from .hierarchy_resolver import is_email_service_active as hierarchical_is_email
 
 logger = logging.getLogger(__name__)
 
+# {{variable_name}} placeholders used by process_template_variables
+_TEMPLATE_VAR_RE = re.compile(r'{{(.*?)}}')
+
+
+# Characters str.format gives meaning to inside a replacement field
+_FORMAT_FIELD_SPECIALS = frozenset('{}[]:!.')
+
+
+class _MissingAsEmpty(dict):
+    """format_map mapping that renders unknown variables as empty strings"""
+
+    def __missing__(self, key):
+        return ''
+
+
+@lru_cache(maxsize=512)
+def _to_format_string(template_text):
+    """
+    Convert {{variable}} placeholders into a str.format template.
+
+    Returns None when a variable name would be misread by str.format
+    (empty, positional or containing format syntax).
+    """
+    parts = []
+    position = 0
+    for match in _TEMPLATE_VAR_RE.finditer(template_text):
+        name = match.group(1).strip()
+        if not name or name[0].isdigit() or not _FORMAT_FIELD_SPECIALS.isdisjoint(name):
+            return None
+        literal = template_text[position:match.start()]
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        parts.append(f'{{{name}}}')
+        position = match.end()
+    parts.append(template_text[position:].replace('{', '{{').replace('}', '}}'))
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=128)
+def _static_text_body(html):
+    """Plain-text version of an HTML body that has no template syntax"""
+    return html_to_text(html)
+
 
 def is_email_service_active(product_id=None, tenant_id=None, use_new_architecture=True):
     """
@@ -109,12 +152,15 @@ def process_template_variables(template_text, context):
     Replaces variables in template text with values from context.
     Variables are expected in the format {{variable_name}}.
     """
-    def replace_var(match):
-        var_name = match.group(1).strip()
-        return str(context.get(var_name, ''))
-    
+    # Fast path: the substitution loop runs in C via str.format_map
+    format_string = _to_format_string(template_text)
+    if format_string is not None:
+        return format_string.format_map(_MissingAsEmpty(context))
+
     # Replace {{variable_name}} with corresponding value from context
-    return re.sub(r'{{(.*?)}}', replace_var, template_text)
+    return _TEMPLATE_VAR_RE.sub(
+        lambda match: str(context.get(match.group(1).strip(), '')), template_text
+    )
 
 
 def render_email_template(email_template, context):
@@ -138,14 +184,15 @@ def render_email_template(email_template, context):
     if not isinstance(context, dict):
         raise TypeError("render_email_template context must be a dictionary")
 
-    template_context = Context(context)
-
-    subject_template = Template(email_template.email_subject or "")
-    body_template = Template(email_template.email_body or "")
-
-    rendered_subject = subject_template.render(template_context)
-    rendered_html = body_template.render(template_context)
-    rendered_text = strip_tags(rendered_html)
+    body_source = email_template.email_body or ""
+    # Templates are parsed once per distinct source, not once per recipient
+    rendered_subject = render_template_source(email_template.email_subject or "", context)
+    rendered_html = render_template_source(body_source, context)
+    if '{' in body_source:
+        rendered_text = html_to_text(rendered_html)
+    else:
+        # Nothing to substitute, so every recipient gets the same text body
+        rendered_text = _static_text_body(rendered_html)
 
     return rendered_subject, rendered_html, rendered_text
 
@@ -186,21 +233,21 @@ def send_automated_email(recipient_emails: list, email_variables: dict, reason_n
         )
         if product_id:
             rules_qs = rules_qs.filter(product_id=product_id)
-        # Prefer tenant-specific first if tenant_id provided
+        # Prefer tenant-specific first if tenant_id provided; the precedence
+        # is applied in the ORDER BY so a single query picks the rule
         if tenant_id:
-            tenant_rules = rules_qs.filter(tenant_id=tenant_id)
-            if tenant_rules.exists():
-                rules_qs = tenant_rules
-            else:
-                rules_qs = rules_qs.filter(tenant_id__isnull=True)
+            rules_qs = rules_qs.filter(
+                Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True)
+            ).annotate(
+                tenant_priority=Case(When(tenant_id=tenant_id, then=Value(0)), default=Value(1))
+            ).order_by('tenant_priority', '-id')
         else:
-            rules_qs = rules_qs.filter(tenant_id__isnull=True)
+            # Deterministic ordering: newest wins (or change to 'id')
+            rules_qs = rules_qs.filter(tenant_id__isnull=True).order_by('-id')
 
-        if not rules_qs.exists():
+        rule = rules_qs.first()
+        if rule is None:
             raise AutomationRule.DoesNotExist
-
-        # Deterministic ordering: newest wins (or change to 'id')
-        rule = rules_qs.order_by('-id').first()
         # --- End Prioritization ---
 
         # Use the unified email sender
@@ -224,4 +271,13 @@ def send_automated_email(recipient_emails: list, email_variables: dict, reason_n
             'tenant_id': tenant_id,
             'product_id': product_id,
             'error': str(e),
-        }
\ No newline at end of file
+        }
+
+
+__all__ = (
+    'is_email_service_active',
+    'process_template_variables',
+    'render_email_template',
+    'send_email_for_specific_rule',
+    'send_automated_email',
+)
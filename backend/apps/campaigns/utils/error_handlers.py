@@ -7,6 +7,8 @@ for various email provider errors (AWS SES, SMTP, etc.).
 
 import re
 import logging
+import smtplib
+from functools import lru_cache
 from typing import Tuple, Optional
 from botocore.exceptions import ClientError, BotoCoreError
 
@@ -22,6 +24,13 @@ from ..exceptions import (
 
 logger = logging.getLogger(__name__)
 
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+
+def _compile_any(patterns) -> re.Pattern:
+    """Compile patterns into one case-insensitive regex matching any of them"""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+
 
 class EmailErrorHandler:
     """
@@ -38,6 +47,7 @@ class EmailErrorHandler:
         r"not authorized to send from",
         r"MAIL FROM domain.*not verified",
     ]
+    SES_VERIFICATION_RE = _compile_any(SES_VERIFICATION_PATTERNS)
     
     SES_QUOTA_PATTERNS = [
         r"Daily message quota exceeded",
@@ -45,18 +55,21 @@ class EmailErrorHandler:
         r"Throttling",
         r"sending quota",
     ]
+    SES_QUOTA_RE = _compile_any(SES_QUOTA_PATTERNS)
     
     SES_BLACKLIST_PATTERNS = [
         r"Address is on.*suppression list",
         r"recipient.*suppressed",
         r"account.*sending disabled",
     ]
+    SES_BLACKLIST_RE = _compile_any(SES_BLACKLIST_PATTERNS)
     
     SES_INVALID_PATTERNS = [
         r"Invalid.*email address",
         r"Recipient address rejected",
         r"Malformed.*address",
     ]
+    SES_INVALID_RE = _compile_any(SES_INVALID_PATTERNS)
     
     # SMTP error patterns
     SMTP_AUTH_PATTERNS = [
@@ -64,6 +77,7 @@ class EmailErrorHandler:
         r"invalid credentials",
         r"535",  # SMTP auth error code
     ]
+    SMTP_AUTH_RE = _compile_any(SMTP_AUTH_PATTERNS)
     
     SMTP_CONNECTION_PATTERNS = [
         r"connection refused",
@@ -71,6 +85,44 @@ class EmailErrorHandler:
         r"network unreachable",
         r"could not connect",
     ]
+    SMTP_CONNECTION_RE = _compile_any(SMTP_CONNECTION_PATTERNS)
+    
+    # Failure messages showing the provider itself could not be reached
+    PROVIDER_UNREACHABLE_PATTERNS = [
+        r"timed? ?out",
+        r"connection (?:refused|reset|aborted|unexpectedly closed)",
+        r"could not connect",
+        r"network (?:is )?unreachable",
+        r"name or service not known",
+        r"temporary failure in name resolution",
+        r"service (?:not|temporarily un)available",
+    ]
+    PROVIDER_UNREACHABLE_RE = _compile_any(PROVIDER_UNREACHABLE_PATTERNS)
+    
+    # AWS SES (v1 and v2) error codes that map to one category without
+    # looking at the message. MessageRejected is not listed: it covers
+    # several causes, so it is classified by message.
+    SES_ERROR_CODE_HANDLERS = {
+        "MailFromDomainNotVerified": "_ses_verification_error",
+        "MailFromDomainNotVerifiedException": "_ses_verification_error",
+        "Throttling": "_ses_quota_error",
+        "ThrottlingException": "_ses_quota_error",
+        "TooManyRequestsException": "_ses_quota_error",
+        "AccountSendingPausedException": "_ses_sending_paused_error",
+        "ConfigurationSetSendingPausedException": "_ses_sending_paused_error",
+        "SendingPausedException": "_ses_sending_paused_error",
+    }
+    
+    # Exception type produced by each classifier method
+    CLASSIFIER_ERRORS = {
+        "_ses_verification_error": EmailVerificationError,
+        "_ses_quota_error": EmailQuotaExceededError,
+        "_ses_blacklist_error": EmailBlacklistedError,
+        "_ses_invalid_error": EmailInvalidRecipientError,
+        "_ses_sending_paused_error": EmailProviderConfigError,
+        "_smtp_auth_error": EmailProviderConfigError,
+        "_smtp_connection_error": EmailProviderConnectionError,
+    }
     
     @classmethod
     def handle_exception(
@@ -90,6 +142,10 @@ class EmailErrorHandler:
         Returns:
             Tuple of (is_retryable, user_message, classified_exception)
         """
+        # Already classified (e.g. re-raised by a retry wrapper)
+        if isinstance(exception, EmailSendingError):
+            return exception.is_retryable, exception.message, exception
+        
         context = context or {}
         provider_type = (provider_type or "UNKNOWN").upper()
         
@@ -98,12 +154,75 @@ class EmailErrorHandler:
             return cls._handle_ses_error(exception, context)
         
         # Handle SMTP errors
-        if provider_type in {"SMTP", "GMAIL_SMTP", "OUTLOOK_SMTP"} or "SMTP" in str(type(exception).__name__):
+        if provider_type in {"SMTP", "GMAIL_SMTP", "OUTLOOK_SMTP"} or isinstance(exception, smtplib.SMTPException):
             return cls._handle_smtp_error(exception, context)
         
         # Generic error handling
         return cls._handle_generic_error(exception, context)
     
+    @classmethod
+    def is_retryable(cls, exception: Exception, provider_type: str = None) -> bool:
+        """
+        Return whether handle_exception would report the error as retryable.
+        
+        For callers that only branch on retrying: classifies the error the
+        same way but builds no user message or exception and logs nothing.
+        """
+        if isinstance(exception, EmailSendingError):
+            return exception.is_retryable
+        
+        provider_type = (provider_type or "UNKNOWN").upper()
+        if provider_type == "AWS_SES" or isinstance(exception, (ClientError, BotoCoreError)):
+            handler_name = cls._ses_classifier(*cls._ses_error_details(exception))
+        elif provider_type in {"SMTP", "GMAIL_SMTP", "OUTLOOK_SMTP"} or isinstance(exception, smtplib.SMTPException):
+            handler_name = cls._smtp_classifier(str(exception))
+        else:
+            handler_name = None
+        return cls.CLASSIFIER_ERRORS.get(handler_name, EmailSendingError).is_retryable
+    
+    @classmethod
+    def is_provider_failure(cls, response_data: dict, provider_type: str = None) -> bool:
+        """
+        Return whether a failed send's response data blames the provider.
+        
+        Connection, timeout, authentication and throttling failures do.
+        Recipient rejections (invalid, suppressed or unverified addresses,
+        SES MessageRejected) and unclassified errors do not, so they must not
+        count against a provider's circuit breaker.
+        """
+        # SES nests the details under 'error'; other providers keep them flat
+        error = response_data.get('error')
+        if isinstance(error, dict):
+            error_code = error.get('code') or ''
+            error_message = error.get('message') or ''
+            error_type = error.get('type')
+        else:
+            error_code = response_data.get('error_code') or ''
+            error_message = response_data.get('error_message') or str(error or '')
+            error_type = response_data.get('error_type')
+        
+        if error_type in ('AuthenticationError', 'BotoCoreError'):
+            return True
+        if cls.PROVIDER_UNREACHABLE_RE.search(error_message):
+            return True
+        
+        if (provider_type or "UNKNOWN").upper() == "AWS_SES":
+            handler_name = None if error_code == "MessageRejected" else cls._ses_classifier(error_code, error_message)
+        else:
+            handler_name = cls._smtp_classifier(error_message)
+        error_class = cls.CLASSIFIER_ERRORS.get(handler_name)
+        if error_class is None:
+            return False
+        # Retryable classes are quota/throttling and connection errors
+        return error_class.is_retryable or issubclass(error_class, EmailProviderConfigError)
+    
+    @staticmethod
+    def _ses_error_details(exception: Exception) -> Tuple[str, str]:
+        """Return (error code, error message) of an SES error"""
+        # Read the ClientError response once
+        error = exception.response.get('Error', {}) if isinstance(exception, ClientError) else {}
+        return error.get('Code', ''), error.get('Message') or str(exception)
+    
     @classmethod
     def _handle_ses_error(
         cls,
@@ -111,119 +230,11 @@ class EmailErrorHandler:
         context: dict
     ) -> Tuple[bool, str, Optional[Exception]]:
         """Handle AWS SES specific errors."""
-        error_message = str(exception)
-        error_code = None
-        
-        # Extract error code from ClientError
-        if isinstance(exception, ClientError):
-            error_code = exception.response.get('Error', {}).get('Code', '')
-            error_message = exception.response.get('Error', {}).get('Message', error_message)
-        
-        # Check for verification errors
-        if error_code == "MessageRejected" or any(
-            re.search(pattern, error_message, re.IGNORECASE)
-            for pattern in cls.SES_VERIFICATION_PATTERNS
-        ):
-            # Extract unverified email from error message
-            unverified_email = cls._extract_email_from_message(error_message)
-            if not unverified_email:
-                unverified_email = context.get('recipient_email') or context.get('from_email')
-            
-            user_message = (
-                f"Email verification required: '{unverified_email}' is not verified with AWS SES. "
-                f"Please verify this email address or domain in your AWS SES console before sending."
-            )
-            
-            classified_error = EmailVerificationError(
-                message=user_message,
-                unverified_email=unverified_email,
-                original_error=exception,
-                provider_type="AWS_SES"
-            )
-            
-            logger.warning(
-                f"[EmailErrorHandler] SES Verification Error - "
-                f"unverified_email={unverified_email} rule_id={context.get('rule_id')}",
-                extra={"context": context}
-            )
-            
-            return False, user_message, classified_error
-        
-        # Check for quota/throttling errors
-        if error_code in {"Throttling", "ThrottlingException"} or any(
-            re.search(pattern, error_message, re.IGNORECASE)
-            for pattern in cls.SES_QUOTA_PATTERNS
-        ):
-            user_message = (
-                "AWS SES sending quota exceeded. Please wait before retrying or "
-                "request a quota increase in the AWS console."
-            )
-            
-            classified_error = EmailQuotaExceededError(
-                message=user_message,
-                original_error=exception,
-                provider_type="AWS_SES"
-            )
-            
-            logger.warning(
-                f"[EmailErrorHandler] SES Quota Exceeded - rule_id={context.get('rule_id')}",
-                extra={"context": context}
-            )
-            
-            return True, user_message, classified_error  # Retryable
-        
-        # Check for suppression/blacklist errors
-        if any(
-            re.search(pattern, error_message, re.IGNORECASE)
-            for pattern in cls.SES_BLACKLIST_PATTERNS
-        ):
-            blacklisted_email = context.get('recipient_email')
-            user_message = (
-                f"Email '{blacklisted_email}' is on the AWS SES suppression list. "
-                f"This typically occurs after bounces or complaints. "
-                f"Remove it from the suppression list in AWS console to retry."
-            )
-            
-            classified_error = EmailBlacklistedError(
-                message=user_message,
-                blacklisted_email=blacklisted_email,
-                original_error=exception,
-                provider_type="AWS_SES"
-            )
-            
-            logger.warning(
-                f"[EmailErrorHandler] SES Blacklist Error - "
-                f"email={blacklisted_email} rule_id={context.get('rule_id')}",
-                extra={"context": context}
-            )
-            
-            return False, user_message, classified_error
-        
-        # Check for invalid email format
-        if any(
-            re.search(pattern, error_message, re.IGNORECASE)
-            for pattern in cls.SES_INVALID_PATTERNS
-        ):
-            invalid_email = context.get('recipient_email')
-            user_message = (
-                f"Invalid email address: '{invalid_email}'. "
-                f"Please verify the email format is correct."
-            )
-            
-            classified_error = EmailInvalidRecipientError(
-                message=user_message,
-                invalid_email=invalid_email,
-                original_error=exception,
-                provider_type="AWS_SES"
-            )
-            
-            logger.warning(
-                f"[EmailErrorHandler] SES Invalid Email - "
-                f"email={invalid_email} rule_id={context.get('rule_id')}",
-                extra={"context": context}
-            )
-            
-            return False, user_message, classified_error
+        error_code, error_message = cls._ses_error_details(exception)
+        
+        handler_name = cls._ses_classifier(error_code, error_message)
+        if handler_name:
+            return getattr(cls, handler_name)(exception, error_message, context)
         
         # Generic SES error
         user_message = f"AWS SES error: {error_message}"
@@ -242,6 +253,182 @@ class EmailErrorHandler:
         
         return True, user_message, classified_error  # Default to retryable
     
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _ses_classifier(cls, error_code: str, error_message: str) -> Optional[str]:
+        """
+        Return the name of the classifier method for an SES error, or None
+        for a generic error.
+        
+        Cached, because an outage or quota hit fails many sends with the same
+        code and message.
+        """
+        # Error codes that identify the category on their own
+        handler_name = cls.SES_ERROR_CODE_HANDLERS.get(error_code)
+        if handler_name:
+            return handler_name
+        
+        # Otherwise classify by message
+        if cls.SES_VERIFICATION_RE.search(error_message):
+            return "_ses_verification_error"
+        if cls.SES_QUOTA_RE.search(error_message):
+            return "_ses_quota_error"
+        if cls.SES_BLACKLIST_RE.search(error_message):
+            return "_ses_blacklist_error"
+        if cls.SES_INVALID_RE.search(error_message):
+            return "_ses_invalid_error"
+        
+        # MessageRejected covers several causes; an unverified identity is
+        # the usual one when the message does not say otherwise
+        if error_code == "MessageRejected":
+            return "_ses_verification_error"
+        
+        return None
+    
+    @classmethod
+    def _ses_verification_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify an SES error caused by an unverified identity."""
+        # Extract unverified email from error message
+        unverified_email = cls._extract_email_from_message(error_message)
+        if not unverified_email:
+            unverified_email = context.get('recipient_email') or context.get('from_email')
+        
+        user_message = (
+            f"Email verification required: '{unverified_email}' is not verified with AWS SES. "
+            f"Please verify this email address or domain in your AWS SES console before sending."
+        )
+        
+        classified_error = EmailVerificationError(
+            message=user_message,
+            unverified_email=unverified_email,
+            original_error=exception,
+            provider_type="AWS_SES"
+        )
+        
+        logger.warning(
+            f"[EmailErrorHandler] SES Verification Error - "
+            f"unverified_email={unverified_email} rule_id={context.get('rule_id')}",
+            extra={"context": context}
+        )
+        
+        return False, user_message, classified_error
+    
+    @classmethod
+    def _ses_quota_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify an SES quota or throttling error."""
+        user_message = (
+            "AWS SES sending quota exceeded. Please wait before retrying or "
+            "request a quota increase in the AWS console."
+        )
+        
+        classified_error = EmailQuotaExceededError(
+            message=user_message,
+            original_error=exception,
+            provider_type="AWS_SES"
+        )
+        
+        logger.warning(
+            f"[EmailErrorHandler] SES Quota Exceeded - rule_id={context.get('rule_id')}",
+            extra={"context": context}
+        )
+        
+        return True, user_message, classified_error  # Retryable
+    
+    @classmethod
+    def _ses_blacklist_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify an SES error for a suppressed recipient."""
+        blacklisted_email = context.get('recipient_email')
+        user_message = (
+            f"Email '{blacklisted_email}' is on the AWS SES suppression list. "
+            f"This typically occurs after bounces or complaints. "
+            f"Remove it from the suppression list in AWS console to retry."
+        )
+        
+        classified_error = EmailBlacklistedError(
+            message=user_message,
+            blacklisted_email=blacklisted_email,
+            original_error=exception,
+            provider_type="AWS_SES"
+        )
+        
+        logger.warning(
+            f"[EmailErrorHandler] SES Blacklist Error - "
+            f"email={blacklisted_email} rule_id={context.get('rule_id')}",
+            extra={"context": context}
+        )
+        
+        return False, user_message, classified_error
+    
+    @classmethod
+    def _ses_sending_paused_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify an SES error for sending paused on the account or configuration set."""
+        user_message = (
+            f"AWS SES sending is paused for this account or configuration set: {error_message}. "
+            f"Resume sending in the AWS SES console before retrying."
+        )
+        
+        classified_error = EmailProviderConfigError(
+            message=user_message,
+            original_error=exception,
+            provider_type="AWS_SES"
+        )
+        
+        logger.error(
+            f"[EmailErrorHandler] SES Sending Paused - rule_id={context.get('rule_id')} message={error_message}",
+            extra={"context": context}
+        )
+        
+        return False, user_message, classified_error
+    
+    @classmethod
+    def _ses_invalid_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify an SES error caused by a malformed recipient."""
+        invalid_email = context.get('recipient_email')
+        user_message = (
+            f"Invalid email address: '{invalid_email}'. "
+            f"Please verify the email format is correct."
+        )
+        
+        classified_error = EmailInvalidRecipientError(
+            message=user_message,
+            invalid_email=invalid_email,
+            original_error=exception,
+            provider_type="AWS_SES"
+        )
+        
+        logger.warning(
+            f"[EmailErrorHandler] SES Invalid Email - "
+            f"email={invalid_email} rule_id={context.get('rule_id')}",
+            extra={"context": context}
+        )
+        
+        return False, user_message, classified_error
+    
     @classmethod
     def _handle_smtp_error(
         cls,
@@ -251,51 +438,9 @@ class EmailErrorHandler:
         """Handle SMTP specific errors."""
         error_message = str(exception)
         
-        # Check for authentication errors
-        if any(
-            re.search(pattern, error_message, re.IGNORECASE)
-            for pattern in cls.SMTP_AUTH_PATTERNS
-        ):
-            user_message = (
-                "SMTP authentication failed. Please verify your email credentials "
-                "(username and password) are correct."
-            )
-            
-            classified_error = EmailProviderConfigError(
-                message=user_message,
-                original_error=exception,
-                provider_type="SMTP"
-            )
-            
-            logger.error(
-                f"[EmailErrorHandler] SMTP Auth Error - rule_id={context.get('rule_id')}",
-                extra={"context": context}
-            )
-            
-            return False, user_message, classified_error
-        
-        # Check for connection errors
-        if any(
-            re.search(pattern, error_message, re.IGNORECASE)
-            for pattern in cls.SMTP_CONNECTION_PATTERNS
-        ):
-            user_message = (
-                "Unable to connect to SMTP server. Please verify the server address, "
-                "port, and network connectivity."
-            )
-            
-            classified_error = EmailProviderConnectionError(
-                message=user_message,
-                original_error=exception,
-                provider_type="SMTP"
-            )
-            
-            logger.error(
-                f"[EmailErrorHandler] SMTP Connection Error - rule_id={context.get('rule_id')}",
-                extra={"context": context}
-            )
-            
-            return True, user_message, classified_error  # Retryable
+        handler_name = cls._smtp_classifier(error_message)
+        if handler_name:
+            return getattr(cls, handler_name)(exception, error_message, context)
         
         # Generic SMTP error
         user_message = f"SMTP error: {error_message}"
@@ -313,6 +458,71 @@ class EmailErrorHandler:
         
         return True, user_message, classified_error
     
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _smtp_classifier(cls, error_message: str) -> Optional[str]:
+        """
+        Return the name of the classifier method for an SMTP error, or None
+        for a generic error (cached like _ses_classifier).
+        """
+        if cls.SMTP_AUTH_RE.search(error_message):
+            return "_smtp_auth_error"
+        if cls.SMTP_CONNECTION_RE.search(error_message):
+            return "_smtp_connection_error"
+        return None
+    
+    @classmethod
+    def _smtp_auth_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify an SMTP authentication failure."""
+        user_message = (
+            "SMTP authentication failed. Please verify your email credentials "
+            "(username and password) are correct."
+        )
+        
+        classified_error = EmailProviderConfigError(
+            message=user_message,
+            original_error=exception,
+            provider_type="SMTP"
+        )
+        
+        logger.error(
+            f"[EmailErrorHandler] SMTP Auth Error - rule_id={context.get('rule_id')}",
+            extra={"context": context}
+        )
+        
+        return False, user_message, classified_error
+    
+    @classmethod
+    def _smtp_connection_error(
+        cls,
+        exception: Exception,
+        error_message: str,
+        context: dict
+    ) -> Tuple[bool, str, Optional[Exception]]:
+        """Classify a failure to reach the SMTP server."""
+        user_message = (
+            "Unable to connect to SMTP server. Please verify the server address, "
+            "port, and network connectivity."
+        )
+        
+        classified_error = EmailProviderConnectionError(
+            message=user_message,
+            original_error=exception,
+            provider_type="SMTP"
+        )
+        
+        logger.error(
+            f"[EmailErrorHandler] SMTP Connection Error - rule_id={context.get('rule_id')}",
+            extra={"context": context}
+        )
+        
+        return True, user_message, classified_error  # Retryable
+    
     @classmethod
     def _handle_generic_error(
         cls,
@@ -340,12 +550,8 @@ class EmailErrorHandler:
     @staticmethod
     def _extract_email_from_message(message: str) -> Optional[str]:
         """Extract email address from error message using regex."""
-        # Pattern to match email addresses
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, message)
-        
-        if matches:
-            # Return the last email found (usually the problematic one in SES errors)
-            return matches[-1]
-        
-        return None
+        # Return the last email found (usually the problematic one in SES errors)
+        last = None
+        for match in _EMAIL_RE.finditer(message):
+            last = match.group()
+        return last
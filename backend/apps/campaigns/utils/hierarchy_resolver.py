@@ -9,15 +9,47 @@ This enables pre-signup emails to work using global TMD configurations
 before a tenant has their own rules, templates, or providers set up.
 """
 
+import contextvars
 import logging
-from typing import Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from django.db.models import Q
+from django.db.models import Case, Q, Value, When
 
 logger = logging.getLogger(__name__)
 
 EMAIL_AUTOMATION_SERVICE_NAME = "Email Automation"
 
+# Resolver results memoized for the current request or Celery task; None
+# outside such a scope (see start_resolver_cache)
+_resolver_cache: contextvars.ContextVar[Optional[Dict[tuple, Any]]] = contextvars.ContextVar(
+    'resolver_cache', default=None
+)
+
+
+def start_resolver_cache() -> contextvars.Token:
+    """
+    Memoize HierarchicalResolver lookups in the current context.
+    
+    Returns a token to pass to end_resolver_cache. Used around requests
+    (ResolverCacheMiddleware) and Celery tasks, where the same rule or
+    template is often resolved several times.
+    """
+    return _resolver_cache.set({})
+
+
+def end_resolver_cache(token: contextvars.Token) -> None:
+    """Drop the lookups memoized since start_resolver_cache"""
+    _resolver_cache.reset(token)
+
+
+def _cached_lookup(key: tuple, lookup: Callable[[], Any]) -> Any:
+    cache = _resolver_cache.get()
+    if cache is None:
+        return lookup()
+    if key not in cache:
+        cache[key] = lookup()
+    return cache[key]
+
 
 class HierarchicalResolver:
     """
@@ -52,6 +84,15 @@ class HierarchicalResolver:
         1. Tenant-specific rule (tenant_id + reason_name + communication_type)
         2. Global rule (tenant_id=NULL + reason_name + communication_type)
         """
+        return _cached_lookup(
+            ('rule', reason_name, tenant_id, communication_type),
+            lambda: HierarchicalResolver._resolve_automation_rule(
+                reason_name, tenant_id, communication_type
+            )
+        )
+    
+    @staticmethod
+    def _resolve_automation_rule(reason_name: str, tenant_id: str, communication_type: str):
         from ..models import AutomationRule
         
         base_filter = {
@@ -62,38 +103,41 @@ class HierarchicalResolver:
             'is_deleted': False,
         }
         
-        # Priority 1: Try tenant-specific rule
+        # Tenant-specific rule wins over the global one; the precedence is
+        # applied in the ORDER BY so a single query resolves the hierarchy
+        global_scope = Q(tenant_id__isnull=True, rule_scope=AutomationRule.RuleScope.GLOBAL)
         if tenant_id:
-            tenant_rule = AutomationRule.objects.filter(
-                tenant_id=tenant_id,
-                rule_scope=AutomationRule.RuleScope.TENANT,
+            rule = AutomationRule.objects.filter(
+                Q(tenant_id=tenant_id, rule_scope=AutomationRule.RuleScope.TENANT) | global_scope,
                 **base_filter
-            ).first()
-            
-            if tenant_rule:
-                logger.info(
-                    f"[HierarchicalResolver] Found tenant rule for reason={reason_name}, "
-                    f"tenant_id={tenant_id}, rule_id={tenant_rule.id}"
-                )
-                return tenant_rule
+            ).annotate(
+                tenant_priority=Case(When(tenant_id=tenant_id, then=Value(0)), default=Value(1))
+            ).select_related('email_template').order_by('tenant_priority').first()
+        else:
+            rule = AutomationRule.objects.filter(
+                global_scope, **base_filter
+            ).select_related('email_template').first()
         
-        # Priority 2: Fallback to global rule
-        global_rule = AutomationRule.objects.filter(
-            tenant_id__isnull=True,
-            rule_scope=AutomationRule.RuleScope.GLOBAL,
-            **base_filter
-        ).first()
+        if rule and tenant_id and rule.tenant_id:
+            logger.info(
+                "[HierarchicalResolver] Found tenant rule for reason=%s, "
+                "tenant_id=%s, rule_id=%s",
+                reason_name, tenant_id, rule.id
+            )
+            return rule
         
-        if global_rule:
+        if rule:
             logger.info(
-                f"[HierarchicalResolver] Using global rule for reason={reason_name}, "
-                f"rule_id={global_rule.id}"
+                "[HierarchicalResolver] Using global rule for reason=%s, "
+                "rule_id=%s",
+                reason_name, rule.id
             )
-            return global_rule
+            return rule
         
         logger.warning(
-            f"[HierarchicalResolver] No rule found for reason={reason_name}, "
-            f"tenant_id={tenant_id}, communication_type={communication_type}"
+            "[HierarchicalResolver] No rule found for reason=%s, "
+            "tenant_id=%s, communication_type=%s",
+            reason_name, tenant_id, communication_type
         )
         return None
     
@@ -116,6 +160,13 @@ class HierarchicalResolver:
         1. Tenant-specific template (tenant_id + category)
         2. Global template (tenant_id=NULL + category)
         """
+        return _cached_lookup(
+            ('template', category, tenant_id),
+            lambda: HierarchicalResolver._resolve_email_template(category, tenant_id)
+        )
+    
+    @staticmethod
+    def _resolve_email_template(category: str, tenant_id: str):
         from ..models import EmailTemplate
         
         base_filter = {
@@ -125,38 +176,39 @@ class HierarchicalResolver:
             'is_deleted': False,
         }
         
-        # Priority 1: Try tenant-specific template
+        # Tenant-specific template wins over the global one (see
+        # get_automation_rule)
+        global_scope = Q(tenant_id__isnull=True, template_type=EmailTemplate.TemplateType.GLOBAL)
         if tenant_id:
-            tenant_template = EmailTemplate.objects.filter(
-                tenant_id=tenant_id,
-                template_type=EmailTemplate.TemplateType.TENANT,
+            template = EmailTemplate.objects.filter(
+                Q(tenant_id=tenant_id, template_type=EmailTemplate.TemplateType.TENANT) | global_scope,
                 **base_filter
-            ).first()
-            
-            if tenant_template:
-                logger.info(
-                    f"[HierarchicalResolver] Found tenant template for category={category}, "
-                    f"tenant_id={tenant_id}, template_id={tenant_template.id}"
-                )
-                return tenant_template
+            ).annotate(
+                tenant_priority=Case(When(tenant_id=tenant_id, then=Value(0)), default=Value(1))
+            ).order_by('tenant_priority').first()
+        else:
+            template = EmailTemplate.objects.filter(global_scope, **base_filter).first()
         
-        # Priority 2: Fallback to global template
-        global_template = EmailTemplate.objects.filter(
-            tenant_id__isnull=True,
-            template_type=EmailTemplate.TemplateType.GLOBAL,
-            **base_filter
-        ).first()
+        if template and tenant_id and template.tenant_id:
+            logger.info(
+                "[HierarchicalResolver] Found tenant template for category=%s, "
+                "tenant_id=%s, template_id=%s",
+                category, tenant_id, template.id
+            )
+            return template
         
-        if global_template:
+        if template:
             logger.info(
-                f"[HierarchicalResolver] Using global template for category={category}, "
-                f"template_id={global_template.id}"
+                "[HierarchicalResolver] Using global template for category=%s, "
+                "template_id=%s",
+                category, template.id
             )
-            return global_template
+            return template
         
         logger.warning(
-            f"[HierarchicalResolver] No template found for category={category}, "
-            f"tenant_id={tenant_id}"
+            "[HierarchicalResolver] No template found for category=%s, "
+            "tenant_id=%s",
+            category, tenant_id
         )
         return None
     
@@ -190,9 +242,10 @@ class HierarchicalResolver:
             communication_type=communication_type
         )
         
-        # If rule has an explicit template, use that
-        if rule and hasattr(rule, 'email_template_id') and rule.email_template_id:
-            return rule, rule.email_template_id
+        # If rule has an explicit template, use that (fetched together with
+        # the rule)
+        if rule and rule.email_template_id:
+            return rule, rule.email_template
         
         # Otherwise, resolve template using hierarchy
         template = HierarchicalResolver.get_email_template(
@@ -229,7 +282,8 @@ def is_email_service_active(tenant_id: str = None, product_id: str = None) -> bo
     """
     # Legacy implementation: service_integration module no longer exists in current architecture
     # For now, assume the service is always active. This should be refactored with new architecture.
-    logger.info("[is_email_service_active] Service activation check (legacy module removed)")
+    # Debug level: this runs for every email sent
+    logger.debug("[is_email_service_active] Service activation check (legacy module removed)")
     return True
     
     # Original code referencing non-existent module:
@@ -3,15 +3,41 @@ Utility functions for sending web push notifications.
 """
 import json
 import logging
-from typing import Dict, Any, Optional
-from pywebpush import webpush, WebPushException
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlparse
+from pywebpush import Vapid, webpush, WebPushException
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent push requests for one broadcast
+PUSH_SEND_MAX_WORKERS = 32
 
-def send_push_notification(
-    subscription,
+# Signed VAPID tokens are valid for VAPID_TOKEN_LIFETIME seconds and reused
+# for VAPID_HEADER_CACHE_SECONDS per push service, so a broadcast signs once
+# per service (FCM, Mozilla, Apple, ...) rather than once per subscriber
+VAPID_TOKEN_LIFETIME = 12 * 60 * 60
+VAPID_HEADER_CACHE_SECONDS = 6 * 60 * 60
+# (push service origin, private key, sub claim) -> (headers, expires at)
+_vapid_headers: Dict[Tuple[str, str, str], Tuple[Dict[str, str], float]] = {}
+_vapid_headers_lock = threading.Lock()
+
+
+class PushResult(str, Enum):
+    """Outcome of delivering one push notification"""
+    SENT = 'sent'
+    FAILED = 'failed'
+    # The push service no longer knows the subscription (404/410)
+    EXPIRED = 'expired'
+
+
+def _build_push_payload(
     title: str,
     body: str,
     data: Optional[Dict[str, Any]] = None,
@@ -19,29 +45,9 @@ def send_push_notification(
     badge: str = '/badge-72.png',
     tag: str = 'campaign-update',
     require_interaction: bool = False
-) -> bool:
-    """
-    Send a web push notification to a subscription.
-    
-    Args:
-        subscription: PushSubscription model instance
-        title: Notification title
-        body: Notification body text
-        data: Additional data to send with notification
-        icon: URL to notification icon
-        badge: URL to notification badge
-        tag: Notification tag for grouping
-        require_interaction: Whether notification requires user interaction
-        
-    Returns:
-        bool: True if notification sent successfully, False otherwise
-    """
-    if not subscription or not subscription.is_active:
-        logger.warning("Attempted to send push to inactive subscription")
-        return False
-    
-    # Prepare notification payload
-    payload = json.dumps({
+) -> str:
+    """Encode the notification payload read by the service worker"""
+    return json.dumps({
         'title': title,
         'body': body,
         'icon': icon,
@@ -51,18 +57,73 @@ def send_push_notification(
         'requireInteraction': require_interaction,
         'timestamp': None  # Will be set by service worker
     })
+
+
+def _vapid_credentials() -> Optional[Tuple[str, Dict[str, str]]]:
+    """Return (VAPID private key, VAPID claims) from settings, or None if unset"""
+    # Get VAPID keys from settings
+    vapid_private_key = getattr(settings, 'VAPID_PRIVATE_KEY', None)
+    vapid_admin_email = getattr(settings, 'VAPID_ADMIN_EMAIL', 'admin@example.com')
+    
+    if not vapid_private_key:
+        logger.error("VAPID_PRIVATE_KEY not configured in settings")
+        return None
+    
+    return vapid_private_key, {'sub': f'mailto:{vapid_admin_email}'}
+
+
+@lru_cache(maxsize=4)
+def _load_vapid_key(vapid_private_key: str) -> Vapid:
+    """Parse a VAPID private key (a key file path or the key itself) once"""
+    if os.path.isfile(vapid_private_key):
+        return Vapid.from_file(private_key_file=vapid_private_key)
+    return Vapid.from_string(private_key=vapid_private_key)
+
+
+def _signed_vapid_headers(
+    endpoint: str,
+    vapid_private_key: str,
+    vapid_claims: Dict[str, str]
+) -> Dict[str, str]:
+    """
+    Return the VAPID Authorization headers for a push endpoint.
+    
+    The signed token only depends on the push service origin (the aud
+    claim), so it is shared by every subscription on that service.
+    """
+    url = urlparse(endpoint)
+    audience = f'{url.scheme}://{url.netloc}'
+    cache_key = (audience, vapid_private_key, vapid_claims['sub'])
+    now = time.time()
+    
+    with _vapid_headers_lock:
+        cached = _vapid_headers.get(cache_key)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    
+    claims = dict(vapid_claims, aud=audience, exp=int(now) + VAPID_TOKEN_LIFETIME)
+    headers = _load_vapid_key(vapid_private_key).sign(claims)
+    with _vapid_headers_lock:
+        _vapid_headers[cache_key] = (headers, now + VAPID_HEADER_CACHE_SECONDS)
+    return headers
+
+
+def _deliver_push(
+    subscription,
+    payload: str,
+    vapid_private_key: str,
+    vapid_claims: Dict[str, str]
+) -> PushResult:
+    """
+    Post an encoded payload (see _build_push_payload) to a subscription's
+    endpoint, signed with the credentials from _vapid_credentials.
     
+    Makes no database writes, so it is safe to call from worker threads;
+    callers deactivate EXPIRED subscriptions themselves.
+    """
     try:
-        # Get VAPID keys from settings
-        vapid_private_key = getattr(settings, 'VAPID_PRIVATE_KEY', None)
-        vapid_admin_email = getattr(settings, 'VAPID_ADMIN_EMAIL', 'admin@example.com')
-        
-        if not vapid_private_key:
-            logger.error("VAPID_PRIVATE_KEY not configured in settings")
-            return False
-        
         # Send push notification
-        response = webpush(
+        webpush(
             subscription_info={
                 'endpoint': subscription.endpoint,
                 'keys': {
@@ -71,14 +132,12 @@ def send_push_notification(
                 }
             },
             data=payload,
-            vapid_private_key=vapid_private_key,
-            vapid_claims={
-                'sub': f'mailto:{vapid_admin_email}'
-            }
+            # Pre-signed, so webpush does not sign again
+            headers=_signed_vapid_headers(subscription.endpoint, vapid_private_key, vapid_claims)
         )
         
         logger.info(f"Push notification sent successfully to user {subscription.user_id}")
-        return True
+        return PushResult.SENT
         
     except WebPushException as e:
         logger.error(f"WebPush failed for subscription {subscription.id}: {e}")
@@ -86,14 +145,58 @@ def send_push_notification(
         # Handle expired subscriptions
         if e.response and e.response.status_code in [404, 410]:
             logger.info(f"Subscription {subscription.id} expired, marking as inactive")
-            subscription.is_active = False
-            subscription.save()
+            return PushResult.EXPIRED
         
-        return False
+        return PushResult.FAILED
         
     except Exception as e:
         logger.error(f"Unexpected error sending push notification: {e}")
+        return PushResult.FAILED
+
+
+def send_push_notification(
+    subscription,
+    title: str,
+    body: str,
+    data: Optional[Dict[str, Any]] = None,
+    icon: str = '/icon-192.png',
+    badge: str = '/badge-72.png',
+    tag: str = 'campaign-update',
+    require_interaction: bool = False
+) -> bool:
+    """
+    Send a web push notification to a subscription.
+    
+    Args:
+        subscription: PushSubscription model instance
+        title: Notification title
+        body: Notification body text
+        data: Additional data to send with notification
+        icon: URL to notification icon
+        badge: URL to notification badge
+        tag: Notification tag for grouping
+        require_interaction: Whether notification requires user interaction
+        
+    Returns:
+        bool: True if notification sent successfully, False otherwise
+    """
+    if not subscription or not subscription.is_active:
+        logger.warning("Attempted to send push to inactive subscription")
         return False
+    
+    credentials = _vapid_credentials()
+    if credentials is None:
+        return False
+    
+    payload = _build_push_payload(
+        title, body, data=data, icon=icon, badge=badge,
+        tag=tag, require_interaction=require_interaction
+    )
+    result = _deliver_push(subscription, payload, *credentials)
+    if result is PushResult.EXPIRED:
+        subscription.is_active = False
+        subscription.save()
+    return result is PushResult.SENT
 
 
 def send_campaign_status_notification(campaign, old_status: str, new_status: str) -> int:
@@ -110,11 +213,12 @@ def send_campaign_status_notification(campaign, old_status: str, new_status: str
     """
     from apps.campaigns.models.push_models import PushSubscription
     
-    # Get all active subscriptions for users in this organization
+    # Get all active subscriptions for users in this organization, loading
+    # only the columns needed to deliver a push
     subscriptions = PushSubscription.objects.filter(
         organization=campaign.organization,
         is_active=True
-    ).select_related('user')
+    ).only('id', 'user', 'endpoint', 'p256dh', 'auth')
     
     # Prepare notification content
     title = f"Campaign Update: {campaign.name}"
@@ -126,18 +230,34 @@ def send_campaign_status_notification(campaign, old_status: str, new_status: str
         'old_status': old_status,
         'new_status': new_status,
     }
+    # Payload and VAPID credentials are identical for every subscriber, so
+    # prepare them once
+    credentials = _vapid_credentials()
+    if credentials is None:
+        return 0
+    payload = _build_push_payload(title, body, data=data, require_interaction=False)
     
-    # Send to all subscriptions
+    # Each push is an independent HTTPS request; send them concurrently.
+    # The queryset only holds active subscriptions, so no per-row check.
+    subscriptions = list(subscriptions)
     sent_count = 0
-    for subscription in subscriptions:
-        if send_push_notification(
-            subscription=subscription,
-            title=title,
-            body=body,
-            data=data,
-            require_interaction=False
-        ):
-            sent_count += 1
+    expired_ids = []
+    if subscriptions:
+        with ThreadPoolExecutor(max_workers=min(PUSH_SEND_MAX_WORKERS, len(subscriptions))) as executor:
+            futures = {
+                executor.submit(_deliver_push, subscription, payload, *credentials): subscription
+                for subscription in subscriptions
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                if result is PushResult.SENT:
+                    sent_count += 1
+                elif result is PushResult.EXPIRED:
+                    expired_ids.append(futures[future].id)
+    
+    # Deactivate every expired subscription in one UPDATE
+    if expired_ids:
+        PushSubscription.objects.filter(id__in=expired_ids).update(is_active=False)
     
     logger.info(f"Sent {sent_count} push notifications for campaign {campaign.id} status change")
     return sent_count
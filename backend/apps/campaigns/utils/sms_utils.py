@@ -1,8 +1,278 @@
+import asyncio
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from requests import Session
+from requests.adapters import HTTPAdapter
+from twilio.http.async_http_client import AsyncTwilioHttpClient
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
+from urllib3.util.retry import Retry
+
 from ..models import AutomationRule
 from .crypto import decrypt_data
 from .email_utils import process_template_variables
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of Twilio API requests in flight per send call
+SMS_SEND_MAX_WORKERS = 10
+
+# Splits a recipient number into an optional whatsapp: prefix, the country
+# code already present ("+", "880", or the trunk "0" of a local 01... number)
+# and the rest of the number, in a single scan.
+_PHONE_PREFIX_RE = re.compile(r'(?:whatsapp:)?(\+|880|0(?=1))?')
+
+# Formatted template recipients keyed by (template id, updated_at, field).
+# Editing a template bumps updated_at, so changed numbers are re-parsed.
+_number_cache = {}
+_number_cache_lock = threading.Lock()
+
+# Columns read when sending for a rule; everything else is left deferred
+_RULE_SEND_FIELDS = (
+    'communication_type',
+    'sms_template',
+    'sms_template__updated_at',
+    'sms_template__sms_body',
+    'sms_template__recipient_numbers_list',
+    'sms_template__supports_whatsapp',
+    'sms_config',
+    'sms_config__updated_at',
+    'sms_config__account_ssid',
+    'sms_config__auth_token',
+    'sms_config__default_from_number',
+    'sms_config__whatsapp_from_number',
+    'sms_config__whatsapp_enabled',
+)
+
+# Twilio clients keyed by (config id, config updated_at). Editing a
+# configuration bumps updated_at, so a rotated auth token gets a new client.
+_client_cache = {}
+_client_cache_lock = threading.Lock()
+
+
+def _build_http_session():
+    """
+    Build the keep-alive session a cached Twilio client sends through.
+
+    Rate-limited (429) and unavailable (503) responses mean Twilio did not
+    create the message, so those POSTs are retried with backoff. Read errors
+    are not retried, since the message may already have been queued.
+    """
+    session = Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.2,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False,
+        ),
+    ))
+    return session
+
+
+def _get_client(sms_config):
+    """
+    Return a Twilio client for ``sms_config``, reusing one built earlier.
+
+    The auth token is decrypted only when the client is first built, and
+    repeated sends share the client's pooled HTTPS connections to Twilio.
+    """
+    key = (sms_config.id, getattr(sms_config, 'updated_at', None))
+    client = _client_cache.get(key)
+    if client is not None:
+        return client
+
+    with _client_cache_lock:
+        client = _client_cache.get(key)
+        if client is None:
+            http_client = TwilioHttpClient()
+            http_client.session = _build_http_session()
+            client = Client(
+                sms_config.account_ssid,
+                decrypt_data(sms_config.auth_token),
+                http_client=http_client,
+            )
+            # Drop clients built from older versions of this configuration
+            for stale in [k for k in _client_cache if k[0] == sms_config.id]:
+                del _client_cache[stale]
+            _client_cache[key] = client
+    return client
+
+
+def _normalize(number):
+    """
+    Return ``number`` in international (+E.164) form.
+
+    Any ``whatsapp:`` prefix is dropped, and numbers without a country code
+    are treated as Bangladeshi: ``880...`` and ``01...`` become ``+8801...``
+    and any other local number gets ``+880`` prepended.
+    """
+    number = number.strip()
+    match = _PHONE_PREFIX_RE.match(number)
+    country_code = '+' if match.group(1) == '+' else '+880'
+    return country_code + number[match.end():]
+
+
+def _format_numbers(numbers):
+    """Return ``(number, +E.164 number)`` pairs for ``numbers``"""
+    return [(number, _normalize(number)) for number in numbers]
+
+
+def _template_numbers(template, field):
+    """
+    Return the formatted recipients stored in ``template.<field>``.
+
+    The comma-separated list is parsed and formatted once per template
+    version and the resulting pairs are reused by later sends.
+    """
+    key = (template.id, getattr(template, 'updated_at', None), field)
+    numbers = _number_cache.get(key)
+    if numbers is not None:
+        return numbers
+
+    raw_numbers = getattr(template, field, None) or ''
+    numbers = tuple(_format_numbers(num.strip() for num in raw_numbers.split(',') if num.strip()))
+    with _number_cache_lock:
+        # Drop lists parsed from older versions of this template
+        for stale in [k for k in _number_cache if k[0] == template.id and k[2] == field]:
+            del _number_cache[stale]
+        _number_cache[key] = numbers
+    return numbers
+
+
+def _send_messages(client, from_number, body, recipients, channel):
+    """
+    Send ``body`` to every ``(number, to)`` pair in ``recipients`` concurrently.
+
+    Each message is an independent HTTPS request, so they are sent from a
+    thread pool sharing the client's connection pool. Returns the SIDs of
+    the messages Twilio accepted, in recipient order.
+    """
+    message_sids = []
+    if not recipients:
+        return message_sids
+
+    def create(recipient):
+        number, to = recipient
+        try:
+            return client.messages.create(from_=from_number, body=body, to=to)
+        except Exception:
+            logger.exception("Failed to send %s to %s", channel, number)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(SMS_SEND_MAX_WORKERS, len(recipients))) as executor:
+        messages = list(executor.map(create, recipients))
+
+    for (_, to), message in zip(recipients, messages):
+        if message is not None:
+            message_sids.append(message.sid)
+            logger.info("%s sent to %s, SID: %s", channel, to, message.sid)
+    return message_sids
+
+
+async def _send_messages_async(sms_config, from_number, body, recipients, channel):
+    """
+    Coroutine counterpart of ``_send_messages`` using Twilio's aiohttp client.
+
+    aiohttp sessions belong to one event loop, so the HTTP client lives for a
+    single call; every message in the batch shares its connections. The
+    credentials come from the cached sync client, so the auth token is not
+    decrypted again.
+    """
+    message_sids = []
+    if not recipients:
+        return message_sids
+
+    credentials = _get_client(sms_config)
+    limit = asyncio.Semaphore(SMS_SEND_MAX_WORKERS)
+
+    async with AsyncTwilioHttpClient() as http_client:
+        client = Client(credentials.username, credentials.password, http_client=http_client)
+
+        async def create(to):
+            async with limit:
+                return await client.messages.create_async(from_=from_number, body=body, to=to)
+
+        results = await asyncio.gather(
+            *(create(to) for _, to in recipients),
+            return_exceptions=True,
+        )
+
+    for (number, to), result in zip(recipients, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to send %s to %s", channel, number, exc_info=result)
+            continue
+        message_sids.append(result.sid)
+        logger.info("%s sent to %s, SID: %s", channel, to, result.sid)
+    return message_sids
+
+
+def _prepare_sms(rule_id, sms_variables, recipient_numbers):
+    """
+    Load the rule for an SMS send, render its body and format the recipients.
+
+    Returns ``(sms_config, from_number, body, recipients)`` where
+    ``recipients`` holds ``(number, to)`` pairs, or ``None`` when the rule
+    cannot send SMS messages.
+    """
+    if sms_variables is None:
+        sms_variables = {}
+        
+    # Template and configuration come back in the same query as the rule
+    rule = (
+        AutomationRule.objects
+        .select_related('sms_template', 'sms_config')
+        .only(*_RULE_SEND_FIELDS)
+        .get(id=rule_id)
+    )
+    
+    # Check if rule supports SMS
+    if rule.communication_type != AutomationRule.CommunicationType.SMS:
+        logger.warning("Rule %s is not configured for SMS", rule_id)
+        return None
+        
+    if not rule.sms_template:
+        logger.warning("Rule %s has no SMS template configured", rule_id)
+        return None
+        
+    if not rule.sms_config:
+        logger.warning("Rule %s has no SMS configuration", rule_id)
+        return None
+
+    # Get SMS configuration
+    sms_config = rule.sms_config
+    
+    # Get template
+    template = rule.sms_template
+    
+    # Process template with sms_variables data
+    body = process_template_variables(template.sms_body, sms_variables)
+    
+    # Use SMS from number (regular phone number, NOT WhatsApp)
+    from_number = getattr(sms_config, 'default_from_number', None) or "+19062928470"
+    
+    # Get recipient numbers, formatted once per template version
+    if recipient_numbers:
+        numbers = _format_numbers(recipient_numbers)
+    else:
+        numbers = _template_numbers(template, 'recipient_numbers_list')
+    
+    recipients = []
+    for number, clean_number in numbers:
+        logger.debug("Sending SMS from %s to %s", from_number, clean_number)
+        # Regular phone number format for SMS (no whatsapp: prefix)
+        recipients.append((number, clean_number))
+    
+    return sms_config, from_number, body, recipients
+
 
 def send_sms(rule_id, sms_variables=None, recipient_numbers=None):
     """
@@ -13,206 +283,193 @@ def send_sms(rule_id, sms_variables=None, recipient_numbers=None):
         sms_variables: Dictionary of template variables
         recipient_numbers: Optional list of phone numbers to override template recipients
     """
-    if sms_variables is None:
-        sms_variables = {}
-        
     try:
-        rule = AutomationRule.objects.get(id=rule_id)
-        
-        # Check if rule supports SMS
-        if rule.communication_type != AutomationRule.CommunicationType.SMS:
-            print(f"Rule {rule_id} is not configured for SMS")
-            return False
-            
-        if not rule.sms_template_id:
-            print(f"Rule {rule_id} has no SMS template configured")
+        prepared = _prepare_sms(rule_id, sms_variables, recipient_numbers)
+        if prepared is None:
             return False
-            
-        if not rule.sms_config_id:
-            print(f"Rule {rule_id} has no SMS configuration")
-            return False
-
-        # Get SMS configuration
-        sms_config = rule.sms_config_id
+        sms_config, from_number, body, recipients = prepared
         
-        # Get template
-        template = rule.sms_template_id
-        
-        # Process template with sms_variables data
-        body = process_template_variables(template.sms_body, sms_variables)
-        
-        # Get recipient numbers
-        if not recipient_numbers:
-            recipient_numbers = [num.strip() for num in template.recipient_numbers_list.split(',') if num.strip()]
-        
-        # Initialize Twilio client
-        client = Client(sms_config.account_ssid, decrypt_data(sms_config.auth_token))
+        # Reuse the Twilio client (and its connections) for this configuration
+        client = _get_client(sms_config)
         
         # Send SMS to all recipients
-        message_sids = []
-        for number in recipient_numbers:
-            try:
-                # Clean and format number for SMS
-                clean_number = number.strip()
-                
-                # Remove any WhatsApp prefix if present
-                if clean_number.startswith('whatsapp:'):
-                    clean_number = clean_number.replace('whatsapp:', '')
-                
-                # Format for SMS (international format with +)
-                if not clean_number.startswith('+'):
-                    # For Bangladesh numbers, add +880 country code
-                    if clean_number.startswith('880'):
-                        clean_number = f"+{clean_number}"
-                    elif clean_number.startswith('01'):
-                        clean_number = f"+880{clean_number[1:]}"  # Remove leading 0 and add +880
-                    else:
-                        clean_number = f"+880{clean_number}"  # Assume it's a local number
-                
-                # Use SMS from number (regular phone number, NOT WhatsApp)
-                from_number = getattr(sms_config, 'default_from_number', None) or "+19062928470"
-                
-                print(f"Sending SMS from {from_number} to {clean_number}")
-                
-                # Create SMS message (no whatsapp: prefix)
-                message = client.messages.create(
-                    from_=from_number,
-                    body=body,
-                    to=clean_number  # Regular phone number format for SMS
-                )
-                
-                message_sids.append(message.sid)
-                print(f"SMS sent to {clean_number}, SID: {message.sid}")
-                
-            except Exception as e:
-                print(f"Failed to send SMS to {number}: {str(e)}")
+        message_sids = _send_messages(client, from_number, body, recipients, 'SMS')
 
         return message_sids if message_sids else False
         
     except AutomationRule.DoesNotExist:
-        print(f"Automation rule with ID {rule_id} not found")
+        logger.warning("Automation rule with ID %s not found", rule_id)
         return False
-    except Exception as e:
-        print(f"Error sending SMS for rule {rule_id}: {str(e)}")
+    except Exception:
+        logger.exception("Error sending SMS for rule %s", rule_id)
         return False
 
 
-def send_whatsapp(rule_id, sms_variables=None, recipient_numbers=None):
+def _prepare_whatsapp(rule_id, sms_variables, recipient_numbers):
     """
-    Dedicated function to send WhatsApp messages based on an automation rule.
+    Load the rule for a WhatsApp send, render its body and format the recipients.
+
+    Returns ``(sms_config, from_number, body, recipients)`` where
+    ``recipients`` holds ``(number, to)`` pairs, or ``None`` when the rule
+    cannot send WhatsApp messages.
     """
     if sms_variables is None:
         sms_variables = {}
         
-    try:
-        rule = AutomationRule.objects.get(id=rule_id)
-        
-        # Check if rule supports WhatsApp or SMS (since WhatsApp can use SMS rules)
-        valid_types = [
-            AutomationRule.CommunicationType.SMS,
-            getattr(AutomationRule.CommunicationType, 'WHATSAPP', None)
-        ]
-        if rule.communication_type not in valid_types:
-            print(f"Rule {rule_id} is not configured for WhatsApp")
-            return False
-            
-        if not rule.sms_template_id:
-            print(f"Rule {rule_id} has no WhatsApp template configured")
-            return False
-            
-        if not rule.sms_config_id:
-            print(f"Rule {rule_id} has no WhatsApp configuration")
-            return False
+    # Template and configuration come back in the same query as the rule
+    rule = (
+        AutomationRule.objects
+        .select_related('sms_template', 'sms_config')
+        .only(*_RULE_SEND_FIELDS)
+        .get(id=rule_id)
+    )
+    
+    # Check if rule supports WhatsApp or SMS (since WhatsApp can use SMS rules)
+    valid_types = [
+        AutomationRule.CommunicationType.SMS,
+        getattr(AutomationRule.CommunicationType, 'WHATSAPP', None)
+    ]
+    if rule.communication_type not in valid_types:
+        logger.warning("Rule %s is not configured for WhatsApp", rule_id)
+        return None
         
-        # Get SMS configuration (used for WhatsApp too)
-        sms_config = rule.sms_config_id
+    if not rule.sms_template:
+        logger.warning("Rule %s has no WhatsApp template configured", rule_id)
+        return None
         
-        # Check if WhatsApp is enabled in configuration
-        if not getattr(sms_config, 'whatsapp_enabled', False):
-            print(f"WhatsApp is not enabled in configuration {sms_config.id}")
+    if not rule.sms_config:
+        logger.warning("Rule %s has no WhatsApp configuration", rule_id)
+        return None
+    
+    # Get SMS configuration (used for WhatsApp too)
+    sms_config = rule.sms_config
+    
+    # Check if WhatsApp is enabled in configuration
+    if not getattr(sms_config, 'whatsapp_enabled', False):
+        logger.warning("WhatsApp is not enabled in configuration %s", sms_config.id)
+        return None
+    
+    # Get template
+    template = rule.sms_template
+    
+    # Check if template supports WhatsApp
+    if hasattr(template, 'supports_whatsapp') and not template.supports_whatsapp:
+        logger.warning("Template %s does not support WhatsApp", template.id)
+        return None
+    
+    # Process template with sms_variables data
+    body = process_template_variables(template.sms_body, sms_variables)
+    
+    # Get WhatsApp from number from configuration
+    whatsapp_from = getattr(sms_config, 'whatsapp_from_number', None)
+    if whatsapp_from:
+        # Ensure from_number has proper formatting
+        if whatsapp_from.startswith('whatsapp:'):
+            whatsapp_from = whatsapp_from.replace('whatsapp:', '')
+        if not whatsapp_from.startswith('+'):
+            whatsapp_from = f"+{whatsapp_from}"
+        from_number = f"whatsapp:{whatsapp_from}"
+    else:
+        # Use Twilio sandbox number if no WhatsApp number configured
+        from_number = "whatsapp:+14155238886"  # Twilio Sandbox number
+    
+    # Get recipient numbers - USE DYNAMIC VALUES, NOT HARDCODED
+    if recipient_numbers:
+        numbers = _format_numbers(recipient_numbers)
+    elif getattr(template, 'whatsapp_recipient_numbers_list', None):
+        # Template has WhatsApp-specific recipients
+        numbers = _template_numbers(template, 'whatsapp_recipient_numbers_list')
+    else:
+        # Fall back to regular SMS recipients but format them for WhatsApp
+        numbers = _template_numbers(template, 'recipient_numbers_list')
+    
+    recipients = []
+    for number, clean_number in numbers:
+        # WhatsApp requires whatsapp: prefix for both from and to
+        to_number = f"whatsapp:{clean_number}"
+        logger.debug("Sending WhatsApp from %s to %s", from_number, to_number)
+        recipients.append((number, to_number))
+    
+    return sms_config, from_number, body, recipients
+
+
+def send_whatsapp(rule_id, sms_variables=None, recipient_numbers=None):
+    """
+    Dedicated function to send WhatsApp messages based on an automation rule.
+    """
+    try:
+        prepared = _prepare_whatsapp(rule_id, sms_variables, recipient_numbers)
+        if prepared is None:
             return False
+        sms_config, from_number, body, recipients = prepared
         
-        # Get template
-        template = rule.sms_template_id
+        # Reuse the Twilio client (and its connections) for this configuration
+        client = _get_client(sms_config)
         
-        # Check if template supports WhatsApp
-        if hasattr(template, 'supports_whatsapp') and not template.supports_whatsapp:
-            print(f"Template {template.id} does not support WhatsApp")
-            return False
+        # Send WhatsApp to all recipients
+        message_sids = _send_messages(client, from_number, body, recipients, 'WhatsApp')
+
+        return message_sids if message_sids else False
         
-        # Process template with sms_variables data
-        body = process_template_variables(template.sms_body, sms_variables)
+    except AutomationRule.DoesNotExist:
+        logger.warning("Automation rule with ID %s not found", rule_id)
+        return False
+    except Exception:
+        logger.exception("Error sending WhatsApp for rule %s", rule_id)
+        return False
+
+
+async def send_sms_async(rule_id, sms_variables=None, recipient_numbers=None):
+    """
+    Async variant of ``send_sms`` for callers running inside an event loop.
+
+    The rule lookup runs in a worker thread and the messages are sent
+    concurrently without blocking the loop. Returns the same values as
+    ``send_sms``.
+    """
+    try:
+        prepared = await sync_to_async(_prepare_sms)(rule_id, sms_variables, recipient_numbers)
+        if prepared is None:
+            return False
+        sms_config, from_number, body, recipients = prepared
         
-        # Get recipient numbers - USE DYNAMIC VALUES, NOT HARDCODED
-        if not recipient_numbers:
-            # Check if template has WhatsApp-specific recipients
-            if hasattr(template, 'whatsapp_recipient_numbers_list') and template.whatsapp_recipient_numbers_list:
-                recipient_numbers = [num.strip() for num in template.whatsapp_recipient_numbers_list.split(',') if num.strip()]
-            else:
-                # Fall back to regular SMS recipients but format them for WhatsApp
-                recipient_numbers = [num.strip() for num in template.recipient_numbers_list.split(',') if num.strip()]
+        message_sids = await _send_messages_async(sms_config, from_number, body, recipients, 'SMS')
+
+        return message_sids if message_sids else False
         
-        # Initialize Twilio client
-        client = Client(sms_config.account_ssid, decrypt_data(sms_config.auth_token))
+    except AutomationRule.DoesNotExist:
+        logger.warning("Automation rule with ID %s not found", rule_id)
+        return False
+    except Exception:
+        logger.exception("Error sending SMS for rule %s", rule_id)
+        return False
+
+
+async def send_whatsapp_async(rule_id, sms_variables=None, recipient_numbers=None):
+    """
+    Async variant of ``send_whatsapp`` for callers running inside an event loop.
+    """
+    try:
+        prepared = await sync_to_async(_prepare_whatsapp)(rule_id, sms_variables, recipient_numbers)
+        if prepared is None:
+            return False
+        sms_config, from_number, body, recipients = prepared
         
-        # Send WhatsApp to all recipients
-        message_sids = []
-        for number in recipient_numbers:
-            try:
-                # Clean and format number for WhatsApp
-                clean_number = number.strip()
-                
-                # Remove any WhatsApp prefix if present
-                if clean_number.startswith('whatsapp:'):
-                    clean_number = clean_number.replace('whatsapp:', '')
-                
-                # Format for WhatsApp (international format with +)
-                if not clean_number.startswith('+'):
-                    # For Bangladesh numbers, add +880 country code
-                    if clean_number.startswith('880'):
-                        clean_number = f"+{clean_number}"
-                    elif clean_number.startswith('01'):
-                        clean_number = f"+880{clean_number[1:]}"  # Remove leading 0 and add +880
-                    else:
-                        clean_number = f"+880{clean_number}"  # Assume it's a local number
-                
-                # WhatsApp requires whatsapp: prefix for both from and to
-                to_number = f"whatsapp:{clean_number}"
-                print(f"Sending WhatsApp to {to_number}")
-                
-                # Get WhatsApp from number from configuration
-                whatsapp_from = getattr(sms_config, 'whatsapp_from_number', None)
-                if whatsapp_from:
-                    # Ensure from_number has proper formatting
-                    if whatsapp_from.startswith('whatsapp:'):
-                        whatsapp_from = whatsapp_from.replace('whatsapp:', '')
-                    if not whatsapp_from.startswith('+'):
-                        whatsapp_from = f"+{whatsapp_from}"
-                    from_number = f"whatsapp:{whatsapp_from}"
-                else:
-                    # Use Twilio sandbox number if no WhatsApp number configured
-                    from_number = "whatsapp:+14155238886"  # Twilio Sandbox number
-                
-                print(f"Sending WhatsApp from {from_number} to {to_number}")
-                
-                # Create WhatsApp message (with whatsapp: prefix)
-                message = client.messages.create(
-                    from_=from_number,
-                    body=body,
-                    to=to_number  # WhatsApp format with whatsapp: prefix
-                )
-                
-                message_sids.append(message.sid)
-                print(f"WhatsApp sent to {clean_number}, SID: {message.sid}")
-                
-            except Exception as e:
-                print(f"Failed to send WhatsApp to {number}: {str(e)}")
+        message_sids = await _send_messages_async(sms_config, from_number, body, recipients, 'WhatsApp')
 
         return message_sids if message_sids else False
         
     except AutomationRule.DoesNotExist:
-        print(f"Automation rule with ID {rule_id} not found")
+        logger.warning("Automation rule with ID %s not found", rule_id)
+        return False
+    except Exception:
+        logger.exception("Error sending WhatsApp for rule %s", rule_id)
         return False
-    except Exception as e:
-        print(f"Error sending WhatsApp for rule {rule_id}: {str(e)}")
-        return False
\ No newline at end of file
+
+
+__all__ = (
+    'send_sms',
+    'send_whatsapp',
+    'send_sms_async',
+    'send_whatsapp_async',
+)
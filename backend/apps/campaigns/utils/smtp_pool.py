@@ -0,0 +1,376 @@
+"""
+Process-wide pool of authenticated SMTP connections.
+
+Opening an SMTP session costs a TCP handshake, TLS negotiation and an AUTH
+exchange, which dominates the time spent sending a single message. The pool
+keeps idle sessions per remote/credential key so consecutive sends (from any
+provider instance or worker thread) can reuse them.
+"""
+
+import logging
+import os
+import re
+import smtplib
+import socket
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Idle sessions kept per remote/credential key and across all keys
+SMTP_POOL_MAX_IDLE_PER_KEY = 4
+SMTP_POOL_MAX_IDLE_TOTAL = 32
+# Idle sessions older than this are closed (servers typically drop idle
+# clients after 60-300 seconds anyway)
+SMTP_POOL_IDLE_TIMEOUT = 60
+# Sessions are retired after this many messages, since many servers cap the
+# number of messages per connection
+SMTP_POOL_MAX_MESSAGES_PER_CONNECTION = 100
+# Resolved SMTP host addresses are reused for this long
+SMTP_DNS_CACHE_SECONDS = 60
+
+
+_CRLF = b'\r\n'
+# Lines starting with a period must be doubled inside DATA (RFC 5321 4.5.2)
+_LEADING_PERIOD_RE = re.compile(br'(?m)^\.')
+
+
+def _close(server: smtplib.SMTP) -> None:
+    """Politely end a session, falling back to dropping the socket"""
+    try:
+        server.quit()
+    except Exception:
+        server.close()
+
+
+class SMTPConnectionPool:
+    """
+    Thread-safe pool of idle SMTP sessions keyed by remote and credentials.
+
+    Sessions are checked with NOOP before being handed out and reset with
+    RSET when returned, so a broken or half-used session is never reused.
+    """
+
+    def __init__(self,
+                 max_idle_per_key: int = SMTP_POOL_MAX_IDLE_PER_KEY,
+                 max_idle_total: int = SMTP_POOL_MAX_IDLE_TOTAL,
+                 idle_timeout: float = SMTP_POOL_IDLE_TIMEOUT,
+                 max_messages: int = SMTP_POOL_MAX_MESSAGES_PER_CONNECTION):
+        self.max_idle_per_key = max_idle_per_key
+        self.max_idle_total = max_idle_total
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # key -> deque of (server, messages sent, returned at)
+        self._idle: Dict[Hashable, Deque[Tuple[smtplib.SMTP, int, float]]] = defaultdict(deque)
+        self._idle_total = 0
+        # server -> messages sent, for sessions currently checked out
+        self._in_use: Dict[int, int] = {}
+        self._reaper: Optional[threading.Thread] = None
+
+    def acquire(self, key: Hashable, connect: Callable[[], Optional[smtplib.SMTP]]) -> Optional[smtplib.SMTP]:
+        """
+        Return a live idle session for key, or one opened with connect().
+
+        Returns whatever connect() returns (None included) when no idle
+        session is usable.
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                if not idle:
+                    break
+                # Most recently returned first: it is the least likely to
+                # have been dropped by the server
+                server, sent, _ = idle.pop()
+                self._idle_total -= 1
+            try:
+                if server.noop()[0] == 250:
+                    with self._lock:
+                        self._in_use[id(server)] = sent
+                    return server
+            except (OSError, smtplib.SMTPException):
+                pass
+            server.close()
+
+        server = connect()
+        if server is not None:
+            with self._lock:
+                self._in_use[id(server)] = 0
+        return server
+
+    def release(self, key: Hashable, server: smtplib.SMTP, reusable: bool = True, messages: int = 1) -> None:
+        """
+        Return a session after sending messages; close it if it must not be reused.
+
+        Pass reusable=False after an error, when the session state is unknown.
+        """
+        with self._lock:
+            sent = self._in_use.pop(id(server), 0) + messages
+
+        if not reusable or sent >= self.max_messages:
+            _close(server)
+            return
+
+        try:
+            server.rset()
+        except (OSError, smtplib.SMTPException):
+            server.close()
+            return
+
+        with self._lock:
+            idle = self._idle[key]
+            if len(idle) >= self.max_idle_per_key or self._idle_total >= self.max_idle_total:
+                pooled = False
+            else:
+                idle.append((server, sent, time.monotonic()))
+                self._idle_total += 1
+                pooled = True
+                self._ensure_reaper()
+        if not pooled:
+            _close(server)
+
+    @contextmanager
+    def connection(self, key: Hashable, connect: Callable[[], Optional[smtplib.SMTP]]):
+        """
+        Check out a session for one message.
+
+        Yields None when connect() could not produce a session. The session
+        is discarded instead of pooled if the block raises.
+        """
+        server = self.acquire(key, connect)
+        if server is None:
+            yield None
+            return
+        try:
+            yield server
+        except BaseException:
+            self.release(key, server, reusable=False)
+            raise
+        self.release(key, server)
+
+    def reap(self) -> int:
+        """Close sessions idle for longer than idle_timeout; return how many"""
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            for key in list(self._idle):
+                idle = self._idle[key]
+                # Oldest sessions sit at the left end
+                while idle and idle[0][2] < cutoff:
+                    expired.append(idle.popleft()[0])
+                if not idle:
+                    del self._idle[key]
+            self._idle_total -= len(expired)
+        for server in expired:
+            _close(server)
+        return len(expired)
+
+    def close_all(self) -> None:
+        """Close every idle session"""
+        with self._lock:
+            servers = [entry[0] for idle in self._idle.values() for entry in idle]
+            self._idle.clear()
+            self._idle_total = 0
+        for server in servers:
+            _close(server)
+
+    def _ensure_reaper(self) -> None:
+        # Called with the lock held
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(
+            target=self._reap_forever, name='smtp-pool-reaper', daemon=True
+        )
+        self._reaper.start()
+
+    def _reap_forever(self) -> None:
+        interval = max(self.idle_timeout / 2, 1)
+        while True:
+            time.sleep(interval)
+            try:
+                self.reap()
+            except Exception:
+                logger.exception("Failed to reap idle SMTP connections")
+
+    def _after_fork(self) -> None:
+        # Sessions inherited from the parent share its sockets; forget them
+        # (without QUIT, which would end the parent's session) and start over
+        self._lock = threading.Lock()
+        self._reset()
+
+
+# (host, port) -> (addresses in connection order, expires at)
+_resolved_hosts: Dict[Tuple[str, int], Tuple[Tuple[str, ...], float]] = {}
+_resolved_hosts_lock = threading.Lock()
+
+
+def resolve_host(host: str, port: int) -> Tuple[str, ...]:
+    """
+    Return the addresses to try for host, in order, resolving it at most
+    once per SMTP_DNS_CACHE_SECONDS.
+
+    Every A/AAAA record is kept, so a connection can fall back to the next
+    address the way socket.create_connection does.
+    """
+    now = time.monotonic()
+    with _resolved_hosts_lock:
+        cached = _resolved_hosts.get((host, port))
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    addresses = tuple(dict.fromkeys(
+        sockaddr[0] for *_, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    ))
+    with _resolved_hosts_lock:
+        _resolved_hosts[(host, port)] = (addresses, now + SMTP_DNS_CACHE_SECONDS)
+    return addresses
+
+
+def prefer_address(host: str, port: int, address: str) -> None:
+    """Move address to the front of the cached list after connecting to it"""
+    with _resolved_hosts_lock:
+        cached = _resolved_hosts.get((host, port))
+        if cached is not None and cached[0] and cached[0][0] != address and address in cached[0]:
+            addresses = (address,) + tuple(a for a in cached[0] if a != address)
+            _resolved_hosts[(host, port)] = (addresses, cached[1])
+
+
+def forget_host(host: str, port: int) -> None:
+    """Drop cached addresses, e.g. after failing to connect to all of them"""
+    with _resolved_hosts_lock:
+        _resolved_hosts.pop((host, port), None)
+
+
+class _CachedResolutionMixin:
+    """
+    Connect to the cached addresses of the SMTP host, trying each in turn.
+
+    smtplib keeps the host name in ``_host``, so TLS (SMTP_SSL and STARTTLS)
+    still sends it for SNI and checks the certificate against it.
+    """
+
+    def _get_socket(self, host, port, timeout):
+        error = None
+        for address in resolve_host(host, port):
+            try:
+                sock = super()._get_socket(address, port, timeout)
+            except OSError as e:
+                error = e
+                continue
+            # Later connections start with the address that worked, instead
+            # of waiting on an unreachable one first
+            prefer_address(host, port, address)
+            return sock
+        forget_host(host, port)
+        raise error if error is not None else OSError(f"No addresses found for {host}")
+
+
+class SMTP(_CachedResolutionMixin, smtplib.SMTP):
+    """smtplib.SMTP that reuses resolved host addresses"""
+
+
+class SMTP_SSL(_CachedResolutionMixin, smtplib.SMTP_SSL):
+    """smtplib.SMTP_SSL that reuses resolved host addresses"""
+
+
+@dataclass(frozen=True)
+class SMTPExtensions:
+    """ESMTP extensions advertised by a server in its EHLO reply"""
+    pipelining: bool = False
+    max_size: Optional[int] = None
+    eight_bit_mime: bool = False
+
+
+def smtp_extensions(server: smtplib.SMTP) -> SMTPExtensions:
+    """Return the session's ESMTP extensions, parsing the EHLO reply only once"""
+    extensions = getattr(server, '_pool_extensions', None)
+    if extensions is None:
+        server.ehlo_or_helo_if_needed()
+        features = server.esmtp_features
+        size = features.get('size', '').strip()
+        extensions = SMTPExtensions(
+            pipelining='pipelining' in features,
+            max_size=int(size) if size.isdigit() and int(size) > 0 else None,
+            eight_bit_mime='8bitmime' in features,
+        )
+        server._pool_extensions = extensions
+    return extensions
+
+
+def send_pipelined(server: smtplib.SMTP,
+                   from_addr: str,
+                   to_addrs: Sequence[str],
+                   msg_bytes: bytes) -> Dict[str, Tuple[int, bytes]]:
+    """
+    Send one message, batching MAIL FROM, RCPT TO and DATA into one write.
+
+    With PIPELINING (RFC 2920) the envelope costs a single round trip instead
+    of one per command. Falls back to ``server.sendmail`` otherwise. Mirrors
+    sendmail's contract: returns refused recipients and raises
+    SMTPSenderRefused / SMTPRecipientsRefused / SMTPDataError.
+    """
+    extensions = smtp_extensions(server)
+    if not extensions.pipelining:
+        return server.sendmail(from_addr, list(to_addrs), msg_bytes)
+
+    if not all(address.isascii() for address in (from_addr, *to_addrs)):
+        # Internationalized addresses need SMTPUTF8, which sendmail negotiates
+        return server.sendmail(from_addr, list(to_addrs), msg_bytes, mail_options=['SMTPUTF8'])
+
+    if extensions.max_size is not None and len(msg_bytes) > extensions.max_size:
+        raise smtplib.SMTPDataError(552, b'Message exceeds the size advertised by the server')
+
+    mail_options = ' BODY=8BITMIME' if extensions.eight_bit_mime and not msg_bytes.isascii() else ''
+    # quoteaddr reduces "Name <addr>" to "<addr>", like sendmail's MAIL/RCPT
+    commands = [f'MAIL FROM:{smtplib.quoteaddr(from_addr)}{mail_options}']
+    commands.extend(f'RCPT TO:{smtplib.quoteaddr(to_addr)}' for to_addr in to_addrs)
+    commands.append('DATA')
+    server.send(''.join(f'{command}\r\n' for command in commands))
+
+    # Replies come back in command order
+    mail_reply = server.getreply()
+    refused: Dict[str, Tuple[int, bytes]] = {}
+    for to_addr in to_addrs:
+        code, resp = server.getreply()
+        if code not in (250, 251):
+            refused[to_addr] = (code, resp)
+    data_code, data_resp = server.getreply()
+
+    if data_code == 354:
+        if mail_reply[0] != 250 or len(refused) == len(to_addrs):
+            # The server accepted DATA anyway; end it empty and drop the
+            # transaction before reporting the envelope failure
+            server.send(b'.' + _CRLF)
+            server.getreply()
+            server.rset()
+        else:
+            body = _LEADING_PERIOD_RE.sub(b'..', msg_bytes)
+            if not body.endswith(_CRLF):
+                body += _CRLF
+            server.send(body + b'.' + _CRLF)
+            data_code, data_resp = server.getreply()
+            if data_code != 250:
+                server.rset()
+                raise smtplib.SMTPDataError(data_code, data_resp)
+            return refused
+    else:
+        server.rset()
+
+    if mail_reply[0] != 250:
+        raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], from_addr)
+    if len(refused) == len(to_addrs):
+        raise smtplib.SMTPRecipientsRefused(refused)
+    raise smtplib.SMTPDataError(data_code, data_resp)
+
+
+smtp_pool = SMTPConnectionPool()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=smtp_pool._after_fork)
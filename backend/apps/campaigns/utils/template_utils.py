@@ -1,10 +1,62 @@
 """
 Utility functions for email template management.
 """
+import logging
 import re
+from functools import lru_cache
 from typing import Dict, Any, Optional
+from django.conf import settings
 from django.db import models
+from django.template import Context, Template
 from django.utils import timezone
+from django.utils.html import strip_tags
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=512)
+def _compile_django_template(source: str) -> Template:
+    """Parse template source once; compiled Templates are safe to render repeatedly"""
+    return Template(source)
+
+
+@lru_cache(maxsize=None)
+def _get_jinja_environment():
+    """
+    Sandboxed Jinja2 environment for user-authored email templates.
+    
+    jinja2 is only imported here; the campaigns app refuses to start with
+    EMAIL_TEMPLATE_ENGINE='jinja2' when it is missing.
+    """
+    from jinja2 import ChainableUndefined  # type: ignore[import-untyped]
+    from jinja2.sandbox import SandboxedEnvironment  # type: ignore[import-untyped]
+    
+    # Autoescape everything, as Django templates do; unknown variables
+    # render as empty strings
+    return SandboxedEnvironment(autoescape=True, auto_reload=False, undefined=ChainableUndefined)
+
+
+@lru_cache(maxsize=512)
+def _compile_jinja_template(source: str):
+    # Environment.from_string bypasses the environment's own template cache
+    return _get_jinja_environment().from_string(source)
+
+
+def render_template_source(source: str, context: Dict[str, Any]) -> str:
+    """
+    Render email template source with the configured EMAIL_TEMPLATE_ENGINE.
+    
+    Templates are compiled once per distinct source and reused across
+    recipients.
+    """
+    if getattr(settings, 'EMAIL_TEMPLATE_ENGINE', 'django') == 'jinja2':
+        return _compile_jinja_template(source).render(context)
+    return _compile_django_template(source).render(Context(context))
+
+
+def html_to_text(html: str) -> str:
+    """Plain-text version of an HTML email body"""
+    return strip_tags(html)
 
 
 def generate_unique_template_name(organization_id: str, base_name: str) -> str:
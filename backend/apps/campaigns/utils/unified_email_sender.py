@@ -20,8 +20,6 @@ The priority chain is Email Provider selection as follows:
 import logging
 from typing import Any, Dict, List, Tuple, Optional
 from django.core.mail import EmailMultiAlternatives
-from django.template import Template, Context
-from django.utils.html import strip_tags
 
 from ..models import AutomationRule, EmailTemplate, EmailProvider
 from ..backends import DynamicEmailBackend
@@ -34,6 +32,7 @@ from ..exceptions import (
 )
 from .sync_utils import ConfigurationHierarchy, RateLimitChecker
 from .error_handlers import EmailErrorHandler
+from .template_utils import html_to_text, render_template_source
 
 logger = logging.getLogger(__name__)
 
@@ -272,14 +271,11 @@ class UnifiedEmailSender:
         Returns:
             Tuple of (subject, html_body, text_body)
         """
-        context = Context(variables or {})
+        context = variables or {}
         
-        subject_template = Template(template.email_subject or "")
-        body_template = Template(template.email_body or "")
-        
-        rendered_subject = subject_template.render(context)
-        rendered_html = body_template.render(context)
-        rendered_text = strip_tags(rendered_html)
+        rendered_subject = render_template_source(template.email_subject or "", context)
+        rendered_html = render_template_source(template.email_body or "", context)
+        rendered_text = html_to_text(rendered_html)
         
         return rendered_subject, rendered_html, rendered_text
     
@@ -15,6 +15,8 @@ from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass, field
 from enum import Enum
 
+from ..constants import UNSUBSCRIBE_URL_TEMPLATE
+
 
 class VariableCategory(str, Enum):
     """Categories for organizing variables."""
@@ -372,6 +374,7 @@ class VariableRegistry:
         """
         from django.utils import timezone
         
+        now = timezone.now()
         context = {
             # Contact variables
             "email": contact.email,
@@ -381,9 +384,9 @@ class VariableRegistry:
             "phone": getattr(contact, 'phone', '') or "",
             
             # System variables
-            "unsubscribe_url": f"/campaigns/unsubscribe/?token={contact.unsubscribe_token}",
-            "current_date": timezone.now().strftime("%B %d, %Y"),
-            "current_year": str(timezone.now().year),
+            "unsubscribe_url": UNSUBSCRIBE_URL_TEMPLATE.format(token=contact.unsubscribe_token),
+            "current_date": now.strftime("%B %d, %Y"),
+            "current_year": str(now.year),
         }
         
         # Add campaign variables
@@ -60,9 +60,7 @@ from .campaign_views import (
     CampaignDetailView,
     CampaignLaunchView,
     CampaignScheduleView,
-    CampaignPauseView,
-    CampaignResumeView,
-    CampaignCancelView,
+    CampaignTransitionView,
     CampaignResetView,
     CampaignPreviewView,
     CampaignTestSendView,
@@ -155,9 +153,7 @@ __all__ = [
     'CampaignDetailView',
     'CampaignLaunchView',
     'CampaignScheduleView',
-    'CampaignPauseView',
-    'CampaignResumeView',
-    'CampaignCancelView',
+    'CampaignTransitionView',
     'CampaignResetView',
     'CampaignPreviewView',
     'CampaignTestSendView',
@@ -12,6 +12,7 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Count, Q, Sum, Avg
 from django.db.models.functions import TruncHour, TruncDay
 
+from ..constants import UNSUBSCRIBE_URL_TEMPLATE
 from ..models import Campaign, Contact, ContactList, EmailDeliveryLog
 from ..serializers import (
     CampaignSerializer,
@@ -570,81 +571,24 @@ class CampaignScheduleView(APIView):
         })
 
 
-class CampaignPauseView(APIView):
+class CampaignTransitionView(APIView):
     """
-    Pause sending campaign.
+    Apply a status transition (pause, resume, cancel) to a campaign.
     
     POST /campaigns/{id}/pause/
-    """
-    permission_classes = [IsAuthenticated]
-    throttle_classes = [OrganizationRateThrottle]
-    
-    def post(self, request, pk):
-        """Pause sending campaign."""
-        # Ensure user has an organization
-        if not request.user.organization:
-            return Response(
-                {'error': 'User is not associated with any organization.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        campaign = get_object_or_404(
-            Campaign,
-            pk=pk,
-            organization=request.user.organization,
-            is_deleted=False
-        )
-        
-        try:
-            campaign.pause()
-            return Response({'message': 'Campaign paused', 'status': campaign.status})
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-
-class CampaignResumeView(APIView):
-    """
-    Resume paused campaign.
-    
     POST /campaigns/{id}/resume/
-    """
-    permission_classes = [IsAuthenticated]
-    throttle_classes = [OrganizationRateThrottle]
-    
-    def post(self, request, pk):
-        """Resume paused campaign."""
-        # Ensure user has an organization
-        if not request.user.organization:
-            return Response(
-                {'error': 'User is not associated with any organization.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        campaign = get_object_or_404(
-            Campaign,
-            pk=pk,
-            organization=request.user.organization,
-            is_deleted=False
-        )
-        
-        try:
-            campaign.resume()
-            return Response({'message': 'Campaign resumed', 'status': campaign.status})
-        except Exception as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-
-
-class CampaignCancelView(APIView):
-    """
-    Cancel campaign.
-    
     POST /campaigns/{id}/cancel/
+    
+    One view class serves every transition endpoint; the URLconf selects the
+    Campaign method to call via ``as_view(transition=..., success_message=...)``.
     """
     permission_classes = [IsAuthenticated]
     throttle_classes = [OrganizationRateThrottle]
+    transition = None
+    success_message = ''
     
     def post(self, request, pk):
-        """Cancel campaign."""
+        """Run the configured transition on the campaign."""
         # Ensure user has an organization
         if not request.user.organization:
             return Response(
@@ -660,8 +604,8 @@ class CampaignCancelView(APIView):
         )
         
         try:
-            campaign.cancel()
-            return Response({'message': 'Campaign cancelled', 'status': campaign.status})
+            getattr(campaign, self.transition)()
+            return Response({'message': self.success_message, 'status': campaign.status})
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -956,7 +900,7 @@ class UnsubscribeView(APIView):
         return Response({
             'email': contact.email,
             'status': contact.status,
-            'confirm_url': f'/campaigns/unsubscribe/?token={token}'
+            'confirm_url': UNSUBSCRIBE_URL_TEMPLATE.format(token=token)
         })
     
     def post(self, request):
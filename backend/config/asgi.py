@@ -17,6 +17,12 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django_asgi_app = get_asgi_application()
 
 # Import after Django is initialized
+from django.conf import settings
+
+if settings.WARM_URL_RESOLVER:
+    from core.utils import warm_url_resolver
+    warm_url_resolver()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from apps.campaigns.routing import websocket_urlpatterns
@@ -89,6 +89,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.campaigns.middleware.ResolverCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -171,6 +172,8 @@ SPECTACULAR_SETTINGS = {
     # optional extras:
     "CONTACT": {"name": "Platform Team", "email": "musfiqdehan@gmail.com"},
     "LICENSE": {"name": "Proprietary"},
+    # Keep string-typed UUID path params documented as format: uuid
+    "PATH_CONVERTER_OVERRIDES": {"uuid_str": {"type": "string", "format": "uuid"}},
 }
 
 
@@ -296,6 +299,17 @@ ORG_PROVIDER_MAX_RATE_PER_MINUTE = config('ORG_PROVIDER_MAX_RATE_PER_MINUTE', de
 ORG_PROVIDER_MAX_RATE_PER_HOUR = config('ORG_PROVIDER_MAX_RATE_PER_HOUR', default=1000, cast=int)
 ORG_PROVIDER_MAX_DAILY_QUOTA = config('ORG_PROVIDER_MAX_DAILY_QUOTA', default=10000, cast=int)
 
+# Mount the platform admin API routes (apps/campaigns/urls_admin.py)
+ENABLE_ADMIN_API = config('ENABLE_ADMIN_API', default=True, cast=bool)
+
+# Build URL resolver tables when the app server loads the application
+# instead of on the first request each worker handles
+WARM_URL_RESOLVER = config('WARM_URL_RESOLVER', default=False, cast=bool)
+
+# Engine used to render email templates: 'django' or 'jinja2' (sandboxed,
+# requires the jinja2 package; template syntax differs for filters/tags)
+EMAIL_TEMPLATE_ENGINE = config('EMAIL_TEMPLATE_ENGINE', default='django')
+
 # VAPID keys for Web Push Notifications
 VAPID_PUBLIC_KEY = config('VAPID_PUBLIC_KEY', default='')
 VAPID_PRIVATE_KEY = config('VAPID_PRIVATE_KEY', default='')
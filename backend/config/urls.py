@@ -8,6 +8,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from core.utils import indexed_include
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -17,7 +18,8 @@ from drf_spectacular.views import (
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/auth/', include('apps.authentication.urls')),
-    path('api/v1/campaigns/', include('apps.campaigns.urls')),
+    indexed_include('api/v1/campaigns/', 'apps.campaigns.urls'),
+    path('api/v1/healthz/', include('health_check.urls')),
 
     # DRF Spectacular URLs for API documentation
     path(f"api/v1/schemas/swagger.json", SpectacularAPIView.as_view(), name="schema-json"),
@@ -28,5 +30,8 @@ urlpatterns = [
 
 ]
 
+if settings.ENABLE_ADMIN_API:
+    urlpatterns.append(path('api/v1/campaigns/admin/', include('apps.campaigns.urls_admin')))
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
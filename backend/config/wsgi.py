@@ -13,4 +13,10 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARM_URL_RESOLVER:
+    from core.utils import warm_url_resolver
+    warm_url_resolver()
@@ -1,5 +1,11 @@
 """Core utilities module."""
 
+from functools import cached_property
+
+from django.urls import Resolver404, ResolverMatch, URLPattern, URLResolver, get_resolver
+from django.urls.converters import UUIDConverter
+from django.urls.resolvers import RoutePattern
+from django.utils.module_loading import import_string
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
@@ -19,4 +25,191 @@ class UniversalAutoFilterMixin:
         return getattr(self, 'filterset_fields', '__all__')
 
 
-__all__ = ['UniversalAutoFilterMixin']
+
+class LazyView:
+    """
+    URLconf callback that imports its view class on the first request.
+
+    Lets a URLconf reference views by dotted path so their module (and its
+    serializer/model imports) is only loaded by workers that actually serve
+    the route. ``decorators`` are applied to the resolved ``as_view()``
+    callable, innermost first.
+
+    Only ``cls`` and ``initkwargs`` are forwarded to the real view, which is
+    what DRF schema generators read. ``view_class`` is deliberately not
+    forwarded so Django's resolver and reverse() populate from
+    ``__module__``/``__name__`` without importing the view.
+    """
+
+    csrf_exempt = True
+
+    def __init__(self, dotted_path, decorators=(), **initkwargs):
+        self.dotted_path = dotted_path
+        self.decorators = decorators
+        self.initkwargs = initkwargs
+        self.__module__, self.__name__ = dotted_path.rsplit('.', 1)
+        self.__qualname__ = self.__name__
+
+    @cached_property
+    def cls(self):
+        return import_string(self.dotted_path)
+
+    @cached_property
+    def view(self):
+        view = self.cls.as_view(**self.initkwargs)
+        for decorator in self.decorators:
+            view = decorator(view)
+        return view
+
+    def __call__(self, request, *args, **kwargs):
+        return self.view(request, *args, **kwargs)
+
+
+def lazy_view(dotted_path, *decorators, **initkwargs):
+    """Return a :class:`LazyView` for ``dotted_path``."""
+    return LazyView(dotted_path, decorators=decorators, **initkwargs)
+
+
+
+class IndexedURLResolver(URLResolver):
+    """
+    URLResolver that avoids the linear walk over ``url_patterns``.
+
+    Two shortcuts are layered on Django's resolver:
+
+    * Paths that resolve without any captured args/kwargs always resolve to
+      the same ResolverMatch, so they are stored in a dict keyed by path.
+      Paths with captured parameters (UUIDs etc.) are never stored, which
+      keeps the dict bounded by the number of static routes. Cached matches
+      are shared between requests and must be treated as read-only.
+    * Remaining paths are matched only against the patterns that can match
+      their first segment: patterns are indexed by their leading literal
+      segment, and patterns that start with a converter/regex are tried for
+      every segment. Candidate lists keep ``url_patterns`` order, so the
+      winning pattern is the same one Django would pick.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._static_matches = {}
+
+    @staticmethod
+    def _leading_segment(pattern):
+        """Literal first path segment a pattern can match, or None for any."""
+        if not isinstance(pattern.pattern, RoutePattern):
+            return None
+        route = str(pattern.pattern)
+        segment, slash, _ = route.partition('/')
+        if '<' in segment:
+            return None
+        if slash or pattern.pattern._is_endpoint:
+            return segment
+        # Non-endpoint prefix without a slash ('foo' also matches 'foobar/')
+        return None
+
+    @cached_property
+    def _segment_index(self):
+        keyed = [(self._leading_segment(p), p) for p in self.url_patterns]
+        wildcard = [p for key, p in keyed if key is None]
+        index = {
+            key: [p for k, p in keyed if k is None or k == key]
+            for key in {k for k, _ in keyed if k is not None}
+        }
+        return index, wildcard
+
+    def _candidates(self, path):
+        index, wildcard = self._segment_index
+        return index.get(path.partition('/')[0], wildcard)
+
+    def resolve(self, path):
+        path = str(path)
+        match = self._static_matches.get(path)
+        if match is None:
+            match = self._resolve_indexed(path)
+            if not match.args and not match.kwargs:
+                self._static_matches[path] = match
+        return match
+
+    def _resolve_indexed(self, path):
+        # Mirrors URLResolver.resolve(), iterating the indexed candidates
+        # instead of every entry in url_patterns.
+        tried = []
+        match = self.pattern.match(path)
+        if match:
+            new_path, args, kwargs = match
+            for pattern in self._candidates(new_path):
+                try:
+                    sub_match = pattern.resolve(new_path)
+                except Resolver404 as e:
+                    self._extend_tried(tried, pattern, e.args[0].get('tried'))
+                else:
+                    if sub_match:
+                        sub_match_dict = {**kwargs, **self.default_kwargs}
+                        sub_match_dict.update(sub_match.kwargs)
+                        sub_match_args = sub_match.args
+                        if not sub_match_dict:
+                            sub_match_args = args + sub_match.args
+                        current_route = (
+                            '' if isinstance(pattern, URLPattern) else str(pattern.pattern)
+                        )
+                        self._extend_tried(tried, pattern, sub_match.tried)
+                        return ResolverMatch(
+                            sub_match.func,
+                            sub_match_args,
+                            sub_match_dict,
+                            sub_match.url_name,
+                            [self.app_name] + sub_match.app_names,
+                            [self.namespace] + sub_match.namespaces,
+                            self._join_route(current_route, sub_match.route),
+                            tried,
+                            captured_kwargs=sub_match.captured_kwargs,
+                            extra_kwargs={**self.default_kwargs, **sub_match.extra_kwargs},
+                        )
+                    tried.append([pattern])
+            raise Resolver404({'tried': tried, 'path': new_path})
+        raise Resolver404({'path': path})
+
+
+def indexed_include(route, urlconf_module):
+    """``path(route, include(urlconf_module))`` backed by :class:`IndexedURLResolver`."""
+    return IndexedURLResolver(RoutePattern(route, is_endpoint=False), urlconf_module)
+
+
+def warm_url_resolver():
+    """
+    Build the root resolver's reverse/namespace tables and the segment index
+    of every :class:`IndexedURLResolver` up front, so the first request served
+    by a process does not pay for it. Lazy view modules stay unimported.
+    """
+    def warm(resolver):
+        resolver.reverse_dict  # populates nested resolvers as well
+        if isinstance(resolver, IndexedURLResolver):
+            resolver._segment_index
+        for pattern in resolver.url_patterns:
+            if isinstance(pattern, URLResolver):
+                warm(pattern)
+
+    warm(get_resolver())
+
+
+class UUIDStringConverter(UUIDConverter):
+    """
+    Matches the same canonical UUIDs as ``<uuid:...>`` but hands the view the
+    matched string instead of a ``uuid.UUID``. Path kwargs only ever end up in
+    ORM lookups (``pk=pk``) or messages, both of which accept the string, so
+    constructing a UUID object per request is wasted work.
+    """
+
+    def to_python(self, value):
+        return value
+
+
+__all__ = [
+    'UniversalAutoFilterMixin',
+    'LazyView',
+    'lazy_view',
+    'IndexedURLResolver',
+    'indexed_include',
+    'warm_url_resolver',
+    'UUIDStringConverter',
+]